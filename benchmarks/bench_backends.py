@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+异步后端基准测试
+
+在asyncio、uvloop与trio上分别运行同一负载：以固定并发数调用get_user_info
+（每次使用不同的令牌，全部经过网络），报告吞吐量与延迟分位数。
+SSO服务替身是在独立进程中运行的最小HTTP/1.1服务，避免与客户端争用GIL。
+
+用法:
+    python benchmarks/bench_backends.py [--requests 5000] [--concurrency 50]
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import itertools
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import anyio  # noqa: E402
+
+from treer_sso_sdk import SSOConfig, TreerSSOClient  # noqa: E402
+
+_BODY = b'{"id": 1, "username": "alice", "email": "alice@example.com"}'
+_RESPONSE = (
+    b"HTTP/1.1 200 OK\r\n"
+    b"Content-Type: application/json\r\n"
+    b"Content-Length: " + str(len(_BODY)).encode() + b"\r\n"
+    b"\r\n" + _BODY
+)
+
+
+async def _handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """对每个请求返回固定的用户信息（保持连接）"""
+    try:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            if not head:
+                break
+            writer.write(_RESPONSE)
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+def serve(port: int) -> None:
+    """SSO服务替身进程入口"""
+
+    async def main() -> None:
+        server = await asyncio.start_server(_handle, "127.0.0.1", port)
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(main())
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+def _wait_for_port(port: int, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError("SSO服务替身启动超时")
+
+
+async def run_load(base_url: str, requests: int, concurrency: int) -> List[float]:
+    """以固定并发数发送请求，返回每个请求的延迟（秒）"""
+    config = SSOConfig(
+        client_id="bench",
+        client_secret="secret",
+        sso_base_url=base_url,
+        max_connections=concurrency,
+        user_info_cache_size=requests,
+    )
+    latencies: List[float] = []
+    tokens = (f"token-{i}" for i in itertools.count())
+
+    async with TreerSSOClient(config) as client:
+        await client.get_user_info(next(tokens))  # 预热连接池
+
+        async def worker(count: int) -> None:
+            for _ in range(count):
+                started = time.perf_counter()
+                await client.get_user_info(next(tokens))
+                latencies.append(time.perf_counter() - started)
+
+        async with anyio.create_task_group() as tg:
+            per_worker, remainder = divmod(requests, concurrency)
+            for i in range(concurrency):
+                tg.start_soon(worker, per_worker + (1 if i < remainder else 0))
+    return latencies
+
+
+def bench(
+    name: str,
+    backend: str,
+    options: Optional[Dict[str, bool]],
+    base_url: str,
+    requests: int,
+    concurrency: int,
+) -> None:
+    started = time.perf_counter()
+    latencies = anyio.run(
+        run_load,
+        base_url,
+        requests,
+        concurrency,
+        backend=backend,
+        backend_options=options,
+    )
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(
+        f"{name:8} {len(latencies) / elapsed:9.0f} req/s  "
+        f"p50 {statistics.median(latencies) * 1000:6.2f}ms  p99 {p99 * 1000:6.2f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--serve", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve)
+        return
+
+    port = _free_port()
+    server = subprocess.Popen([sys.executable, __file__, "--serve", str(port)])
+    try:
+        _wait_for_port(port)
+        base_url = f"http://127.0.0.1:{port}"
+        backends = [("asyncio", "asyncio", None)]
+        if importlib.util.find_spec("uvloop") is not None:
+            backends.append(("uvloop", "asyncio", {"use_uvloop": True}))
+        if importlib.util.find_spec("trio") is not None:
+            backends.append(("trio", "trio", None))
+
+        print(f"请求数: {args.requests}, 并发: {args.concurrency}")
+        for name, backend, options in backends:
+            bench(name, backend, options, base_url, args.requests, args.concurrency)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
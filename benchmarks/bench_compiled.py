@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+mypyc编译构建基准测试
+
+对比纯Python与mypyc编译版本（TREER_SSO_COMPILE=1，见setup.py）在同一负载上的耗时：
+- UserInfo.from_dict / to_dict（含档案与时间字段）
+- 异常构造
+- 通过进程内的SSO服务替身执行get_user_info_by_code（令牌与用户信息响应处理）
+
+未指定--compiled-path时，先把src复制到临时目录并原地编译（需要安装mypy与C编译器）。
+两个版本分别在独立的子进程中运行。
+
+用法:
+    python benchmarks/bench_compiled.py [--iterations 20000] [--compiled-path DIR]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+ROOT = Path(__file__).resolve().parent.parent
+
+USER_JSON = {
+    "id": 42,
+    "username": "alice",
+    "email": "alice@example.com",
+    "phone": "+7 900 000-00-00",
+    "is_active": True,
+    "profile": {
+        "first_name": "Alice",
+        "last_name": "Smith",
+        "avatar_url": "https://cdn.example.com/a.png",
+        "locale": "ru",
+        "timezone": "Europe/Moscow",
+        "additional_info": {"department": "sales"},
+    },
+    "created_at": "2024-01-01T10:00:00Z",
+    "updated_at": "2024-06-01T10:00:00Z",
+}
+
+
+def timeit(fn: Callable[[], None], iterations: int) -> float:
+    """返回单次调用的平均耗时（微秒）"""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def run_worker(iterations: int) -> Dict[str, float]:
+    """在当前sys.path上的SDK版本中运行负载"""
+    import httpx
+
+    from treer_sso_sdk import SSOConfig, SSOInvalidTokenError, TreerSSOClient, UserInfo
+    from treer_sso_sdk.compiled import is_compiled
+    from treer_sso_sdk.interfaces import HTTPClientInterface
+
+    token_body = json.dumps({"access_token": "token", "expires_in": 3600}).encode()
+    user_body = json.dumps(USER_JSON).encode()
+
+    class StandInHTTPClient(HTTPClientInterface):
+        """进程内SSO服务替身"""
+
+        async def post(self, url: str, **kwargs) -> httpx.Response:
+            return httpx.Response(
+                200, content=token_body, request=httpx.Request("POST", url)
+            )
+
+        async def get(self, url: str, **kwargs) -> httpx.Response:
+            return httpx.Response(
+                200, content=user_body, request=httpx.Request("GET", url)
+            )
+
+        async def close(self) -> None:
+            pass
+
+    results = {"compiled": float(is_compiled())}
+    results["UserInfo.from_dict"] = timeit(
+        lambda: UserInfo.from_dict(USER_JSON), iterations
+    )
+
+    users = [UserInfo.from_dict(USER_JSON) for _ in range(iterations)]
+    it = iter(users)
+    results["UserInfo.to_dict"] = timeit(lambda: next(it).to_dict(), iterations)
+
+    results["SSOInvalidTokenError()"] = timeit(
+        lambda: SSOInvalidTokenError("无效的访问令牌", "invalid_token"), iterations
+    )
+
+    async def login_flow() -> float:
+        config = SSOConfig(
+            client_id="bench", client_secret="secret", code_dedup_window=0
+        )
+        client = TreerSSOClient(config, http_client=StandInHTTPClient())
+        count = iterations // 4
+        started = time.perf_counter()
+        for i in range(count):
+            await client.get_user_info_by_code(f"code-{i}")
+        elapsed = time.perf_counter() - started
+        await client.close()
+        return elapsed / count * 1e6
+
+    results["get_user_info_by_code"] = asyncio.run(login_flow())
+    return results
+
+
+def build_compiled(directory: str) -> str:
+    """把源码复制到临时目录并原地编译，返回可加入sys.path的目录"""
+    for name in ("setup.py", "pyproject.toml", "README.md"):
+        shutil.copy(ROOT / name, directory)
+    shutil.copytree(ROOT / "src", Path(directory) / "src")
+    subprocess.run(
+        [sys.executable, "setup.py", "build_ext", "--inplace"],
+        cwd=directory,
+        env=dict(os.environ, TREER_SSO_COMPILE="1"),
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+    return str(Path(directory) / "src")
+
+
+def measure(path: str, iterations: int) -> Dict[str, float]:
+    output = subprocess.run(
+        [sys.executable, __file__, "--worker", path, "--iterations", str(iterations)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output)  # type: ignore[no-any-return]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument(
+        "--compiled-path", help="已编译SDK所在目录（包含treer_sso_sdk包）"
+    )
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        sys.path.insert(0, args.worker)
+        print(json.dumps(run_worker(args.iterations)))
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        compiled_path = args.compiled_path
+        if compiled_path is None:
+            print("编译中...")
+            compiled_path = build_compiled(directory)
+        pure = measure(str(ROOT / "src"), args.iterations)
+        compiled = measure(compiled_path, args.iterations)
+
+    if not compiled.pop("compiled"):
+        print("警告: --compiled-path中的SDK未编译")
+    pure.pop("compiled")
+    print(f"{'操作':24} {'纯Python':>10} {'mypyc':>10} {'加速比':>8}")
+    for name, pure_us in pure.items():
+        compiled_us = compiled[name]
+        speedup = pure_us / compiled_us
+        print(f"{name:24} {pure_us:8.2f}µs {compiled_us:8.2f}µs {speedup:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+结构化事件日志开销基准测试
+
+对比DEBUG未开启时：
+- 旧写法`logger.debug(f"...")`（无论是否输出都会格式化f-string）
+- `if events.enabled(): events.emit(...)`（未开启时只做一次级别判断）
+以及DEBUG开启、采样率1%时记录到空处理器的平均开销。
+
+用法:
+    python benchmarks/bench_events.py [--number 1000000]
+"""
+
+import argparse
+import logging
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from treer_sso_sdk.events import EventLogger  # noqa: E402
+
+URL = "https://sso-api.treer.ru/api/v1/users/me"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    logger = logging.getLogger("bench.events")
+    events = EventLogger("bench.events")
+    sampled = EventLogger("bench.sampled", sample_rate=0.01)
+    sampled_logger = logging.getLogger("bench.sampled")
+    sampled_logger.setLevel(logging.DEBUG)
+    sampled_logger.propagate = False
+    sampled_logger.addHandler(logging.NullHandler())
+
+    def fstring() -> None:
+        logger.debug(f"发送GET请求: {URL} status={200} duration={0.01234:.2f}")
+
+    def guarded() -> None:
+        if events.enabled():
+            events.emit("sso.request", url=URL, status=200, duration_ms=12.34)
+
+    def sampled_enabled() -> None:
+        if sampled.enabled():
+            sampled.emit("sso.request", url=URL, status=200, duration_ms=12.34)
+
+    def baseline() -> None:
+        pass
+
+    cases = {
+        "空函数（基线）": baseline,
+        "logger.debug(f-string)": fstring,
+        "events（未开启）": guarded,
+        "events（开启，1%采样）": sampled_enabled,
+    }
+    for name, case in cases.items():
+        seconds = min(timeit.repeat(case, number=args.number, repeat=5))
+        print(f"{name:<24} {seconds / args.number * 1e9:8.1f} ns/次")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UserInfo构造开销基准测试
+
+对比每个请求解析/users/me响应后构造用户对象的开销：
+- UserInfo.from_dict：立即构造UserProfile并解析两个时间字段
+- LazyUserInfo.from_dict：只读取id/username等字段
+- LazyUserInfo.from_dict后访问profile与时间字段（与立即解析相当的最坏情况）
+
+用法:
+    python benchmarks/bench_lazy_user_info.py [--number 200000]
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from treer_sso_sdk import LazyUserInfo, UserInfo  # noqa: E402
+
+DATA = {
+    "id": 42,
+    "username": "alice",
+    "email": "alice@example.com",
+    "phone": "+7 900 000 00 00",
+    "is_active": True,
+    "profile": {
+        "first_name": "Alice",
+        "last_name": "Wang",
+        "avatar_url": "https://cdn.example.com/avatars/42.png",
+        "additional_info": {"tier": "gold", "department": "food"},
+    },
+    "created_at": "2024-01-01T00:00:00Z",
+    "updated_at": "2024-06-01T12:30:00Z",
+}
+
+
+def lazy_full() -> None:
+    user = LazyUserInfo.from_dict(DATA)
+    user.profile
+    user.created_at
+    user.updated_at
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=200_000)
+    args = parser.parse_args()
+
+    cases = {
+        "UserInfo.from_dict": lambda: UserInfo.from_dict(DATA),
+        "LazyUserInfo（只读id）": lambda: LazyUserInfo.from_dict(DATA).id,
+        "LazyUserInfo（全部访问）": lazy_full,
+    }
+    for name, case in cases.items():
+        seconds = min(timeit.repeat(case, number=args.number, repeat=5))
+        print(f"{name:<24} {seconds / args.number * 1e6:8.2f} us/次")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+单次调用内存分配与内存增长回归基准测试
+
+使用tracemalloc与gc计数器测量以下操作（通过实现HTTPClientInterface的进程内
+SSO服务替身，不涉及网络）：
+- UserInfo.from_dict（模型解析）
+- get_access_token（每次使用新的授权码）
+- get_user_info（每次使用新的访问令牌，默认配置下每次都请求SSO服务）
+
+每个场景先预热到有界缓存（授权码去重、用户信息缓存）填满，再连续调用--calls次，报告：
+- 单次调用的内存峰值（tracemalloc，抽样调用中的最大值）
+- 调用结束并gc.collect()后保留的内存与GC跟踪对象数（稳态下应接近0）
+- 每千次调用触发的0代/2代垃圾回收次数
+
+任一指标超过阈值（THRESHOLDS，可用--max-*覆盖）时以退出码1结束，可在CI中使用。
+
+用法:
+    python benchmarks/bench_memory.py [--calls 100000] [--json]
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import httpx  # noqa: E402
+
+from treer_sso_sdk import SSOConfig, TreerSSOClient, UserInfo  # noqa: E402
+from treer_sso_sdk.interfaces import HTTPClientInterface  # noqa: E402
+from treer_sso_sdk.singleflight import DEFAULT_MAX_ENTRIES  # noqa: E402
+
+USER_JSON = {
+    "id": 42,
+    "username": "alice",
+    "email": "alice@example.com",
+    "phone": "+7 900 000 00 00",
+    "is_active": True,
+    "profile": {
+        "first_name": "Alice",
+        "last_name": "Wang",
+        "avatar_url": "https://cdn.example.com/avatars/42.png",
+        "additional_info": {"tier": "gold", "department": "food"},
+    },
+    "created_at": "2024-01-01T00:00:00Z",
+    "updated_at": "2024-06-01T12:30:00Z",
+}
+
+TOKEN_BODY = json.dumps(
+    {"access_token": "token", "token_type": "Bearer", "expires_in": 3600}
+).encode("utf-8")
+USER_BODY = json.dumps(USER_JSON).encode("utf-8")
+
+# 默认阈值：单次调用峰值（KiB）、--calls次调用后保留的内存（KiB）与GC跟踪对象数、
+# 每千次调用的2代回收次数
+THRESHOLDS: Dict[str, Dict[str, float]] = {
+    "UserInfo.from_dict": {
+        "peak_kib": 16,
+        "retained_kib": 64,
+        "retained_objects": 100,
+        "gc2_per_1k": 1,
+    },
+    "get_access_token": {
+        "peak_kib": 64,
+        "retained_kib": 256,
+        "retained_objects": 1000,
+        "gc2_per_1k": 1,
+    },
+    "get_user_info": {
+        "peak_kib": 64,
+        "retained_kib": 256,
+        "retained_objects": 1000,
+        "gc2_per_1k": 1,
+    },
+}
+
+
+class StandInHTTPClient(HTTPClientInterface):
+    """进程内SSO服务替身"""
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return httpx.Response(
+            200, content=TOKEN_BODY, request=httpx.Request("POST", url)
+        )
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return httpx.Response(200, content=USER_BODY, request=httpx.Request("GET", url))
+
+    async def close(self) -> None:
+        pass
+
+
+async def measure(
+    call: Callable[[int], Awaitable[Any]], calls: int, warmup: int, sample_every: int
+) -> Dict[str, float]:
+    """预热后连续调用calls次并测量内存
+
+    Args:
+        call: 以调用序号为参数的协程函数
+        calls: 测量的调用次数
+        warmup: 预热调用次数
+        sample_every: 每隔多少次调用测量一次单次峰值
+    """
+    # 预热时已开启tracemalloc：否则预热期间写入缓存、未被跟踪的条目在测量期间
+    # 被新条目替换，稳态缓存会表现为内存增长
+    tracemalloc.start()
+    for i in range(warmup):
+        await call(i)
+    gc.collect()
+
+    objects_before = len(gc.get_objects())
+    collections_before = [s["collections"] for s in gc.get_stats()]
+    memory_before, _ = tracemalloc.get_traced_memory()
+
+    peaks: List[int] = []
+    started = time.perf_counter()
+    for i in range(warmup, warmup + calls):
+        if i % sample_every == 0:
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            await call(i)
+            peaks.append(tracemalloc.get_traced_memory()[1] - current)
+        else:
+            await call(i)
+    elapsed = time.perf_counter() - started
+
+    collections = [
+        s["collections"] - before
+        for s, before in zip(gc.get_stats(), collections_before)
+    ]
+    gc.collect()
+    memory_after, _ = tracemalloc.get_traced_memory()
+    # 去掉gc.get_objects()返回的列表本身
+    objects_after = len(gc.get_objects()) - 1
+    tracemalloc.stop()
+
+    retained = memory_after - memory_before
+    return {
+        "us_per_call": elapsed / calls * 1e6,
+        "peak_kib": max(peaks) / 1024,
+        "peak_kib_median": sorted(peaks)[len(peaks) // 2] / 1024,
+        "retained_kib": retained / 1024,
+        "retained_bytes_per_call": retained / calls,
+        "retained_objects": objects_after - objects_before,
+        "gc0_per_1k": collections[0] / calls * 1000,
+        "gc2_per_1k": collections[2] / calls * 1000,
+    }
+
+
+async def run_scenarios(calls: int, sample_every: int) -> Dict[str, Dict[str, float]]:
+    config = SSOConfig(client_id="bench", client_secret="secret")
+    client = TreerSSOClient(config, http_client=StandInHTTPClient())
+    # 预热次数超过有界缓存的容量（用户信息缓存与授权码去重结果），测量期间缓存处于稳态
+    warmup = max(config.user_info_cache_size, DEFAULT_MAX_ENTRIES) + 1000
+
+    async def parse(i: int) -> None:
+        UserInfo.from_dict(USER_JSON)
+
+    async def access_token(i: int) -> None:
+        await client.get_access_token(f"code-{i}")
+
+    async def user_info(i: int) -> None:
+        await client.get_user_info(f"token-{i}")
+
+    results = {
+        "UserInfo.from_dict": await measure(parse, calls, 1000, sample_every),
+        "get_access_token": await measure(access_token, calls, warmup, sample_every),
+        "get_user_info": await measure(user_info, calls, warmup, sample_every),
+    }
+    await client.close()
+    return results
+
+
+def check(
+    results: Dict[str, Dict[str, float]], overrides: Dict[str, Optional[float]]
+) -> List[str]:
+    """返回超过阈值的指标说明"""
+    failures = []
+    for name, metrics in results.items():
+        for metric, limit in THRESHOLDS[name].items():
+            override = overrides.get(metric)
+            if override is not None:
+                limit = override
+            if metrics[metric] > limit:
+                failures.append(f"{name}: {metric} = {metrics[metric]:.2f} > {limit:g}")
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=100_000)
+    parser.add_argument(
+        "--sample-every", type=int, default=100, help="单次峰值的抽样间隔"
+    )
+    parser.add_argument("--max-peak-kib", type=float, help="覆盖所有场景的单次峰值阈值")
+    parser.add_argument(
+        "--max-retained-kib", type=float, help="覆盖所有场景的保留内存阈值"
+    )
+    parser.add_argument(
+        "--max-retained-objects", type=float, help="覆盖所有场景的保留对象数阈值"
+    )
+    parser.add_argument("--json", action="store_true", help="以JSON输出结果")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_scenarios(args.calls, args.sample_every))
+    failures = check(
+        results,
+        {
+            "peak_kib": args.max_peak_kib,
+            "retained_kib": args.max_retained_kib,
+            "retained_objects": args.max_retained_objects,
+        },
+    )
+
+    if args.json:
+        print(
+            json.dumps(
+                {"results": results, "failures": failures}, ensure_ascii=False, indent=2
+            )
+        )
+    else:
+        print(f"{args.calls}次调用")
+        print(
+            f"{'场景':<20} {'耗时':>10} {'峰值':>10} {'峰值中位':>10} {'保留':>10}"
+            f" {'保留/次':>9} {'保留对象':>8} {'gc0/千次':>9} {'gc2/千次':>9}"
+        )
+        for name, m in results.items():
+            print(
+                f"{name:<20} {m['us_per_call']:8.2f}us {m['peak_kib']:7.2f}KiB"
+                f" {m['peak_kib_median']:7.2f}KiB {m['retained_kib']:7.2f}KiB"
+                f" {m['retained_bytes_per_call']:7.2f}B {m['retained_objects']:8.0f}"
+                f" {m['gc0_per_1k']:9.2f} {m['gc2_per_1k']:9.2f}"
+            )
+        for failure in failures:
+            print(f"超过阈值: {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
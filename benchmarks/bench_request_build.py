@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SDK层每请求CPU开销基准测试（不含网络）
+
+1. 请求构造：对比逐次拼接URL字符串、构造表单字典并由httpx编码，
+   与预编译模板（缓存的URL对象 + 预编码表单前缀）生成同一请求的耗时
+2. 端到端：通过httpx.MockTransport（不经过网络）调用get_access_token与
+   get_user_info，测量SDK与httpx客户端层的总开销
+
+用法:
+    python benchmarks/bench_request_build.py [--number 20000]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import timeit
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from treer_sso_sdk import SSOConfig, TreerSSOClient  # noqa: E402
+from treer_sso_sdk.http_client import AsyncHTTPClient  # noqa: E402
+from treer_sso_sdk.templates import TOKEN_PATH, RequestTemplates  # noqa: E402
+
+CONFIG = SSOConfig(
+    client_id="food-ordering",
+    client_secret="s3cr3t-value-with-some-length",
+    code_dedup_window=0,
+)
+CODE = "Xk2v9Qw_authorization-code_8sJd0"
+REDIRECT_URI = "https://food.example.com/oauth/callback"
+
+
+def bench_build(number: int) -> None:
+    client = httpx.AsyncClient()
+    templates = RequestTemplates(CONFIG)
+    endpoint = TreerSSOClient(CONFIG).endpoints.endpoints[0]
+    http_client = AsyncHTTPClient(CONFIG)
+
+    def legacy() -> httpx.Request:
+        data = {
+            "grant_type": "authorization_code",
+            "code": CODE,
+            "client_id": CONFIG.client_id,
+            "client_secret": CONFIG.client_secret,
+            "redirect_uri": REDIRECT_URI,
+        }
+        return client.build_request(
+            "POST",
+            f"{CONFIG.sso_base_url}/api/v1/oauth/token",
+            data=data,
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
+
+    def templated() -> httpx.Request:
+        return client.build_request(
+            "POST",
+            http_client._url(templates.url(endpoint, TOKEN_PATH)),
+            content=templates.token_form(CODE, REDIRECT_URI),
+            headers=RequestTemplates.TOKEN_HEADERS,
+        )
+
+    assert templated().url == legacy().url
+    for name, case in (("逐次构造", legacy), ("预编译模板", templated)):
+        seconds = min(timeit.repeat(case, number=number, repeat=5))
+        print(f"令牌请求构造 {name:<8} {seconds / number * 1e6:8.2f} us/次")
+
+
+async def bench_end_to_end(number: int) -> None:
+    token = httpx.Response(200, json={"access_token": "t", "expires_in": 3600})
+    user = httpx.Response(200, json={"id": 1, "username": "alice"})
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return token if request.url.path == TOKEN_PATH else user
+
+    http_client = AsyncHTTPClient(CONFIG, transport=httpx.MockTransport(handler))
+    async with TreerSSOClient(CONFIG, http_client=http_client) as client:
+        for name, call in (
+            ("get_access_token", lambda: client.get_access_token(CODE, REDIRECT_URI)),
+            ("get_user_info", lambda: client.get_user_info("t")),
+        ):
+            for _ in range(100):
+                await call()
+            started = time.perf_counter()
+            for _ in range(number):
+                await call()
+            elapsed = time.perf_counter() - started
+            print(f"端到端 {name:<18} {elapsed / number * 1e6:8.2f} us/次")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=20_000)
+    args = parser.parse_args()
+    bench_build(args.number)
+    asyncio.run(bench_end_to_end(args.number))
+
+
+if __name__ == "__main__":
+    main()
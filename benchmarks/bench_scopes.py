@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+授权范围检查基准测试
+
+对比每次检查都重新split scope字符串与预解析后的单次检查开销：
+- split: `"orders:write" in scope.split()`
+- frozenset: `ScopeRequirement.matches(token.scopes)`
+- 位掩码: `MaskRequirement.matches(mask)`
+
+用法:
+    python benchmarks/bench_scopes.py [--number 1000000]
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from treer_sso_sdk import (  # noqa: E402
+    ScopeRequirement,
+    ScopeVocabulary,
+    TokenResponse,
+    parse_scopes,
+)
+
+SCOPE = "openid profile email orders:read orders:write payments:read menu:read"
+REQUIRED = ("orders:read", "orders:write")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    token = TokenResponse(access_token="t", scope=SCOPE)
+    requirement = ScopeRequirement(all_of=REQUIRED)
+    vocabulary = ScopeVocabulary(parse_scopes(SCOPE))
+    mask_requirement = vocabulary.requirement(all_of=REQUIRED)
+    mask = vocabulary.mask(SCOPE)
+    scopes = token.scopes
+
+    cases = {
+        "split每次解析": lambda: all(name in SCOPE.split() for name in REQUIRED),
+        "TokenResponse.has_all": lambda: token.has_all(REQUIRED),
+        "ScopeRequirement": lambda: requirement.matches(token.scopes),
+        "ScopeRequirement(预解析)": lambda: requirement.matches(scopes),
+        "MaskRequirement": lambda: mask_requirement.matches(mask),
+    }
+    for name, case in cases.items():
+        assert case()
+        seconds = min(timeit.repeat(case, number=args.number, repeat=5))
+        print(f"{name:<24} {seconds / args.number * 1e9:8.1f} ns/次")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UserInfo序列化基准测试
+
+对比：
+- 每次重建的to_dict/JSON序列化与缓存后的to_dict/to_json_bytes
+- json.loads + UserInfo.from_dict与二进制格式UserInfo.from_bytes
+
+用法:
+    python benchmarks/bench_serialization.py [--number 100000]
+"""
+
+import argparse
+import json
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from treer_sso_sdk import UserInfo  # noqa: E402
+
+USER = {
+    "id": 42,
+    "username": "alice",
+    "email": "alice@example.com",
+    "phone": "+7 900 000 00 00",
+    "profile": {
+        "first_name": "Alice",
+        "last_name": "Wang",
+        "avatar_url": "https://cdn.example.com/avatars/42.png",
+        "additional_info": {"tier": "gold", "department": "food"},
+    },
+    "created_at": "2024-01-01T00:00:00Z",
+    "updated_at": "2024-06-01T12:30:00Z",
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=100_000)
+    args = parser.parse_args()
+
+    user = UserInfo.from_dict(USER)
+    json_bytes = user.to_json_bytes()
+    binary = user.to_bytes()
+
+    def rebuild_json() -> bytes:
+        user.invalidate()
+        return json.dumps(user.to_dict(), separators=(",", ":")).encode()
+
+    cases = {
+        "to_dict（重建）": lambda: user._build_dict(),
+        "to_dict（缓存）": user.to_dict,
+        "JSON序列化（重建）": rebuild_json,
+        "to_json_bytes（缓存）": user.to_json_bytes,
+        "json.loads + from_dict": lambda: UserInfo.from_dict(json.loads(json_bytes)),
+        "from_bytes": lambda: UserInfo.from_bytes(binary),
+    }
+    print(f"JSON {len(json_bytes)} 字节，二进制 {len(binary)} 字节")
+    for name, case in cases.items():
+        seconds = min(timeit.repeat(case, number=args.number, repeat=5))
+        print(f"{name:<24} {seconds / args.number * 1e6:8.2f} us/次")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TLS配置共享基准测试
+
+对比共享SSLContext（share_ssl_context=True）与每个客户端各自创建SSLContext时：
+- 客户端构造耗时（含加载CA证书包）
+- 新客户端首个HTTPS请求的延迟，以及TLS会话恢复情况
+
+使用openssl生成自签名证书，并在本地启动HTTPS服务作为SSO服务替身。
+
+用法:
+    python benchmarks/bench_tls.py [--iterations 200]
+"""
+
+import argparse
+import asyncio
+import http.server
+import os
+import ssl
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from treer_sso_sdk import SSOConfig  # noqa: E402
+from treer_sso_sdk.http_client import AsyncHTTPClient  # noqa: E402
+from treer_sso_sdk.tls import clear_ssl_context_cache  # noqa: E402
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    """返回固定用户信息的处理器"""
+
+    protocol_version = "HTTP/1.1"
+    body = b'{"id": 1, "username": "alice"}'
+
+    def do_GET(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+def generate_certificate(directory: str) -> str:
+    """生成localhost自签名证书，返回PEM文件路径"""
+    cert = os.path.join(directory, "cert.pem")
+    key = os.path.join(directory, "key.pem")
+    subprocess.run(
+        [
+            "openssl",
+            "req",
+            "-x509",
+            "-newkey",
+            "rsa:2048",
+            "-nodes",
+            "-keyout",
+            key,
+            "-out",
+            cert,
+            "-days",
+            "1",
+            "-subj",
+            "/CN=localhost",
+            "-addext",
+            "subjectAltName=DNS:localhost",
+        ],
+        check=True,
+        capture_output=True,
+    )
+    with open(cert, "a") as f, open(key) as k:
+        f.write(k.read())
+    return cert
+
+
+def start_server(cert: str) -> int:
+    """启动本地HTTPS服务，返回端口"""
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.server_address[1]
+
+
+def bench_construction(share: bool, iterations: int) -> float:
+    """构造客户端（含创建传输层）的平均耗时（毫秒）"""
+    clear_ssl_context_cache()
+    config = SSOConfig("bench", "bench", share_ssl_context=share)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        AsyncHTTPClient(config)._build_transport()
+    return (time.perf_counter() - started) * 1000 / iterations
+
+
+async def bench_first_request(share: bool, url: str, iterations: int) -> dict:
+    """新客户端首个请求的延迟（毫秒）与会话恢复比例"""
+    clear_ssl_context_cache()
+    config = SSOConfig("bench", "bench", share_ssl_context=share)
+    latencies = []
+    reused = 0
+    for _ in range(iterations):
+        client = AsyncHTTPClient(config)
+        started = time.perf_counter()
+        response = await client.get(url)
+        latencies.append((time.perf_counter() - started) * 1000)
+        stream = response.extensions.get("network_stream")
+        ssl_object = stream.get_extra_info("ssl_object") if stream else None
+        if ssl_object is not None and ssl_object.session_reused:
+            reused += 1
+        await client.close()
+    latencies.sort()
+    return {
+        "p50": statistics.median(latencies),
+        "p90": latencies[int(len(latencies) * 0.9)],
+        "reused": reused / iterations,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        cert = generate_certificate(directory)
+        os.environ["SSL_CERT_FILE"] = cert
+        url = f"https://localhost:{start_server(cert)}/api/v1/users/me"
+
+        print(
+            f"{'模式':<10}{'构造(ms)':>12}{'首请求p50(ms)':>16}"
+            f"{'首请求p90(ms)':>16}{'会话恢复':>10}"
+        )
+        for share in (False, True):
+            construction = bench_construction(share, args.iterations)
+            first = asyncio.run(bench_first_request(share, url, args.iterations))
+            name = "共享" if share else "独立"
+            print(
+                f"{name:<10}{construction:>12.3f}{first['p50']:>16.3f}"
+                f"{first['p90']:>16.3f}{first['reused']:>10.0%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
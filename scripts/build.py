@@ -6,6 +6,7 @@
 用于构建和发布Treer SSO SDK包到PyPI
 """
 
+import importlib.util
 import os
 import sys
 import subprocess
@@ -13,10 +14,10 @@ import shutil
 from pathlib import Path
 
 
-def run_command(cmd, check=True):
+def run_command(cmd, check=True, env=None):
     """运行命令"""
     print(f"运行命令: {cmd}")
-    result = subprocess.run(cmd, shell=True, check=check)
+    result = subprocess.run(cmd, shell=True, check=check, env=env)
     return result
 
 
@@ -131,6 +132,30 @@ def build():
         return False
 
 
+def build_compiled():
+    """构建mypyc编译的wheel包，mypyc不可用或编译失败时回退到纯Python包"""
+    print("构建编译版wheel包...")
+    
+    if importlib.util.find_spec("mypyc") is None:
+        print("✗ 未安装mypy（pip install mypy），回退到纯Python构建")
+        return build()
+    
+    clean()
+    
+    # 编译需要当前环境中的mypy，因此不使用隔离构建环境
+    env = dict(os.environ, TREER_SSO_COMPILE="1")
+    result = run_command("python -m build --wheel --no-isolation", check=False, env=env)
+    
+    if result.returncode != 0:
+        print("✗ 编译构建失败，回退到纯Python构建")
+        return build()
+    
+    print("✓ 编译版wheel包构建成功")
+    for file in Path("dist").iterdir():
+        print(f"  {file.name} ({file.stat().st_size} bytes)")
+    return True
+
+
 def check_package():
     """检查包"""
     print("检查包...")
@@ -193,6 +218,7 @@ def main():
         print("  lint       - 代码检查")
         print("  test       - 运行测试")
         print("  build      - 构建包")
+        print("  build-compiled - 构建mypyc编译的wheel包（失败时回退到纯Python）")
         print("  check-pkg  - 检查包")
         print("  test-pypi  - 上传到测试PyPI")
         print("  pypi       - 发布到生产PyPI")
@@ -215,6 +241,9 @@ def main():
     elif command == "build":
         if not build():
             sys.exit(1)
+    elif command == "build-compiled":
+        if not build_compiled():
+            sys.exit(1)
     elif command == "check-pkg":
         if not check_package():
             sys.exit(1)
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+可选的mypyc编译构建
+
+包的元数据与依赖见pyproject.toml，默认构建纯Python包。设置环境变量
+TREER_SSO_COMPILE=1时使用mypyc把COMPILED_MODULES编译为C扩展；未安装mypy时
+回退到纯Python构建。通常通过`python scripts/build.py build-compiled`调用。
+"""
+
+import os
+import sys
+
+from setuptools import setup
+
+# 编译的热路径模块，其余模块（网络、缓存、ASGI等）以I/O为主，保持纯Python
+COMPILED_MODULES = [
+    "models",
+    "exceptions",
+    "scopes",
+    "templates",
+    "events",
+    "client",
+]
+
+
+def ext_modules():
+    """需要编译时返回mypyc扩展模块列表"""
+    if os.environ.get("TREER_SSO_COMPILE") != "1":
+        return []
+    try:
+        from mypyc.build import mypycify
+    except ImportError:
+        print("未安装mypy，构建纯Python包", file=sys.stderr)
+        return []
+    # 只以mypy默认规则检查编译模块（pyproject.toml中的严格配置面向整个代码库的lint），
+    # brotli、starlette等可选依赖未安装时不影响编译
+    return mypycify(
+        ["--config-file", "", "--ignore-missing-imports"]
+        + [f"src/treer_sso_sdk/{name}.py" for name in COMPILED_MODULES],
+        opt_level="3",
+        # 分模块编译时，类型检查使用isinstance语义，用户代码中的子类（如继承UserInfo）
+        # 可以传入编译后的函数
+        separate=True,
+    )
+
+
+setup(ext_modules=ext_modules())
@@ -14,8 +14,18 @@ __license__ = "MIT"
 
 # 导入主要类和函数
 from .client import TreerSSOClient
+from .registry import SSOClientRegistry
 from .config import SSOConfig
-from .models import UserInfo, UserProfile, TokenResponse
+from .models import (
+    UserInfo,
+    LazyUserInfo,
+    UserProfile,
+    TokenResponse,
+    TokenIntrospection,
+    CachedUserInfo,
+    UserInfoResult,
+    LazyJSON,
+)
 from .exceptions import (
     SSOError,
     SSOConfigError,
@@ -23,8 +33,28 @@ from .exceptions import (
     SSONetworkError,
     SSOInvalidTokenError,
     SSOInvalidCodeError,
+    SSOOverloadError,
+    SSOResponseTooLargeError,
 )
 from .utils import get_user_info_by_code
+from .resolver import CachingResolver, SystemResolver
+from .limiter import AIMDLimiter, GradientLimiter
+from .priority import AdmissionTimeout, Priority, request_priority
+from .cache import IntrospectionCache, MemoryUserInfoCache
+from .sqlite_cache import SQLiteUserInfoCache
+from .stats import ClientStats
+from .session import SessionSigner
+from .revalidation import SessionChange, SessionChangeKind, SessionRevalidator
+from .timingwheel import TimingWheel
+from .scopes import (
+    ScopeRequirement,
+    ScopeVocabulary,
+    has_all,
+    has_any,
+    has_scope,
+    parse_scopes,
+)
+from .asgi import SSOMiddleware, SSORequestContext, current_user, require_user
 
 # 定义公共API
 __all__ = [
@@ -35,11 +65,17 @@ __all__ = [
     "__license__",
     # 主要类
     "TreerSSOClient",
+    "SSOClientRegistry",
     "SSOConfig",
     # 数据模型
     "UserInfo",
+    "LazyUserInfo",
     "UserProfile", 
     "TokenResponse",
+    "TokenIntrospection",
+    "CachedUserInfo",
+    "UserInfoResult",
+    "LazyJSON",
     # 异常类
     "SSOError",
     "SSOConfigError",
@@ -47,6 +83,42 @@ __all__ = [
     "SSONetworkError",
     "SSOInvalidTokenError",
     "SSOInvalidCodeError",
+    "SSOOverloadError",
+    "SSOResponseTooLargeError",
     # 便捷函数
     "get_user_info_by_code",
+    # DNS解析
+    "CachingResolver",
+    "SystemResolver",
+    # 并发限制
+    "AIMDLimiter",
+    "GradientLimiter",
+    # 请求优先级
+    "AdmissionTimeout",
+    "Priority",
+    "request_priority",
+    # 缓存与统计
+    "MemoryUserInfoCache",
+    "IntrospectionCache",
+    "SQLiteUserInfoCache",
+    "ClientStats",
+    # 授权范围
+    "ScopeRequirement",
+    "ScopeVocabulary",
+    "has_all",
+    "has_any",
+    "has_scope",
+    "parse_scopes",
+    # 本地会话
+    "SessionSigner",
+    # 会话重新验证
+    "SessionRevalidator",
+    "SessionChange",
+    "SessionChangeKind",
+    "TimingWheel",
+    # ASGI集成
+    "SSOMiddleware",
+    "SSORequestContext",
+    "current_user",
+    "require_user",
 ] 
\ No newline at end of file
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Treer SSO SDK ASGI集成
+
+SSOMiddleware在应用生命周期内持有一个TreerSSOClient（共享连接池与缓存），
+为每个请求在scope中放入SSORequestContext：从Authorization头提取Bearer令牌，
+首次需要时解析用户信息，同一请求内的多个处理函数/依赖复用同一结果。
+配置SessionSigner后，优先在本地校验会话Cookie，校验通过时不访问SSO服务。
+
+适用于Starlette、FastAPI等任意ASGI框架，不依赖框架本身。
+
+Example:
+    >>> app = FastAPI()
+    >>> app.add_middleware(SSOMiddleware, config=SSOConfig("id", "secret"))
+    >>>
+    >>> @app.get("/me")
+    ... async def me(user: UserInfo = Depends(require_user)):
+    ...     return user.to_dict()
+"""
+
+import json
+from http.cookies import CookieError, SimpleCookie
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    MutableMapping,
+    Optional,
+)
+
+import anyio
+
+from .client import TreerSSOClient
+from .config import SSOConfig
+from .exceptions import SSOAuthenticationError, SSOConfigError, SSOInvalidTokenError
+from .models import UserInfo
+from .session import SessionSigner
+
+if TYPE_CHECKING:
+    from starlette.requests import HTTPConnection
+else:
+    # FastAPI在运行时解析依赖函数的注解，安装了Starlette时需要真实的类
+    try:
+        from starlette.requests import HTTPConnection
+    except ImportError:  # 未安装Starlette时仍可作为纯ASGI中间件使用
+        HTTPConnection = Any
+
+Scope = MutableMapping[str, Any]
+Message = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+SCOPE_KEY = "treer_sso"
+
+
+def _bearer_token(scope: Scope) -> Optional[str]:
+    """从请求头中提取Bearer令牌"""
+    for name, value in scope.get("headers", ()):
+        if name == b"authorization":
+            header: str = value.decode("latin-1")
+            scheme, _, token = header.partition(" ")
+            if scheme.lower() == "bearer" and token.strip():
+                return token.strip()
+            return None
+    return None
+
+
+def _cookie(scope: Scope, name: str) -> Optional[str]:
+    """从请求头中提取指定Cookie"""
+    for header, value in scope.get("headers", ()):
+        if header == b"cookie":
+            cookies: SimpleCookie = SimpleCookie()
+            try:
+                cookies.load(value.decode("latin-1"))
+            except CookieError:
+                continue
+            if name in cookies:
+                return cookies[name].value
+    return None
+
+
+class SSORequestContext:
+    """单个请求的SSO上下文
+
+    用户信息在首次调用user()时解析，结果（包括失败）在请求内缓存，
+    并发调用只触发一次解析。会话令牌校验通过时直接使用其中的用户信息，
+    否则回退到访问令牌
+
+    Args:
+        client: 应用共享的SSO客户端
+        access_token: 请求携带的访问令牌，未携带时为None
+        session_token: 请求携带的会话令牌，未携带时为None
+        signer: 会话令牌签名器
+    """
+
+    def __init__(
+        self,
+        client: TreerSSOClient,
+        access_token: Optional[str],
+        session_token: Optional[str] = None,
+        signer: Optional[SessionSigner] = None,
+    ) -> None:
+        self.client = client
+        self.access_token = access_token
+        self.session_token = session_token
+        self.signer = signer
+        self.from_session = False
+        self._lock = anyio.Lock()
+        self._resolved = False
+        self._user_info: Optional[UserInfo] = None
+        self._error: Optional[BaseException] = None
+
+    async def user(self) -> Optional[UserInfo]:
+        """获取当前用户
+
+        Returns:
+            用户信息，请求未携带令牌时为None
+
+        Raises:
+            SSOInvalidTokenError: 访问令牌无效
+            SSONetworkError: 网络请求失败
+        """
+        if not self._resolved:
+            async with self._lock:
+                if not self._resolved:
+                    await self._resolve()
+        if self._error is not None:
+            raise self._error
+        return self._user_info
+
+    async def require_user(self) -> UserInfo:
+        """获取当前用户，未携带令牌时抛出SSOInvalidTokenError"""
+        user_info = await self.user()
+        if user_info is None:
+            raise SSOInvalidTokenError("缺少访问令牌或会话", "missing_token")
+        return user_info
+
+    async def _resolve(self) -> None:
+        if self.session_token is not None and self.signer is not None:
+            try:
+                self._user_info = self.signer.verify(self.session_token)
+            except SSOInvalidTokenError as e:
+                if self.access_token is None:
+                    self._error = e
+            else:
+                self.from_session = True
+                self._resolved = True
+                return
+        if self.access_token is not None:
+            try:
+                self._user_info = await self.client.get_user_info(self.access_token)
+            except Exception as e:
+                self._error = e
+        self._resolved = True
+
+
+class SSOMiddleware:
+    """SSO ASGI中间件
+
+    - lifespan关闭时关闭自己创建的客户端
+    - http/websocket请求在scope["treer_sso"]中放入SSORequestContext
+    - 应用在发送响应前抛出SSOAuthenticationError时返回401
+
+    Args:
+        app: 下游ASGI应用
+        config: SSO配置，用于创建应用级客户端
+        client: 已有的SSO客户端（与config二选一，由调用方负责关闭）
+        session_signer: 会话令牌签名器（可选），配置后读取会话Cookie
+        session_cookie: 会话Cookie名称
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        config: Optional[SSOConfig] = None,
+        client: Optional[TreerSSOClient] = None,
+        session_signer: Optional[SessionSigner] = None,
+        session_cookie: str = "treer_session",
+    ) -> None:
+        if (config is None) == (client is None):
+            raise SSOConfigError("config和client必须且只能提供一个")
+        self.app = app
+        self.session_signer = session_signer
+        self.session_cookie = session_cookie
+        self._owns_client = client is None
+        self.client = client or TreerSSOClient(config)  # type: ignore[arg-type]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await self.app(scope, receive, self._lifespan_send(send))
+            return
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        session_token = None
+        if self.session_signer is not None:
+            session_token = _cookie(scope, self.session_cookie)
+        scope[SCOPE_KEY] = SSORequestContext(
+            self.client, _bearer_token(scope), session_token, self.session_signer
+        )
+        if scope["type"] == "websocket":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def tracking_send(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, tracking_send)
+        except SSOAuthenticationError as e:
+            if response_started:
+                raise
+            await self._send_unauthorized(send, e)
+
+    def _lifespan_send(self, send: Send) -> Send:
+        async def lifespan_send(message: Message) -> None:
+            if message["type"] == "lifespan.shutdown.complete" and self._owns_client:
+                await self.client.close()
+            await send(message)
+
+        return lifespan_send
+
+    @staticmethod
+    async def _send_unauthorized(send: Send, error: SSOAuthenticationError) -> None:
+        body = json.dumps(
+            {
+                "error": "invalid_token",
+                "error_description": error.message,
+            },
+            ensure_ascii=False,
+        ).encode("utf-8")
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 401,
+                "headers": [
+                    (b"content-type", b"application/json; charset=utf-8"),
+                    (b"content-length", str(len(body)).encode("ascii")),
+                    (b"www-authenticate", b'Bearer error="invalid_token"'),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+def get_sso_context(connection: Any) -> SSORequestContext:
+    """获取请求的SSO上下文
+
+    Args:
+        connection: ASGI scope，或带有scope属性的请求对象（如Starlette Request）
+
+    Raises:
+        SSOConfigError: 请求未经过SSOMiddleware
+    """
+    scope: Dict[str, Any] = getattr(connection, "scope", connection)
+    try:
+        return scope[SCOPE_KEY]  # type: ignore[no-any-return]
+    except KeyError:
+        raise SSOConfigError("请求未经过SSOMiddleware") from None
+
+
+async def current_user(request: "HTTPConnection") -> Optional[UserInfo]:
+    """FastAPI依赖：当前用户，未携带令牌时为None"""
+    return await get_sso_context(request).user()
+
+
+async def require_user(request: "HTTPConnection") -> UserInfo:
+    """FastAPI依赖：当前用户，未携带令牌或令牌无效时由中间件返回401"""
+    return await get_sso_context(request).require_user()
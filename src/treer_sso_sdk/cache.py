@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Treer SSO SDK用户信息与令牌自省缓存
+"""
+
+import hashlib
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from .interfaces import UserInfoCacheInterface
+from .models import CachedUserInfo, TokenIntrospection
+
+
+def token_cache_key(access_token: str) -> str:
+    """由访问令牌生成缓存键
+
+    缓存中只保存令牌的SHA-256摘要，不保存令牌原文
+
+    Args:
+        access_token: 访问令牌
+
+    Returns:
+        十六进制摘要字符串
+    """
+    return hashlib.sha256(access_token.encode("utf-8")).hexdigest()
+
+
+class MemoryUserInfoCache(UserInfoCacheInterface):
+    """进程内LRU用户信息缓存
+
+    条目过期后仍会保留（直到被LRU淘汰），以便携带ETag发起条件请求
+
+    Args:
+        max_entries: 最大条目数
+    """
+
+    def __init__(self, max_entries: int = 10000) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CachedUserInfo]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[CachedUserInfo]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, entry: CachedUserInfo) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class IntrospectionCache:
+    """进程内LRU令牌自省缓存
+
+    只缓存有效（active）且带过期时间的结果，条目在令牌过期时失效
+
+    Args:
+        max_entries: 最大条目数
+    """
+
+    def __init__(self, max_entries: int = 10000) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, TokenIntrospection]]" = (
+            OrderedDict()
+        )
+
+    def get(self, key: str, now: float) -> Optional[TokenIntrospection]:
+        """获取未过期的自省结果"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= now:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: str, result: TokenIntrospection, now: float) -> None:
+        """缓存自省结果（无效或已过期的结果不缓存）"""
+        if not result.active or result.exp is None or result.exp <= now:
+            return
+        self._entries[key] = (float(result.exp), result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -4,13 +4,25 @@
 Treer SSO SDK主要客户端实现
 """
 
+import asyncio
+import hashlib
 import json
 import logging
-from typing import Optional
+import time
+from functools import partial
+from typing import Any, List, Optional, Set, Tuple
 
+import anyio
 import httpx
+from anyio.abc import TaskGroup
 
+from . import forksafe
+from .cache import IntrospectionCache, MemoryUserInfoCache, token_cache_key
+from .compiled import mypyc_attr
+from .concurrency import asyncio_running, spawn_system_task
 from .config import SSOConfig
+from .endpoints import Endpoint, EndpointSelector
+from .events import EventLogger
 from .exceptions import (
     SSOError,
     SSOAuthenticationError,
@@ -19,10 +31,34 @@ from .exceptions import (
     SSONetworkError,
 )
 from .http_client import AsyncHTTPClient
-from .interfaces import HTTPClientInterface, SSOClientInterface
-from .models import TokenResponse, UserInfo
+from .interfaces import (
+    HTTPClientInterface,
+    SSOClientInterface,
+    UserInfoCacheInterface,
+)
+from .models import (
+    CachedUserInfo,
+    LazyUserInfo,
+    TokenIntrospection,
+    TokenResponse,
+    UserInfo,
+    UserInfoResult,
+    loads_user_info,
+)
+from .priority import AdmissionTimeout, Priority, request_priority, request_timing
+from .session import SessionSigner
+from .singleflight import SingleFlight
+from .sqlite_cache import SQLiteUserInfoCache
+from .stats import ClientStats
+from .templates import INTROSPECT_PATH, TOKEN_PATH, USER_INFO_PATH, RequestTemplates
+
+
+def _token_id(cache_key: str) -> str:
+    """日志中标识令牌的短摘要（取缓存键即SHA-256摘要的前12位）"""
+    return cache_key[:12]
 
 
+@mypyc_attr(native_class=False)
 class TreerSSOClient(SSOClientInterface):
     """Treer SSO客户端
     
@@ -45,17 +81,141 @@ class TreerSSOClient(SSOClientInterface):
     def __init__(
         self, 
         config: SSOConfig, 
-        http_client: Optional[HTTPClientInterface] = None
+        http_client: Optional[HTTPClientInterface] = None,
+        user_info_cache: Optional[UserInfoCacheInterface] = None
     ) -> None:
         """初始化SSO客户端
         
         Args:
             config: SSO配置对象
             http_client: HTTP客户端实现（可选，主要用于测试）
+            user_info_cache: 用户信息缓存后端（可选，默认使用进程内LRU缓存）
         """
         self.config = config
         self.http_client = http_client or AsyncHTTPClient(config)
+        self.endpoints = EndpointSelector(config.endpoints)
+        self.templates = RequestTemplates(config)
+        self._owns_user_info_cache = user_info_cache is None
+        self.user_info_cache = user_info_cache or self._create_user_info_cache()
+        self.stats = ClientStats()
+        self._revalidating: Set[str] = set()
+        self._background_tasks: Set["asyncio.Task[None]"] = set()
+        self._task_group: Optional[TaskGroup] = None
+        self._runner_done: Optional[anyio.Event] = None
+        self._code_exchanges: SingleFlight[TokenResponse] = SingleFlight(
+            config.code_dedup_window
+        )
+        self.introspection_cache = IntrospectionCache(config.introspection_cache_size)
+        self._introspections: SingleFlight[TokenIntrospection] = SingleFlight(ttl=0)
         self.logger = logging.getLogger(__name__)
+        self.events = EventLogger(__name__, config.log_sample_rate)
+        forksafe.register(self)
+    
+    def _after_fork(self) -> None:
+        """子进程中丢弃父进程事件循环上的后台刷新任务与在途请求计数"""
+        self._revalidating = set()
+        self._background_tasks = set()
+        self._task_group = None
+        self._runner_done = None
+        # fork时父进程正在进行的请求不会在子进程中完成，保留计数会使端点评分永久偏高
+        for endpoint in self.endpoints.endpoints:
+            endpoint.in_flight = 0
+    
+    def _create_user_info_cache(self) -> UserInfoCacheInterface:
+        """根据配置创建用户信息缓存后端"""
+        if self.config.user_info_cache_path:
+            return SQLiteUserInfoCache(
+                self.config.user_info_cache_path,
+                max_entries=self.config.user_info_cache_size
+            )
+        return MemoryUserInfoCache(self.config.user_info_cache_size)
+    
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        token_id: Optional[str] = None,
+        **kwargs: Any
+    ) -> httpx.Response:
+        """通过端点选择器向SSO服务发送请求
+        
+        每次请求选择当前最佳的健康端点，并把耗时与结果反馈给选择器。
+        连接阶段失败（请求未到达服务端）时，在重试次数内切换到其他端点重试
+        
+        Args:
+            method: HTTP方法，"GET"或"POST"
+            path: 接口路径
+            token_id: 访问令牌摘要前缀，仅用于事件日志
+            **kwargs: 传给HTTP客户端的请求参数
+            
+        Returns:
+            HTTP响应对象
+            
+        Raises:
+            httpx.RequestError: 网络请求错误
+        """
+        send = self.http_client.get if method == "GET" else self.http_client.post
+        tried: List[Endpoint] = []
+        
+        while True:
+            endpoint = self.endpoints.select(exclude=tried)
+            tried.append(endpoint)
+            url = self.templates.url(endpoint, path)
+            
+            endpoint.in_flight += 1
+            response: Optional[httpx.Response] = None
+            try:
+                # 耗时从通过本地准入开始计算，排队时间不计入端点延迟
+                with request_timing() as timing:
+                    response = await send(url, **kwargs)
+            except AdmissionTimeout:
+                # 本地排队超时，请求未发出，不计入端点统计，也不切换端点
+                raise
+            except httpx.RequestError as e:
+                duration = timing.elapsed()
+                self.endpoints.observe(endpoint, duration, False)
+                can_failover = (
+                    isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout))
+                    and len(tried) <= self.config.max_retries
+                    and self.endpoints.has_alternative(tried)
+                )
+                level = logging.WARNING if can_failover else logging.DEBUG
+                if self.events.enabled(level):
+                    self.events.emit(
+                        "sso.endpoint.failover"
+                        if can_failover
+                        else "sso.request.failed",
+                        level,
+                        method=method,
+                        endpoint=endpoint.base_url,
+                        path=path,
+                        error=type(e).__name__,
+                        duration_ms=round(duration * 1000, 2),
+                        attempt=len(tried),
+                        token_id=token_id,
+                    )
+                if not can_failover:
+                    raise
+            finally:
+                endpoint.in_flight -= 1
+            if response is None:
+                continue
+            
+            duration = timing.elapsed()
+            self.endpoints.observe(endpoint, duration, response.status_code < 500)
+            self.stats.record_response(response)
+            if self.events.enabled():
+                self.events.emit(
+                    "sso.request",
+                    method=method,
+                    endpoint=endpoint.base_url,
+                    path=path,
+                    status=response.status_code,
+                    duration_ms=round(duration * 1000, 2),
+                    attempt=len(tried),
+                    token_id=token_id,
+                )
+            return response
     
     async def get_access_token(
         self, 
@@ -64,6 +224,9 @@ class TreerSSOClient(SSOClientInterface):
     ) -> TokenResponse:
         """通过授权码获取访问令牌
         
+        相同授权码的并发调用只发送一次请求；成功结果在config.code_dedup_window
+        秒内复用，浏览器重复提交回调时得到同一个TokenResponse
+        
         Args:
             authorization_code: OAuth 2.0授权码
             redirect_uri: 重定向URI（可选）
@@ -76,24 +239,25 @@ class TreerSSOClient(SSOClientInterface):
             SSONetworkError: 网络请求失败
             SSOAuthenticationError: 认证失败
         """
-        url = f"{self.config.sso_base_url}/api/v1/oauth/token"
-        
-        data = {
-            "grant_type": "authorization_code",
-            "code": authorization_code,
-            "client_id": self.config.client_id,
-            "client_secret": self.config.client_secret,
-        }
-        
-        if redirect_uri:
-            data["redirect_uri"] = redirect_uri
-        
+        key = hashlib.sha256(
+            f"{authorization_code}\n{redirect_uri or ''}".encode("utf-8")
+        ).hexdigest()
+        return await self._code_exchanges.do(
+            key, lambda: self._exchange_code(authorization_code, redirect_uri)
+        )
+    
+    async def _exchange_code(
+        self,
+        authorization_code: str,
+        redirect_uri: Optional[str]
+    ) -> TokenResponse:
+        """向SSO服务发送授权码换取令牌的请求"""
         try:
-            self.logger.debug(f"正在获取访问令牌: {url}")
-            response = await self.http_client.post(
-                url,
-                data=data,
-                headers={"Content-Type": "application/x-www-form-urlencoded"}
+            response = await self._request(
+                "POST",
+                TOKEN_PATH,
+                content=self.templates.token_form(authorization_code, redirect_uri),
+                headers=RequestTemplates.TOKEN_HEADERS
             )
             
             if response.status_code == 200:
@@ -145,6 +309,11 @@ class TreerSSOClient(SSOClientInterface):
     async def get_user_info(self, access_token: str) -> UserInfo:
         """通过访问令牌获取用户信息
         
+        缓存条目在新鲜期（config.user_info_cache_ttl）内直接返回；过期后携带
+        If-None-Match/If-Modified-Since发起条件请求，服务端返回304时只刷新新鲜期。
+        启用stale-while-revalidate/stale-if-error时可能返回过期的缓存结果，
+        需要区分时请使用get_user_info_result
+        
         Args:
             access_token: 访问令牌
             
@@ -155,17 +324,261 @@ class TreerSSOClient(SSOClientInterface):
             SSOInvalidTokenError: 访问令牌无效
             SSONetworkError: 网络请求失败
         """
-        url = f"{self.config.sso_base_url}/api/v1/users/me"
+        result = await self.get_user_info_result(access_token)
+        return result.user_info
+    
+    async def get_user_info_result(self, access_token: str) -> UserInfoResult:
+        """获取用户信息及其缓存状态
+        
+        - 新鲜期内：直接返回缓存
+        - 新鲜期后stale-while-revalidate窗口内：立即返回缓存（标记为过期），
+          并在后台以BACKGROUND优先级刷新（非asyncio后端上需在async with
+          客户端内调用，否则同步刷新）
+        - 请求失败（网络错误或5xx）且处于stale-if-error窗口内：返回过期缓存
+        
+        Args:
+            access_token: 访问令牌
+            
+        Returns:
+            UserInfoResult: 用户信息及是否过期、缓存年龄
+            
+        Raises:
+            SSOInvalidTokenError: 访问令牌无效
+            SSONetworkError: 网络请求失败且没有可用的过期缓存
+        """
+        cache_key = token_cache_key(access_token)
+        cached = self.user_info_cache.get(cache_key)
+        now = time.time()
+        
+        if cached is not None and cached.token_expires_at is not None:
+            if cached.token_expires_at <= now:
+                self.user_info_cache.delete(cache_key)
+                cached = None
+        
+        if cached is not None:
+            if cached.expires_at > now:
+                self.stats.user_info_cache_hits += 1
+                if self.events.enabled():
+                    self.events.emit(
+                        "sso.user_info.cache_hit", token_id=_token_id(cache_key)
+                    )
+                return UserInfoResult(cached.user_info, age=now - cached.fetched_at)
+            
+            if (
+                now < cached.expires_at + self.config.user_info_stale_while_revalidate
+                and self._revalidate_in_background(access_token, cache_key)
+            ):
+                self.stats.stale_served += 1
+                if self.events.enabled():
+                    self.events.emit(
+                        "sso.user_info.stale_while_revalidate",
+                        token_id=_token_id(cache_key),
+                        age=round(now - cached.fetched_at, 1),
+                    )
+                return UserInfoResult(
+                    cached.user_info, stale=True, age=now - cached.fetched_at
+                )
         
         try:
-            self.logger.debug(f"正在获取用户信息: {url}")
-            response = await self.http_client.get(
-                url,
-                headers={"Authorization": f"Bearer {access_token}"}
+            user_info = await self._fetch_user_info(access_token, cache_key, cached)
+        except SSOError as e:
+            if (
+                cached is not None
+                and self._is_server_failure(e)
+                and now < cached.expires_at + self.config.user_info_stale_if_error
+            ):
+                if self.events.enabled(logging.WARNING):
+                    self.events.emit(
+                        "sso.user_info.stale_if_error",
+                        logging.WARNING,
+                        token_id=_token_id(cache_key),
+                        error=str(e),
+                        age=round(now - cached.fetched_at, 1),
+                    )
+                self.stats.stale_served += 1
+                return UserInfoResult(
+                    cached.user_info, stale=True, age=now - cached.fetched_at
+                )
+            raise
+        return UserInfoResult(user_info)
+
+    async def revalidate_user_info(self, access_token: str) -> UserInfo:
+        """忽略缓存新鲜期，向SSO服务重新验证访问令牌并更新缓存
+
+        有缓存条目时发起条件请求，用户信息未变化时服务端返回304
+
+        Args:
+            access_token: 访问令牌
+
+        Returns:
+            UserInfo: 最新的用户信息
+
+        Raises:
+            SSOInvalidTokenError: 访问令牌无效
+            SSONetworkError: 网络请求失败
+        """
+        cache_key = token_cache_key(access_token)
+        cached = self.user_info_cache.get(cache_key)
+        return await self._fetch_user_info(access_token, cache_key, cached)
+
+    async def introspect_token(
+        self,
+        token: str,
+        token_type_hint: Optional[str] = "access_token"
+    ) -> TokenIntrospection:
+        """通过令牌自省接口（RFC 7662）检查令牌
+        
+        使用client_id/client_secret进行HTTP Basic认证。有效的结果缓存到令牌
+        过期（exp），缓存条目数不超过config.introspection_cache_size；
+        相同令牌的并发调用只发送一次请求
+        
+        Args:
+            token: 要检查的令牌
+            token_type_hint: 令牌类型提示，默认"access_token"
+            
+        Returns:
+            TokenIntrospection: 自省结果，令牌无效时active为False
+            
+        Raises:
+            SSOAuthenticationError: 客户端认证失败
+            SSONetworkError: 网络请求失败
+        """
+        cache_key = token_cache_key(token)
+        cached = self.introspection_cache.get(cache_key, time.time())
+        if cached is not None:
+            self.stats.introspection_cache_hits += 1
+            return cached
+        return await self._introspections.do(
+            cache_key, lambda: self._introspect(token, token_type_hint, cache_key)
+        )
+    
+    async def _introspect(
+        self,
+        token: str,
+        token_type_hint: Optional[str],
+        cache_key: str
+    ) -> TokenIntrospection:
+        """向SSO服务发送令牌自省请求并缓存有效结果"""
+        try:
+            response = await self._request(
+                "POST",
+                INTROSPECT_PATH,
+                token_id=_token_id(cache_key),
+                content=RequestTemplates.introspection_form(token, token_type_hint),
+                headers=self.templates.introspect_headers
             )
             
             if response.status_code == 200:
-                response_data = response.json()
+                result = TokenIntrospection.from_dict(response.json())
+                self.introspection_cache.set(cache_key, result, time.time())
+                return result
+            
+            elif response.status_code == 401:
+                raise SSOAuthenticationError(
+                    "令牌自省的客户端认证失败",
+                    "invalid_client"
+                )
+            
+            else:
+                raise SSOError(
+                    f"令牌自省失败: HTTP {response.status_code}",
+                    f"http_{response.status_code}"
+                )
+        
+        except httpx.RequestError as e:
+            raise SSONetworkError(f"网络请求失败: {e}")
+        except json.JSONDecodeError as e:
+            raise SSOError(f"响应解析失败: {e}")
+    
+    @staticmethod
+    def _is_server_failure(error: SSOError) -> bool:
+        """判断错误是否由网络故障或SSO服务端5xx引起"""
+        if isinstance(error, SSONetworkError):
+            return True
+        return bool(error.error_code and error.error_code.startswith("http_5"))
+    
+    def _revalidate_in_background(self, access_token: str, cache_key: str) -> bool:
+        """在后台刷新缓存条目，同一令牌同时只有一个刷新任务
+
+        后台任务运行在async with进入的任务组中；未进入时在asyncio上创建独立任务，
+        其他后端（如trio）没有可用的任务组，不发起后台刷新
+
+        Returns:
+            是否有刷新任务在后台进行
+        """
+        if cache_key in self._revalidating:
+            return True
+        if self._task_group is None and not asyncio_running():
+            return False
+        self._revalidating.add(cache_key)
+        
+        if self._task_group is not None:
+            self._task_group.start_soon(self._revalidate, access_token, cache_key)
+        else:
+            task = asyncio.get_running_loop().create_task(
+                self._revalidate(access_token, cache_key)
+            )
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+        return True
+    
+    async def _revalidate(self, access_token: str, cache_key: str) -> None:
+        """后台刷新任务"""
+        try:
+            with request_priority(Priority.BACKGROUND):
+                cached = self.user_info_cache.get(cache_key)
+                await self._fetch_user_info(access_token, cache_key, cached)
+        except SSOError as e:
+            if self.events.enabled(logging.WARNING):
+                self.events.emit(
+                    "sso.user_info.revalidate_failed",
+                    logging.WARNING,
+                    token_id=_token_id(cache_key),
+                    error=str(e),
+                )
+        except Exception:
+            # 任务组中的异常会结束整个后台任务组，只记录不抛出
+            self.logger.exception("后台刷新用户信息失败")
+        finally:
+            self._revalidating.discard(cache_key)
+    
+    async def _fetch_user_info(
+        self,
+        access_token: str,
+        cache_key: str,
+        cached: Optional[CachedUserInfo]
+    ) -> UserInfo:
+        """向SSO服务请求用户信息（有缓存条目时发起条件请求）并更新缓存"""
+        headers = RequestTemplates.user_info_headers(access_token)
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+        
+        try:
+            response = await self._request(
+                "GET",
+                USER_INFO_PATH,
+                token_id=_token_id(cache_key),
+                headers=headers
+            )
+            
+            if response.status_code == 304 and cached is not None:
+                self.stats.not_modified += 1
+                self.stats.bytes_saved_not_modified += cached.body_size
+                cached.fetched_at = time.time()
+                cached.expires_at = cached.fetched_at + self.config.user_info_cache_ttl
+                self.user_info_cache.set(cache_key, cached)
+                return cached.user_info
+            
+            if response.status_code == 200:
+                if self.config.lazy_additional_info_size:
+                    response_data = loads_user_info(
+                        response.text, self.config.lazy_additional_info_size
+                    )
+                else:
+                    response_data = response.json()
                 
                 # 检查是否是业务错误
                 if not response_data.get("success", True):
@@ -175,9 +588,15 @@ class TreerSSOClient(SSOClientInterface):
                 
                 # 提取用户信息
                 user_data = response_data.get("data", response_data)
-                return UserInfo.from_dict(user_data)
+                if self.config.lazy_user_info:
+                    user_info: UserInfo = LazyUserInfo.from_dict(user_data)
+                else:
+                    user_info = UserInfo.from_dict(user_data)
+                self._store_user_info(cache_key, user_info, response, cached)
+                return user_info
             
             elif response.status_code == 401:
+                self.user_info_cache.delete(cache_key)
                 error_data = response.json() if response.headers.get("content-type", "").startswith("application/json") else {}
                 raise SSOInvalidTokenError(
                     error_data.get("message", "访问令牌无效或已过期"),
@@ -196,6 +615,32 @@ class TreerSSOClient(SSOClientInterface):
         except json.JSONDecodeError as e:
             raise SSOError(f"响应解析失败: {e}")
     
+    def _store_user_info(
+        self,
+        cache_key: str,
+        user_info: UserInfo,
+        response: httpx.Response,
+        previous: Optional[CachedUserInfo] = None
+    ) -> None:
+        """缓存用户信息及其ETag/Last-Modified，并保留已知的令牌元数据
+        
+        未启用任何缓存窗口且响应不带验证器时没有缓存价值，不写入
+        """
+        now = time.time()
+        entry = CachedUserInfo(
+            user_info=user_info,
+            expires_at=now + self.config.user_info_cache_ttl,
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
+            body_size=len(response.content),
+            fetched_at=now
+        )
+        if previous is not None:
+            entry.token_expires_at = previous.token_expires_at
+            entry.scope = previous.scope
+        if self.config.user_info_cache_enabled or entry.has_validator:
+            self.user_info_cache.set(cache_key, entry)
+    
     async def get_user_info_by_code(
         self, 
         authorization_code: str, 
@@ -222,16 +667,93 @@ class TreerSSOClient(SSOClientInterface):
         token_response = await self.get_access_token(authorization_code, redirect_uri)
         
         # 步骤2: 获取用户信息
-        return await self.get_user_info(token_response.access_token)
+        user_info = await self.get_user_info(token_response.access_token)
+        self._attach_token_metadata(token_response)
+        return user_info
+    
+    async def get_session_by_code(
+        self,
+        authorization_code: str,
+        signer: SessionSigner,
+        redirect_uri: Optional[str] = None
+    ) -> Tuple[UserInfo, str]:
+        """通过授权码获取用户信息并签发本地会话令牌
+        
+        会话有效期不超过访问令牌的有效期；之后的请求可用signer.verify在本地
+        校验会话，无需再调用get_user_info
+        
+        Args:
+            authorization_code: OAuth 2.0授权码
+            signer: 会话令牌签名器
+            redirect_uri: 重定向URI（可选）
+            
+        Returns:
+            (用户信息, 会话令牌)
+            
+        Raises:
+            SSOInvalidCodeError: 授权码无效
+            SSOInvalidTokenError: 访问令牌无效
+            SSONetworkError: 网络请求失败
+        """
+        token_response = await self.get_access_token(authorization_code, redirect_uri)
+        user_info = await self.get_user_info(token_response.access_token)
+        self._attach_token_metadata(token_response)
+        return user_info, signer.sign(user_info, ttl=token_response.expires_in)
+    
+    def _attach_token_metadata(self, token_response: TokenResponse) -> None:
+        """把令牌有效期与授权范围记录到对应的缓存条目"""
+        cache_key = token_cache_key(token_response.access_token)
+        entry = self.user_info_cache.get(cache_key)
+        if entry is None:
+            return
+        if token_response.expires_in is not None:
+            entry.token_expires_at = time.time() + token_response.expires_in
+        entry.scope = token_response.scope
+        self.user_info_cache.set(cache_key, entry)
     
     async def close(self) -> None:
-        """关闭客户端连接"""
+        """关闭客户端连接，取消尚未完成的后台刷新任务"""
+        task_group, runner_done = self._task_group, self._runner_done
+        self._runner_done = None
+        if task_group is not None:
+            # 任务组属于客户端自己的运行任务，取消它不会影响调用方
+            task_group.cancel_scope.cancel()
+        if runner_done is not None:
+            with anyio.CancelScope(shield=True):
+                await runner_done.wait()
+        for task in list(self._background_tasks):
+            task.cancel()
+        if self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
         await self.http_client.close()
+        if self._owns_user_info_cache:
+            self.user_info_cache.close()
     
     async def __aenter__(self) -> 'TreerSSOClient':
-        """异步上下文管理器入口"""
+        """异步上下文管理器入口，启动持有后台任务组的运行任务
+
+        任务组运行在客户端自己的任务中而不是调用方任务中，
+        因此可以在任意任务中退出上下文或调用close()
+        """
+        if self._runner_done is None:
+            ready = anyio.Event()
+            self._runner_done = anyio.Event()
+            spawn_system_task(partial(self._run_task_group, ready, self._runner_done))
+            await ready.wait()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
-        """异步上下文管理器出口"""
-        await self.close() 
\ No newline at end of file
+        """异步上下文管理器出口，先结束后台任务再关闭连接"""
+        await self.close()
+    
+    async def _run_task_group(self, ready: anyio.Event, done: anyio.Event) -> None:
+        """持有后台刷新任务组，直到close()取消它"""
+        try:
+            async with anyio.create_task_group() as task_group:
+                self._task_group = task_group
+                ready.set()
+                await anyio.sleep_forever()
+        finally:
+            self._task_group = None
+            ready.set()
+            done.set()
\ No newline at end of file
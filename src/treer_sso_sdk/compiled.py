@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Treer SSO SDK可选编译构建
+
+`python scripts/build.py build-compiled`使用mypyc把热路径模块（模型解析与序列化、
+异常、授权范围、请求模板、事件日志与TreerSSOClient的响应处理）编译为C扩展，
+源码不变；mypyc不可用或编译失败时构建纯Python包。
+
+UserInfo、LazyUserInfo、TreerSSOClient与异常保持为普通Python类（实例字典、
+弱引用与打补丁不受影响），只有方法体被编译；其余公开类编译为允许继承的原生类。
+"""
+
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+try:
+    from mypy_extensions import mypyc_attr
+except ImportError:  # 纯Python运行时不需要mypy_extensions
+
+    def mypyc_attr(  # type: ignore[misc]
+        *attrs: str, **kwattrs: Any
+    ) -> Callable[[T], T]:
+        """mypyc类属性标注，未编译时不起作用"""
+        return lambda cls: cls
+
+
+def is_compiled() -> bool:
+    """当前安装的SDK是否为mypyc编译版本"""
+    from . import models
+
+    return not models.__file__.endswith(".py")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Treer SSO SDK异步后端适配
+
+SDK内部的并发原语（锁、事件、超时）基于anyio，可运行在asyncio（包括uvloop）
+与trio上。少数操作在不同后端上的取消语义不同，集中在本模块处理：
+asyncio的Task.cancel()不受anyio屏蔽作用域约束，需要"不随调用方取消"的调用
+在asyncio上使用独立任务加asyncio.shield，其他后端使用屏蔽的取消作用域。
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Coroutine, Set, TypeVar
+
+import anyio
+
+T = TypeVar("T")
+
+# 保持对独立任务的强引用，调用方被取消后任务仍能执行完
+_shielded_tasks: Set["asyncio.Future[Any]"] = set()
+
+
+def asyncio_running() -> bool:
+    """当前是否运行在asyncio事件循环（包括uvloop）中"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+async def run_shielded(fn: Callable[[], Awaitable[T]]) -> T:
+    """执行调用，调用方被取消时调用本身仍会执行完
+
+    - asyncio: 在独立任务中执行，调用方取消后立即返回，任务继续运行
+    - 其他后端: 在屏蔽的取消作用域中执行，调用方的取消推迟到调用结束后生效
+
+    Args:
+        fn: 实际执行调用的协程函数
+
+    Returns:
+        调用结果
+    """
+    if asyncio_running():
+        task = asyncio.ensure_future(fn())
+        _shielded_tasks.add(task)
+        task.add_done_callback(_shielded_tasks.discard)
+        return await asyncio.shield(task)
+    with anyio.CancelScope(shield=True):
+        result = await fn()
+    return result
+
+
+def spawn_system_task(fn: Callable[[], Coroutine[Any, Any, None]]) -> None:
+    """启动不属于调用方任务的后台任务
+
+    任务不在调用方的任务组与取消作用域中，调用方退出或被取消不影响它，
+    需要由创建者自行结束（例如取消任务内的取消作用域）。fn需自行处理异常
+
+    - asyncio: 在事件循环上创建独立任务
+    - trio: 使用trio.lowlevel.spawn_system_task，trio.run结束前任务会被取消
+
+    Args:
+        fn: 后台任务的协程函数
+    """
+    if asyncio_running():
+        task = asyncio.get_running_loop().create_task(fn())
+        _shielded_tasks.add(task)
+        task.add_done_callback(_shielded_tasks.discard)
+        return
+    # anyio只支持asyncio与trio两种后端
+    import trio
+
+    trio.lowlevel.spawn_system_task(fn)
@@ -4,7 +4,8 @@
 Treer SSO SDK配置类
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import List, Optional
 from .exceptions import SSOConfigError
 
 
@@ -16,9 +17,37 @@ class SSOConfig:
         client_id: OAuth 2.0客户端ID
         client_secret: OAuth 2.0客户端密钥
         sso_base_url: SSO服务基础URL，默认为生产环境
+        sso_base_urls: 额外的SSO端点（如区域端点），与sso_base_url一起参与端点选择
         timeout: 请求超时时间（秒），默认30秒
         max_retries: 最大重试次数，默认3次
         verify_ssl: 是否验证SSL证书，默认True
+        share_ssl_context: 是否在进程内共享SSLContext并复用TLS会话，默认True
+        dns_cache_ttl: SSO主机DNS解析结果缓存时间（秒），默认60秒，0表示禁用缓存；
+            环境变量配置了HTTP(S)_PROXY/ALL_PROXY时由代理解析主机名，不使用缓存
+        dns_stale_ttl: DNS解析失败时允许继续使用过期结果的时长（秒），默认300秒
+        max_connections: 连接池最大连接数，默认10
+        adaptive_concurrency: 是否根据延迟自适应限制在途请求数，默认False。
+            启用后超出当前上限的请求立即抛出SSOOverloadError
+        background_share: 后台优先级请求最多可占用的连接池比例，默认0.5
+        user_info_cache_ttl: 用户信息缓存新鲜期（秒），默认0，即每次都向服务端
+            发起（可能得到304的）条件请求
+        user_info_cache_size: 用户信息缓存最大条目数，默认10000
+        user_info_stale_while_revalidate: 新鲜期过后仍立即返回缓存、并在后台
+            刷新的时长（秒），默认0（禁用）
+        user_info_stale_if_error: 新鲜期过后，SSO服务网络错误或5xx时仍返回缓存的
+            时长（秒），默认0（禁用）
+        user_info_cache_path: 持久化用户信息缓存的SQLite文件路径，默认None（仅内存）
+        code_dedup_window: 相同授权码重复换取令牌时复用结果的时长（秒），默认10秒，
+            0表示只合并并发请求
+        introspection_cache_size: 令牌自省结果缓存最大条目数，默认10000，0表示禁用缓存。
+            有效的结果缓存到令牌过期（exp），期间吊销的令牌仍会被视为有效
+        lazy_user_info: 是否返回LazyUserInfo（档案与时间字段在首次访问时解析），
+            默认False
+        log_sample_rate: 每请求DEBUG事件日志的采样率（0~1），默认1.0即全部记录
+        max_response_size: SSO响应体（解压后）的最大字节数，默认1MiB，0表示不限制。
+            读取时逐块检查，超出后立即中止并抛出SSOResponseTooLargeError
+        lazy_additional_info_size: 用户信息中profile.additional_info的JSON文本长度
+            （字符）达到该值时不解析，首次访问时才解析（见models.LazyJSON），默认0（禁用）
     
     Example:
         >>> config = SSOConfig(
@@ -30,9 +59,27 @@ class SSOConfig:
     client_id: str
     client_secret: str
     sso_base_url: str = "https://sso-api.treer.ru"
+    sso_base_urls: List[str] = field(default_factory=list)
     timeout: int = 30
     max_retries: int = 3
     verify_ssl: bool = True
+    share_ssl_context: bool = True
+    dns_cache_ttl: float = 60.0
+    dns_stale_ttl: float = 300.0
+    max_connections: int = 10
+    adaptive_concurrency: bool = False
+    background_share: float = 0.5
+    user_info_cache_ttl: float = 0.0
+    user_info_cache_size: int = 10000
+    user_info_stale_while_revalidate: float = 0.0
+    user_info_stale_if_error: float = 0.0
+    user_info_cache_path: Optional[str] = None
+    code_dedup_window: float = 10.0
+    introspection_cache_size: int = 10000
+    lazy_user_info: bool = False
+    log_sample_rate: float = 1.0
+    max_response_size: int = 1024 * 1024
+    lazy_additional_info_size: int = 0
     
     def __post_init__(self) -> None:
         """配置验证"""
@@ -46,12 +93,56 @@ class SSOConfig:
         # 确保URL格式正确
         if not self.sso_base_url.startswith(('http://', 'https://')):
             raise SSOConfigError("sso_base_url必须以http://或https://开头")
+        for url in self.sso_base_urls:
+            if not url.startswith(('http://', 'https://')):
+                raise SSOConfigError("sso_base_urls中的URL必须以http://或https://开头")
         
         # 移除末尾的斜杠
         self.sso_base_url = self.sso_base_url.rstrip('/')
+        self.sso_base_urls = [url.rstrip('/') for url in self.sso_base_urls]
         
         # 验证数值参数
         if self.timeout <= 0:
             raise SSOConfigError("timeout必须大于0")
         if self.max_retries < 0:
-            raise SSOConfigError("max_retries不能小于0") 
\ No newline at end of file
+            raise SSOConfigError("max_retries不能小于0")
+        if self.dns_cache_ttl < 0:
+            raise SSOConfigError("dns_cache_ttl不能小于0")
+        if self.dns_stale_ttl < 0:
+            raise SSOConfigError("dns_stale_ttl不能小于0")
+        if self.max_connections <= 0:
+            raise SSOConfigError("max_connections必须大于0")
+        if not 0 < self.background_share <= 1:
+            raise SSOConfigError("background_share必须在(0, 1]范围内")
+        if self.user_info_cache_ttl < 0:
+            raise SSOConfigError("user_info_cache_ttl不能小于0")
+        if self.user_info_cache_size <= 0:
+            raise SSOConfigError("user_info_cache_size必须大于0")
+        if self.user_info_stale_while_revalidate < 0:
+            raise SSOConfigError("user_info_stale_while_revalidate不能小于0")
+        if self.user_info_stale_if_error < 0:
+            raise SSOConfigError("user_info_stale_if_error不能小于0")
+        if self.code_dedup_window < 0:
+            raise SSOConfigError("code_dedup_window不能小于0")
+        if self.introspection_cache_size < 0:
+            raise SSOConfigError("introspection_cache_size不能小于0")
+        if not 0 <= self.log_sample_rate <= 1:
+            raise SSOConfigError("log_sample_rate必须在0到1之间")
+        if self.max_response_size < 0:
+            raise SSOConfigError("max_response_size不能小于0")
+        if self.lazy_additional_info_size < 0:
+            raise SSOConfigError("lazy_additional_info_size不能小于0")
+    
+    @property
+    def endpoints(self) -> List[str]:
+        """全部SSO端点（去重，sso_base_url在首位）"""
+        return list(dict.fromkeys([self.sso_base_url, *self.sso_base_urls]))
+    
+    @property
+    def user_info_cache_enabled(self) -> bool:
+        """是否配置了任何用户信息缓存窗口"""
+        return (
+            self.user_info_cache_ttl > 0
+            or self.user_info_stale_while_revalidate > 0
+            or self.user_info_stale_if_error > 0
+        )
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Treer SSO SDK多端点选择
+
+为多个区域SSO端点维护EWMA延迟与错误率，按"二选一"（power-of-two-choices）
+策略选择最佳健康端点，并根据请求结果被动摘除与恢复端点。
+"""
+
+import logging
+import random
+import time
+from typing import Callable, List, Optional, Sequence
+
+
+class Endpoint:
+    """单个SSO端点及其健康统计
+
+    Attributes:
+        base_url: 端点基础URL
+        latency: 延迟的EWMA（秒），尚无样本时为None
+        error_rate: 错误率的EWMA（0~1）
+        in_flight: 进行中的请求数
+        consecutive_failures: 连续失败次数
+        ejected_until: 摘除截止时间（单调时钟），0表示未摘除
+        ejections: 连续摘除次数，用于计算退避时长
+    """
+
+    __slots__ = (
+        "base_url",
+        "latency",
+        "error_rate",
+        "in_flight",
+        "consecutive_failures",
+        "ejected_until",
+        "ejections",
+    )
+
+    def __init__(self, base_url: str) -> None:
+        self.base_url = base_url
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.in_flight = 0
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self.ejections = 0
+
+    def url(self, path: str) -> str:
+        """拼接完整请求URL
+
+        Args:
+            path: 以/开头的接口路径
+
+        Returns:
+            完整URL
+        """
+        return f"{self.base_url}{path}"
+
+    def score(self) -> float:
+        """端点负载评分，越小越好
+
+        综合延迟、进行中请求数与错误率；尚无延迟样本的端点评分为0，
+        以便尽快获得样本
+        """
+        if self.latency is None:
+            return 0.0
+        return self.latency * (self.in_flight + 1) / max(1.0 - self.error_rate, 0.05)
+
+    def __repr__(self) -> str:
+        return (
+            f"Endpoint(base_url='{self.base_url}', latency={self.latency}, "
+            f"error_rate={self.error_rate:.3f}, in_flight={self.in_flight})"
+        )
+
+
+class EndpointSelector:
+    """延迟感知的端点选择器
+
+    - 在健康端点中随机取两个，选择评分较低者
+    - 连续失败达到阈值的端点被摘除，摘除时长按指数退避增长
+    - 摘除到期后端点重新参与选择，首次成功后清除退避状态
+    - 全部端点被摘除时，选择最早到期的端点，避免完全不可用
+
+    Args:
+        base_urls: 端点基础URL列表
+        decay: EWMA衰减系数（新样本权重）
+        failure_threshold: 触发摘除的连续失败次数
+        base_ejection_time: 首次摘除时长（秒）
+        max_ejection_time: 最大摘除时长（秒）
+        clock: 单调时钟函数，主要用于测试
+        rng: 随机数生成器，主要用于测试
+    """
+
+    def __init__(
+        self,
+        base_urls: Sequence[str],
+        decay: float = 0.3,
+        failure_threshold: int = 3,
+        base_ejection_time: float = 10.0,
+        max_ejection_time: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        if not base_urls:
+            raise ValueError("至少需要一个端点")
+        self.endpoints: List[Endpoint] = [Endpoint(url) for url in base_urls]
+        self.decay = decay
+        self.failure_threshold = failure_threshold
+        self.base_ejection_time = base_ejection_time
+        self.max_ejection_time = max_ejection_time
+        self._clock = clock
+        self._random = rng or random.Random()
+        self.logger = logging.getLogger(__name__)
+
+    def healthy(self) -> List[Endpoint]:
+        """获取当前未被摘除的端点列表"""
+        now = self._clock()
+        return [e for e in self.endpoints if e.ejected_until <= now]
+
+    def select(self, exclude: Sequence[Endpoint] = ()) -> Endpoint:
+        """选择一个端点
+
+        Args:
+            exclude: 本次请求中已尝试过、需要排除的端点
+
+        Returns:
+            选中的端点
+        """
+        if len(self.endpoints) == 1:
+            return self.endpoints[0]
+
+        candidates = [e for e in self.healthy() if e not in exclude]
+        if not candidates:
+            remaining = [e for e in self.endpoints if e not in exclude]
+            return min(remaining or self.endpoints, key=lambda e: e.ejected_until)
+        if len(candidates) == 1:
+            return candidates[0]
+
+        first, second = self._random.sample(candidates, 2)
+        return first if first.score() <= second.score() else second
+
+    def has_alternative(self, exclude: Sequence[Endpoint]) -> bool:
+        """判断是否还有未尝试过的健康端点"""
+        return any(e not in exclude for e in self.healthy())
+
+    def observe(self, endpoint: Endpoint, latency: float, success: bool) -> None:
+        """记录一次请求结果（被动健康检查）
+
+        Args:
+            endpoint: 处理请求的端点
+            latency: 请求耗时（秒）
+            success: 请求是否成功（网络错误和5xx视为失败）
+        """
+        decay = self.decay
+        if endpoint.latency is None:
+            endpoint.latency = latency
+        else:
+            endpoint.latency += decay * (latency - endpoint.latency)
+        endpoint.error_rate += decay * ((0.0 if success else 1.0) - endpoint.error_rate)
+
+        if success:
+            endpoint.consecutive_failures = 0
+            endpoint.ejections = 0
+            return
+
+        endpoint.consecutive_failures += 1
+        # 刚恢复的端点（仍处于退避状态）一次失败即再次摘除
+        if (
+            endpoint.ejections
+            or endpoint.consecutive_failures >= self.failure_threshold
+        ):
+            self._eject(endpoint)
+
+    def _eject(self, endpoint: Endpoint) -> None:
+        """摘除端点，时长按指数退避"""
+        duration = min(
+            self.base_ejection_time * (2**endpoint.ejections),
+            self.max_ejection_time,
+        )
+        endpoint.ejected_until = self._clock() + duration
+        endpoint.ejections += 1
+        endpoint.consecutive_failures = 0
+        self.logger.warning("SSO端点已摘除%.1f秒: %s", duration, endpoint.base_url)
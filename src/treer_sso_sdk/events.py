@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Treer SSO SDK结构化事件日志
+
+热路径上的日志以"事件名 + 字段"的形式记录：字段通过LogRecord的sso_event与
+sso_fields属性提供给JSON等结构化格式化器，文本形式只在处理器真正格式化时生成。
+调用方先用enabled()判断，日志级别未开启时不构造任何字段；高QPS部署可以通过
+采样率只记录部分DEBUG事件。
+
+Example:
+    >>> events = EventLogger(__name__, sample_rate=0.01)
+    >>> if events.enabled():
+    ...     events.emit("sso.request", status=200, duration_ms=12.5)
+"""
+
+import logging
+import random
+from typing import Any, Callable, Dict
+
+from .compiled import mypyc_attr
+
+
+class _EventMessage:
+    """延迟格式化的事件消息"""
+
+    __slots__ = ("event", "fields")
+
+    def __init__(self, event: str, fields: Dict[str, Any]) -> None:
+        self.event = event
+        self.fields = fields
+
+    def __str__(self) -> str:
+        parts = [self.event]
+        parts.extend(f"{key}={value}" for key, value in self.fields.items())
+        return " ".join(parts)
+
+
+@mypyc_attr(allow_interpreted_subclasses=True)
+class EventLogger:
+    """结构化事件记录器
+
+    Args:
+        name: 底层logging.Logger的名称
+        sample_rate: DEBUG事件的采样率（0~1），默认1.0即全部记录；
+            INFO及以上级别的事件不采样
+        rng: 返回[0, 1)随机数的函数，主要用于测试
+    """
+
+    def __init__(
+        self,
+        name: str,
+        sample_rate: float = 1.0,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        self.logger = logging.getLogger(name)
+        self.sample_rate = sample_rate
+        self._rng = rng
+
+    def enabled(self, level: int = logging.DEBUG) -> bool:
+        """该级别的事件是否会被记录（DEBUG事件同时经过采样）"""
+        if not self.logger.isEnabledFor(level):
+            return False
+        if level <= logging.DEBUG and self.sample_rate < 1.0:
+            return self._rng() < self.sample_rate
+        return True
+
+    def emit(self, event: str, level: int = logging.DEBUG, **fields: Any) -> None:
+        """记录事件，调用方应先通过enabled()判断
+
+        Args:
+            event: 事件名，如"sso.request"
+            level: 日志级别
+            **fields: 事件字段
+        """
+        self.logger.log(
+            level,
+            _EventMessage(event, fields),
+            extra={"sso_event": event, "sso_fields": fields},
+            stacklevel=2,
+        )
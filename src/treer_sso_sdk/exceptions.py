@@ -6,7 +6,10 @@ Treer SSO SDK异常定义
 
 from typing import Optional, Dict, Any
 
+from .compiled import mypyc_attr
 
+
+@mypyc_attr(native_class=False)
 class SSOError(Exception):
     """SSO SDK基础异常"""
     
@@ -35,26 +38,43 @@ class SSOError(Exception):
         )
 
 
+@mypyc_attr(native_class=False)
 class SSOConfigError(SSOError):
     """SSO配置错误"""
     pass
 
 
+@mypyc_attr(native_class=False)
 class SSOAuthenticationError(SSOError):
     """SSO认证错误"""
     pass
 
 
+@mypyc_attr(native_class=False)
 class SSONetworkError(SSOError):
     """SSO网络错误"""
     pass
 
 
+@mypyc_attr(native_class=False)
 class SSOInvalidTokenError(SSOAuthenticationError):
     """无效的访问令牌"""
     pass
 
 
+@mypyc_attr(native_class=False)
 class SSOInvalidCodeError(SSOAuthenticationError):
     """无效的授权码"""
-    pass 
\ No newline at end of file
+    pass
+
+
+@mypyc_attr(native_class=False)
+class SSOOverloadError(SSONetworkError):
+    """本地并发已达上限，请求被立即拒绝（未发送到SSO服务）"""
+    pass
+
+
+@mypyc_attr(native_class=False)
+class SSOResponseTooLargeError(SSOError):
+    """SSO服务的响应体超过config.max_response_size，读取已中止"""
+    pass
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Treer SSO SDK进程fork处理
+
+gunicorn --preload等预fork服务器会把主进程中创建的客户端复制到各个worker。
+连接池中的套接字、绑定到主进程事件循环的Future/Task以及SQLite连接都不能在
+子进程中继续使用。这里通过os.register_at_fork在子进程中通知已注册的对象重建
+这些资源，配置和可安全共享的缓存则保留下来。
+"""
+
+import os
+import weakref
+from typing import Any
+
+_registered: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
+
+def register(obj: Any) -> None:
+    """注册需要在fork后重建资源的对象
+
+    对象需实现无参数的_after_fork方法，该方法在子进程中fork返回后调用
+
+    Args:
+        obj: 待注册对象（以弱引用保存，不影响其回收）
+    """
+    _registered.add(obj)
+
+
+def _after_fork_in_child() -> None:
+    for obj in list(_registered):
+        obj._after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -5,28 +5,125 @@ Treer SSO SDK HTTP客户端实现
 """
 
 import logging
-from typing import Optional
+import ssl
+import time
+import urllib.request
+from typing import Any, Dict, Optional
+
+import anyio
 import httpx
 
+from . import forksafe
 from .config import SSOConfig
-from .interfaces import HTTPClientInterface
+from .events import EventLogger
+from .exceptions import SSOOverloadError, SSOResponseTooLargeError
+from .interfaces import HTTPClientInterface, ResolverInterface
+from .limiter import AdaptiveLimiter, GradientLimiter
+from .priority import (
+    AdmissionTimeout,
+    PriorityAdmission,
+    current_priority,
+    mark_admitted,
+)
+from .resolver import CachingResolver, ResolvingTransport, SystemResolver
+from .stats import BYTES_DOWNLOADED_EXTENSION
+from .tls import get_ssl_context
+
+
+def _accept_encoding() -> str:
+    """协商的响应压缩算法
+    
+    brotli为可选依赖（pip install treer-sso-sdk[brotli]），
+    只有在httpx能够解码时才声明支持br
+    """
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+        except ImportError:
+            return "gzip"
+    return "br, gzip"
+
+
+ACCEPT_ENCODING = _accept_encoding()
+
+
+def _env_proxies_configured() -> bool:
+    """环境变量中是否配置了httpx会使用的代理"""
+    proxies = urllib.request.getproxies()
+    return any(proxies.get(scheme) for scheme in ("http", "https", "all"))
 
 
 class AsyncHTTPClient(HTTPClientInterface):
     """异步HTTP客户端实现
     
-    基于httpx库的HTTP客户端，支持连接池和超时控制
+    基于httpx库的HTTP客户端，支持连接池、超时控制、DNS解析缓存、
+    按优先级排队的准入控制和自适应并发限制
     """
     
-    def __init__(self, config: SSOConfig) -> None:
+    # 视为服务端过载、需要收缩并发上限的状态码
+    OVERLOAD_STATUS_CODES = frozenset({429, 503})
+    # 缓存解析结果的URL数量上限
+    MAX_CACHED_URLS = 256
+    
+    def __init__(
+        self,
+        config: SSOConfig,
+        resolver: Optional[ResolverInterface] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ) -> None:
         """初始化HTTP客户端
         
         Args:
             config: SSO配置对象
+            resolver: DNS解析器（可选，默认使用系统getaddrinfo）。
+                当config.dns_cache_ttl大于0时会在其外层加上TTL缓存
+            limiter: 自适应并发限制器（可选）。未提供且config.adaptive_concurrency
+                为True时使用GradientLimiter
+            transport: httpx传输层（可选，主要用于测试）
         """
         self.config = config
         self._client: Optional[httpx.AsyncClient] = None
+        self._urls: Dict[str, httpx.URL] = {}
+        self._transport = transport
         self.logger = logging.getLogger(__name__)
+        self.events = EventLogger(__name__, config.log_sample_rate)
+        
+        if limiter is None and config.adaptive_concurrency:
+            limiter = GradientLimiter(
+                initial_limit=min(10, config.max_connections),
+                max_limit=config.max_connections
+            )
+        self.limiter = limiter
+        self.admission = PriorityAdmission(
+            config.max_connections, config.background_share
+        )
+        
+        if config.dns_cache_ttl > 0:
+            self.resolver: Optional[ResolverInterface] = CachingResolver(
+                resolver or SystemResolver(),
+                ttl=config.dns_cache_ttl,
+                stale_ttl=config.dns_stale_ttl
+            )
+        else:
+            self.resolver = resolver
+        
+        forksafe.register(self)
+    
+    def _after_fork(self) -> None:
+        """在fork出的子进程中重建连接池与排队状态
+        
+        继承的连接池不关闭（关闭会影响父进程仍在使用的连接），只丢弃引用，
+        下次请求时懒加载新的连接池；DNS缓存、SSLContext与并发上限等保留
+        """
+        self._client = None
+        self.admission = PriorityAdmission(
+            self.config.max_connections, self.config.background_share
+        )
+        if self.limiter is not None:
+            self.limiter.in_flight = 0
     
     @property
     def client(self) -> httpx.AsyncClient:
@@ -38,14 +135,39 @@ class AsyncHTTPClient(HTTPClientInterface):
         if self._client is None:
             self._client = httpx.AsyncClient(
                 timeout=self.config.timeout,
-                verify=self.config.verify_ssl,
-                limits=httpx.Limits(
-                    max_keepalive_connections=5,
-                    max_connections=10
-                )
+                headers={"Accept-Encoding": ACCEPT_ENCODING},
+                verify=self._ssl_context(),
+                limits=self._limits(),
+                transport=self._transport or self._build_transport()
             )
         return self._client
     
+    def _ssl_context(self) -> ssl.SSLContext:
+        if self.config.share_ssl_context:
+            return get_ssl_context(self.config.verify_ssl)
+        return httpx.create_ssl_context(verify=self.config.verify_ssl)
+    
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_keepalive_connections=min(5, self.config.max_connections),
+            max_connections=self.config.max_connections
+        )
+    
+    def _build_transport(self) -> Optional[httpx.AsyncBaseTransport]:
+        """创建使用解析器的httpx传输层
+        
+        传入transport时httpx不再读取HTTP(S)_PROXY/ALL_PROXY/NO_PROXY环境变量，
+        因此环境中配置了代理时不替换传输层，由httpx按环境变量建立代理连接
+        （此时由代理解析SSO主机名，不使用DNS缓存）
+        
+        Returns:
+            ResolvingTransport实例；未配置解析器或配置了环境代理时返回None，
+            使用httpx默认传输层
+        """
+        if self.resolver is None or _env_proxies_configured():
+            return None
+        return ResolvingTransport(self.resolver, self._ssl_context(), self._limits())
+    
     async def post(self, url: str, **kwargs) -> httpx.Response:
         """发送POST请求
         
@@ -59,8 +181,7 @@ class AsyncHTTPClient(HTTPClientInterface):
         Raises:
             httpx.RequestError: 网络请求错误
         """
-        self.logger.debug(f"发送POST请求: {url}")
-        return await self.client.post(url, **kwargs)
+        return await self._send("POST", url, **kwargs)
     
     async def get(self, url: str, **kwargs) -> httpx.Response:
         """发送GET请求
@@ -75,8 +196,149 @@ class AsyncHTTPClient(HTTPClientInterface):
         Raises:
             httpx.RequestError: 网络请求错误
         """
-        self.logger.debug(f"发送GET请求: {url}")
-        return await self.client.get(url, **kwargs)
+        return await self._send("GET", url, **kwargs)
+    
+    async def _send(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """按当前上下文的优先级排队准入后发送请求
+        
+        Raises:
+            SSOOverloadError: 在途请求数已达自适应上限
+            AdmissionTimeout: 排队等待超时
+            httpx.RequestError: 网络请求错误
+        """
+        priority = current_priority()
+        if not self.admission.try_acquire(priority):
+            started = time.monotonic()
+            try:
+                with anyio.fail_after(self.config.timeout):
+                    await self.admission.acquire(priority)
+            except TimeoutError:
+                raise AdmissionTimeout("等待SSO请求准入超时")
+            if self.events.enabled():
+                self.events.emit(
+                    "sso.http.queued",
+                    method=method,
+                    url=url,
+                    priority=priority.name,
+                    wait_ms=round((time.monotonic() - started) * 1000, 2),
+                )
+        mark_admitted()
+        try:
+            return await self._send_limited(method, url, **kwargs)
+        finally:
+            self.admission.release(priority)
+    
+    def _url(self, url: str) -> httpx.URL:
+        """解析URL并缓存结果（SSO接口URL数量固定，解析一次即可）"""
+        parsed = self._urls.get(url)
+        if parsed is None:
+            parsed = httpx.URL(url)
+            if len(self._urls) < self.MAX_CACHED_URLS:
+                self._urls[url] = parsed
+        return parsed
+    
+    async def _fetch(
+        self, method: str, url: httpx.URL, **kwargs: Any
+    ) -> httpx.Response:
+        """发送请求并以流式读取响应体，超过config.max_response_size时中止
+        
+        Content-Length已超出上限时不读取响应体；否则逐块累计解压后的字节数，
+        超出后立即关闭响应（连接不再复用），不会把整个响应体读入内存
+        
+        Returns:
+            读取完毕的新响应，响应体已解压，不再带Content-Encoding头部
+        
+        Raises:
+            SSOResponseTooLargeError: 响应体超过上限
+            httpx.RequestError: 网络请求错误
+        """
+        limit = self.config.max_response_size
+        if not limit:
+            return await self.client.request(method, url, **kwargs)
+        
+        request = self.client.build_request(method, url, **kwargs)
+        response = await self.client.send(request, stream=True)
+        try:
+            content_length = response.headers.get("content-length", "")
+            # 压缩响应的Content-Length是压缩后的大小，只能作为下限
+            if content_length.isdigit() and int(content_length) > limit:
+                self._reject(method, url, response, int(content_length))
+            chunks = []
+            size = 0
+            async for chunk in response.aiter_bytes():
+                size += len(chunk)
+                if size > limit:
+                    self._reject(method, url, response, size)
+                chunks.append(chunk)
+        finally:
+            await response.aclose()
+        # 响应体已解压，新响应去掉描述原始传输的头部，Content-Length按解压后的内容重新计算
+        headers = response.headers.copy()
+        for name in ("content-encoding", "content-length", "transfer-encoding"):
+            headers.pop(name, None)
+        return httpx.Response(
+            response.status_code,
+            headers=headers,
+            content=b"".join(chunks),
+            request=request,
+            extensions={
+                **response.extensions,
+                BYTES_DOWNLOADED_EXTENSION: response.num_bytes_downloaded,
+            },
+        )
+    
+    def _reject(
+        self, method: str, url: httpx.URL, response: httpx.Response, size: int
+    ) -> None:
+        limit = self.config.max_response_size
+        if self.events.enabled(logging.WARNING):
+            self.events.emit(
+                "sso.http.response_too_large",
+                logging.WARNING,
+                method=method,
+                url=str(url),
+                status=response.status_code,
+                size=size,
+                limit=limit,
+            )
+        raise SSOResponseTooLargeError(
+            f"SSO响应体超过上限{limit}字节: {size}字节",
+            "response_too_large",
+            {"limit": limit, "status_code": response.status_code},
+        )
+    
+    async def _send_limited(
+        self, method: str, url: str, **kwargs: Any
+    ) -> httpx.Response:
+        """在自适应并发限制下发送请求"""
+        request_url = self._url(url)
+        limiter = self.limiter
+        if limiter is None:
+            return await self._fetch(method, request_url, **kwargs)
+        
+        if not limiter.try_acquire():
+            if self.events.enabled():
+                self.events.emit(
+                    "sso.http.overload", method=method, url=url, limit=limiter.limit
+                )
+            raise SSOOverloadError(
+                f"SSO请求并发已达上限: {limiter.limit}", "overload"
+            )
+        
+        started = time.monotonic()
+        rtt: Optional[float] = None
+        dropped = False
+        try:
+            response = await self._fetch(method, request_url, **kwargs)
+            dropped = response.status_code in self.OVERLOAD_STATUS_CODES
+            rtt = time.monotonic() - started
+            return response
+        except httpx.TimeoutException:
+            dropped = True
+            raise
+        finally:
+            # 非超时的网络错误不反映排队延迟，rtt为None，不参与调整
+            limiter.release(rtt, dropped)
     
     async def close(self) -> None:
         """关闭连接
@@ -5,10 +5,10 @@ Treer SSO SDK抽象接口定义
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import List, Optional
 import httpx
 
-from .models import TokenResponse, UserInfo
+from .models import CachedUserInfo, TokenResponse, UserInfo
 
 
 class HTTPClientInterface(ABC):
@@ -46,6 +46,65 @@ class HTTPClientInterface(ABC):
         pass
 
 
+class ResolverInterface(ABC):
+    """DNS解析器接口，便于替换解析实现和测试"""
+    
+    @abstractmethod
+    async def resolve(self, host: str, port: int) -> List[str]:
+        """解析主机名
+        
+        Args:
+            host: 主机名
+            port: 端口
+            
+        Returns:
+            IP地址列表
+            
+        Raises:
+            OSError: 解析失败
+        """
+        pass
+
+
+class UserInfoCacheInterface(ABC):
+    """用户信息缓存后端接口"""
+    
+    @abstractmethod
+    def get(self, key: str) -> Optional[CachedUserInfo]:
+        """读取缓存条目
+        
+        Args:
+            key: 缓存键（访问令牌的哈希）
+            
+        Returns:
+            缓存条目，不存在时返回None
+        """
+        pass
+    
+    @abstractmethod
+    def set(self, key: str, entry: CachedUserInfo) -> None:
+        """写入缓存条目
+        
+        Args:
+            key: 缓存键（访问令牌的哈希）
+            entry: 缓存条目
+        """
+        pass
+    
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """删除缓存条目
+        
+        Args:
+            key: 缓存键（访问令牌的哈希）
+        """
+        pass
+    
+    def close(self) -> None:
+        """释放缓存后端占用的资源"""
+        pass
+
+
 class SSOClientInterface(ABC):
     """SSO客户端接口"""
     
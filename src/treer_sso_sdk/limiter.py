@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Treer SSO SDK自适应并发限制
+
+根据观测到的请求延迟动态调整允许的在途请求数（参考Netflix concurrency-limits
+的AIMD与Gradient算法）。超出限制的请求立即失败，而不是在连接池中无限排队。
+"""
+
+import math
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class AdaptiveLimiter(ABC):
+    """自适应并发限制器基类
+
+    Args:
+        initial_limit: 初始并发上限
+        min_limit: 并发上限的下界
+        max_limit: 并发上限的上界
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 10,
+        min_limit: int = 1,
+        max_limit: int = 100,
+    ) -> None:
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("需要满足 1 <= min_limit <= initial_limit <= max_limit")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self._limit = float(initial_limit)
+        self.in_flight = 0
+        self.rejected = 0
+
+    @property
+    def limit(self) -> int:
+        """当前并发上限"""
+        return int(self._limit)
+
+    def try_acquire(self) -> bool:
+        """尝试占用一个并发名额
+
+        Returns:
+            是否成功占用；失败时调用方应立即拒绝请求
+        """
+        if self.in_flight >= self.limit:
+            self.rejected += 1
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self, rtt: Optional[float], dropped: bool = False) -> None:
+        """释放并发名额并根据结果调整上限
+
+        Args:
+            rtt: 请求耗时（秒），请求未完成（如被取消）时为None
+            dropped: 请求是否超时或被服务端以过载拒绝
+        """
+        in_flight = self.in_flight
+        self.in_flight -= 1
+        if rtt is None and not dropped:
+            return
+        new_limit = self._update(rtt or 0.0, in_flight, dropped)
+        self._limit = min(max(new_limit, float(self.min_limit)), float(self.max_limit))
+
+    @abstractmethod
+    def _update(self, rtt: float, in_flight: int, dropped: bool) -> float:
+        """根据一次样本计算新的并发上限
+
+        Args:
+            rtt: 请求耗时（秒）
+            in_flight: 该请求完成前的在途请求数
+            dropped: 请求是否被丢弃
+
+        Returns:
+            新的并发上限（未截断）
+        """
+        pass
+
+
+class AIMDLimiter(AdaptiveLimiter):
+    """加性增、乘性减（AIMD）限制器
+
+    请求成功且负载充分时上限加1；请求超时、被拒绝或耗时超过
+    latency_threshold时上限乘以backoff_ratio
+
+    Args:
+        backoff_ratio: 乘性减系数
+        latency_threshold: 视为丢弃的延迟阈值（秒）
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 10,
+        min_limit: int = 1,
+        max_limit: int = 100,
+        backoff_ratio: float = 0.9,
+        latency_threshold: float = 5.0,
+    ) -> None:
+        super().__init__(initial_limit, min_limit, max_limit)
+        self.backoff_ratio = backoff_ratio
+        self.latency_threshold = latency_threshold
+
+    def _update(self, rtt: float, in_flight: int, dropped: bool) -> float:
+        if dropped or rtt > self.latency_threshold:
+            return self._limit * self.backoff_ratio
+        # 在途请求不足上限一半时说明受调用方约束，不增加上限
+        if in_flight * 2 >= self._limit:
+            return self._limit + 1
+        return self._limit
+
+
+class GradientLimiter(AdaptiveLimiter):
+    """基于延迟梯度的限制器
+
+    按采样窗口汇总平均延迟，与无负载延迟（观测到的最小单次延迟）比较：
+    窗口延迟升高说明出现排队，上限按比例收缩；延迟接近无负载延迟时，
+    上限在sqrt(limit)的排队余量内逐步增长。每个窗口至少包含
+    max(min_window, limit)个样本，即大致每轮往返更新一次上限。
+    无负载延迟每probe_interval个窗口重置一次，以适应服务端基础延迟的变化
+
+    Args:
+        smoothing: 上限更新的平滑系数
+        tolerance: 允许窗口延迟超过无负载延迟的倍数
+        min_window: 每个采样窗口的最少样本数
+        probe_interval: 重置无负载延迟的间隔（采样窗口数）
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 10,
+        min_limit: int = 1,
+        max_limit: int = 100,
+        smoothing: float = 0.2,
+        tolerance: float = 1.5,
+        min_window: int = 10,
+        probe_interval: int = 500,
+    ) -> None:
+        super().__init__(initial_limit, min_limit, max_limit)
+        self.smoothing = smoothing
+        self.tolerance = tolerance
+        self.min_window = min_window
+        self.probe_interval = probe_interval
+        self.rtt_noload: Optional[float] = None
+        self._windows = 0
+        self._window_samples = 0
+        self._window_sum = 0.0
+        self._window_count = 0
+        self._window_min = math.inf
+        self._window_dropped = False
+        self._window_max_in_flight = 0
+
+    def _update(self, rtt: float, in_flight: int, dropped: bool) -> float:
+        self._window_max_in_flight = max(self._window_max_in_flight, in_flight)
+        # 被丢弃的请求也计入窗口样本数，否则全部请求超时或过载时窗口永远不会结束
+        self._window_samples += 1
+        if dropped:
+            self._window_dropped = True
+        else:
+            self._window_sum += rtt
+            self._window_count += 1
+            self._window_min = min(self._window_min, rtt)
+
+        if self._window_samples < max(self.min_window, int(self._limit)):
+            return self._limit
+
+        window_count = self._window_count
+        window_rtt = self._window_sum / window_count if window_count else 0.0
+        window_dropped = self._window_dropped
+        window_min = self._window_min
+        max_in_flight = self._window_max_in_flight
+        self._window_samples = 0
+        self._window_sum = 0.0
+        self._window_count = 0
+        self._window_min = math.inf
+        self._window_dropped = False
+        self._window_max_in_flight = 0
+
+        self._windows += 1
+        if window_count and (
+            self.rtt_noload is None
+            or window_min < self.rtt_noload
+            or self._windows % self.probe_interval == 0
+        ):
+            self.rtt_noload = window_min
+
+        if window_dropped or self.rtt_noload is None:
+            return self._limit * 0.9
+
+        # 受调用方约束（在途请求不足上限一半）时不增加上限
+        if max_in_flight * 2 < self._limit:
+            return self._limit
+
+        if window_rtt <= 0:
+            # 时钟精度不足（如Windows上约15ms）时窗口内的耗时可能全为0，视为没有排队
+            gradient = 1.0
+        else:
+            gradient = max(0.5, min(1.0, self.tolerance * self.rtt_noload / window_rtt))
+        new_limit = self._limit * gradient + math.sqrt(self._limit)
+        return self._limit * (1 - self.smoothing) + new_limit * self.smoothing
@@ -0,0 +1,518 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Treer SSO SDK负载测试
+
+测量单个进程通过SDK能驱动的登录/用户信息请求速率，找出SDK自身成为瓶颈的位置。
+
+- 开环模式（--rate）：按固定到达速率发起请求，不等待之前的请求完成；延迟从
+  计划发起时间算起，避免协调遗漏（coordinated omission）低估排队时间
+- 闭环模式（--concurrency）：固定数量的并发工作者连续发起请求
+
+报告吞吐量、延迟分位数、按异常类型统计的错误、调度滞后（事件循环跟不上计划速率）
+以及连接池准入的饱和情况。--stand-in在子进程中启动内置的SSO服务替身。
+
+用法:
+    python -m treer_sso_sdk.loadtest --stand-in --rate 500 --duration 30
+    python -m treer_sso_sdk.loadtest --base-url https://sso-staging.example.com \\
+        --operation user-info --token "$TOKEN" --concurrency 50
+"""
+
+import argparse
+import itertools
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import anyio
+from anyio.abc import SocketAttribute, SocketStream, TaskStatus
+from anyio.streams.buffered import BufferedByteReceiveStream
+
+from .client import TreerSSOClient
+from .config import SSOConfig
+from .http_client import AsyncHTTPClient
+
+OPERATIONS = ("login", "user-info")
+
+_USER_JSON = json.dumps(
+    {
+        "id": 1,
+        "username": "loadtest",
+        "email": "loadtest@example.com",
+        "is_active": True,
+        "profile": {"first_name": "Load", "last_name": "Test"},
+        "created_at": "2024-01-01T00:00:00Z",
+    }
+).encode("utf-8")
+
+
+def _percentile(sorted_values: Sequence[float], percent: float) -> float:
+    """最近秩法计算分位数"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+@dataclass
+class LoadTestReport:
+    """负载测试结果
+
+    Attributes:
+        mode: "open"（开环）或"closed"（闭环）
+        operation: 压测的操作
+        target_rate: 开环模式的目标速率（请求/秒）
+        concurrency: 闭环模式的并发数
+        duration: 实际持续时间（秒）
+        requests: 发起的请求数
+        succeeded: 成功的请求数
+        dropped: 在途请求达到上限而未发起的请求数（仅开环模式）
+        errors: {异常类名: 次数}
+        throughput: 成功吞吐量（请求/秒）
+        latency_ms: 延迟分位数（毫秒），开环模式从计划发起时间算起
+        service_time_ms: 从实际发起到完成的耗时分位数（毫秒）
+        schedule_lag_ms: 实际发起时间落后于计划的分位数（毫秒）
+        pool_capacity: 连接池准入容量
+        pool_max_in_flight: 采样到的最大放行请求数
+        pool_mean_utilization: 放行请求数占容量的平均比例
+        pool_max_queued: 采样到的最大排队请求数
+    """
+
+    mode: str
+    operation: str
+    target_rate: Optional[float] = None
+    concurrency: Optional[int] = None
+    duration: float = 0.0
+    requests: int = 0
+    succeeded: int = 0
+    dropped: int = 0
+    errors: Dict[str, int] = field(default_factory=dict)
+    throughput: float = 0.0
+    latency_ms: Dict[str, float] = field(default_factory=dict)
+    service_time_ms: Dict[str, float] = field(default_factory=dict)
+    schedule_lag_ms: Dict[str, float] = field(default_factory=dict)
+    pool_capacity: int = 0
+    pool_max_in_flight: int = 0
+    pool_mean_utilization: float = 0.0
+    pool_max_queued: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典（用于JSON输出）"""
+        return asdict(self)
+
+    def format(self) -> str:
+        """格式化为文本报告"""
+        if self.mode == "open":
+            load = f"开环 {self.target_rate:g} 请求/秒"
+        else:
+            load = f"闭环 并发{self.concurrency}"
+        lines = [
+            f"操作: {self.operation}  负载: {load}  持续: {self.duration:.1f}s",
+            f"请求: {self.requests}  成功: {self.succeeded}  丢弃: {self.dropped}"
+            f"  吞吐量: {self.throughput:.1f} 请求/秒",
+        ]
+        for title, values in (
+            ("延迟", self.latency_ms),
+            ("服务时间", self.service_time_ms),
+            ("调度滞后", self.schedule_lag_ms),
+        ):
+            lines.append(
+                f"{title}(ms): " + "  ".join(f"{k} {v:.2f}" for k, v in values.items())
+            )
+        lines.append(
+            f"连接池: 容量 {self.pool_capacity}  最大在途 {self.pool_max_in_flight}"
+            f"  平均利用率 {self.pool_mean_utilization:.0%}"
+            f"  最大排队 {self.pool_max_queued}"
+        )
+        if self.errors:
+            lines.append(
+                "错误: "
+                + "  ".join(
+                    f"{name} {count}" for name, count in sorted(self.errors.items())
+                )
+            )
+        return "\n".join(lines)
+
+
+def _summarize(values: List[float]) -> Dict[str, float]:
+    values.sort()
+    return {
+        "p50": _percentile(values, 50) * 1000,
+        "p90": _percentile(values, 90) * 1000,
+        "p99": _percentile(values, 99) * 1000,
+        "p99.9": _percentile(values, 99.9) * 1000,
+        "max": (values[-1] if values else 0.0) * 1000,
+    }
+
+
+class LoadTest:
+    """负载测试执行器
+
+    Args:
+        client: SSO客户端
+        operation: "login"（get_user_info_by_code）或"user-info"（get_user_info）
+        tokens: user-info操作使用的访问令牌（轮流使用），为空时每次生成新的令牌
+            （只适用于接受任意令牌的服务替身，不经过用户信息缓存）
+        max_outstanding: 开环模式下的最大在途请求数，超出时丢弃并计数
+        sample_interval: 连接池状态采样间隔（秒）
+    """
+
+    def __init__(
+        self,
+        client: TreerSSOClient,
+        operation: str = "login",
+        tokens: Sequence[str] = (),
+        max_outstanding: int = 10000,
+        sample_interval: float = 0.1,
+    ) -> None:
+        if operation not in OPERATIONS:
+            raise ValueError(f"未知的操作: {operation}")
+        self.client = client
+        self.operation = operation
+        self.tokens = list(tokens)
+        self.max_outstanding = max_outstanding
+        self.sample_interval = sample_interval
+        self._sequence = itertools.count()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._latencies: List[float] = []
+        self._service_times: List[float] = []
+        self._lags: List[float] = []
+        self._errors: Dict[str, int] = {}
+        self._outstanding = 0
+        self._requests = 0
+        self._dropped = 0
+        self._in_flight_samples: List[int] = []
+        self._queued_samples: List[int] = []
+
+    async def run_open(self, rate: float, duration: float) -> LoadTestReport:
+        """开环模式：按固定速率发起请求
+
+        Args:
+            rate: 目标速率（请求/秒）
+            duration: 持续时间（秒）
+        """
+        self._reset()
+        interval = 1.0 / rate
+        started = anyio.current_time()
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(self._sample_pool)
+            # 按序号计算计划发起时间，避免累积误差
+            for i in range(int(round(rate * duration, 6))):
+                intended = started + i * interval
+                delay = intended - anyio.current_time()
+                if delay > 0:
+                    await anyio.sleep(delay)
+                if self._outstanding >= self.max_outstanding:
+                    self._dropped += 1
+                    continue
+                self._outstanding += 1
+                tg.start_soon(self._call, intended)
+            while self._outstanding:
+                await anyio.sleep(self.sample_interval)
+            tg.cancel_scope.cancel()
+        report = self._report("open", anyio.current_time() - started)
+        report.target_rate = rate
+        return report
+
+    async def run_closed(self, concurrency: int, duration: float) -> LoadTestReport:
+        """闭环模式：固定数量的工作者连续发起请求
+
+        Args:
+            concurrency: 并发工作者数
+            duration: 持续时间（秒）
+        """
+        self._reset()
+        started = anyio.current_time()
+        deadline = started + duration
+
+        async def worker() -> None:
+            while anyio.current_time() < deadline:
+                self._outstanding += 1
+                await self._call(anyio.current_time())
+
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(self._sample_pool)
+            async with anyio.create_task_group() as workers:
+                for _ in range(concurrency):
+                    workers.start_soon(worker)
+            tg.cancel_scope.cancel()
+        report = self._report("closed", anyio.current_time() - started)
+        report.concurrency = concurrency
+        return report
+
+    async def _call(self, intended: float) -> None:
+        self._requests += 1
+        started = anyio.current_time()
+        self._lags.append(started - intended)
+        try:
+            await self._operation()
+        except Exception as e:
+            name = type(e).__name__
+            self._errors[name] = self._errors.get(name, 0) + 1
+        else:
+            finished = anyio.current_time()
+            self._latencies.append(finished - intended)
+            self._service_times.append(finished - started)
+        finally:
+            self._outstanding -= 1
+
+    async def _operation(self) -> None:
+        n = next(self._sequence)
+        if self.operation == "login":
+            await self.client.get_user_info_by_code(f"loadtest-code-{n}")
+        elif self.tokens:
+            await self.client.get_user_info(self.tokens[n % len(self.tokens)])
+        else:
+            await self.client.get_user_info(f"loadtest-token-{n}")
+
+    async def _sample_pool(self) -> None:
+        admission = getattr(self.client.http_client, "admission", None)
+        if admission is None:
+            return
+        while True:
+            self._in_flight_samples.append(admission.total_in_flight)
+            self._queued_samples.append(admission.waiting())
+            await anyio.sleep(self.sample_interval)
+
+    def _report(self, mode: str, elapsed: float) -> LoadTestReport:
+        admission = getattr(self.client.http_client, "admission", None)
+        capacity = admission.capacity if admission is not None else 0
+        in_flight = self._in_flight_samples
+        return LoadTestReport(
+            mode=mode,
+            operation=self.operation,
+            duration=elapsed,
+            requests=self._requests,
+            succeeded=len(self._latencies),
+            dropped=self._dropped,
+            errors=dict(self._errors),
+            throughput=len(self._latencies) / elapsed if elapsed > 0 else 0.0,
+            latency_ms=_summarize(self._latencies),
+            service_time_ms=_summarize(self._service_times),
+            schedule_lag_ms=_summarize(self._lags),
+            pool_capacity=capacity,
+            pool_max_in_flight=max(in_flight, default=0),
+            pool_mean_utilization=(
+                sum(in_flight) / len(in_flight) / capacity
+                if in_flight and capacity
+                else 0.0
+            ),
+            pool_max_queued=max(self._queued_samples, default=0),
+        )
+
+
+# ---- 内置SSO服务替身 ----
+
+
+async def _handle_stand_in(stream: SocketStream, delay: float) -> None:
+    """处理一个保持连接上的全部请求"""
+    receive = BufferedByteReceiveStream(stream)
+    async with stream:
+        while True:
+            try:
+                head = await receive.receive_until(b"\r\n\r\n", 65536)
+            except (anyio.EndOfStream, anyio.IncompleteRead, anyio.BrokenResourceError):
+                return
+            request_line, _, header_block = head.partition(b"\r\n")
+            length = 0
+            for line in header_block.split(b"\r\n"):
+                name, _, value = line.partition(b":")
+                if name.strip().lower() == b"content-length":
+                    length = int(value)
+            if length:
+                await receive.receive_exactly(length)
+            if delay:
+                await anyio.sleep(delay)
+
+            if b"/oauth/token" in request_line:
+                body = json.dumps(
+                    {
+                        "access_token": f"loadtest-token-{time.monotonic_ns()}",
+                        "token_type": "Bearer",
+                        "expires_in": 3600,
+                    }
+                ).encode("utf-8")
+            else:
+                body = _USER_JSON
+            await stream.send(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                b"Content-Length: "
+                + str(len(body)).encode("ascii")
+                + b"\r\n\r\n"
+                + body
+            )
+
+
+async def serve_stand_in(
+    port: int = 0,
+    delay: float = 0.0,
+    *,
+    task_status: TaskStatus[int] = anyio.TASK_STATUS_IGNORED,
+) -> None:
+    """运行SSO服务替身，直到被取消
+
+    令牌接口对任何授权码返回新令牌，用户信息接口对任何令牌返回固定用户
+
+    Args:
+        port: 监听端口，0表示自动分配
+        delay: 每个请求的模拟服务端耗时（秒）
+        task_status: 通过TaskGroup.start()启动时报告实际端口
+    """
+    listener = await anyio.create_tcp_listener(local_host="127.0.0.1", local_port=port)
+    async with listener:
+        sock = listener.extra(SocketAttribute.raw_socket)
+        task_status.started(sock.getsockname()[1])
+        await listener.serve(lambda stream: _handle_stand_in(stream, delay))
+
+
+def _start_stand_in_process(delay: float) -> Tuple["subprocess.Popen[bytes]", str]:
+    """在子进程中启动服务替身，避免与被测客户端争用事件循环与GIL"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "treer_sso_sdk.loadtest",
+            "--serve",
+            str(port),
+            "--stand-in-delay",
+            str(delay * 1000),
+        ]
+    )
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            return process, f"http://127.0.0.1:{port}"
+        except OSError:
+            time.sleep(0.05)
+    process.terminate()
+    raise RuntimeError("SSO服务替身启动超时")
+
+
+def _parse_args(argv: Optional[Sequence[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m treer_sso_sdk.loadtest",
+        description="Treer SSO SDK负载测试",
+    )
+    target = parser.add_argument_group("目标")
+    target.add_argument("--base-url", help="SSO服务基础URL")
+    target.add_argument(
+        "--stand-in", action="store_true", help="在子进程中启动内置的SSO服务替身"
+    )
+    target.add_argument(
+        "--stand-in-delay",
+        type=float,
+        default=0.0,
+        help="服务替身每个请求的模拟耗时（毫秒）",
+    )
+    target.add_argument(
+        "--client-id", default=os.environ.get("TREER_SSO_CLIENT_ID", "loadtest")
+    )
+    target.add_argument(
+        "--client-secret", default=os.environ.get("TREER_SSO_CLIENT_SECRET", "loadtest")
+    )
+
+    load = parser.add_argument_group("负载")
+    load.add_argument("--operation", choices=OPERATIONS, default="login")
+    load.add_argument(
+        "--token",
+        action="append",
+        default=[],
+        help="user-info操作使用的访问令牌（可重复），缺省时每次生成新令牌",
+    )
+    mode = load.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--rate", type=float, help="开环模式的目标速率（请求/秒），默认100"
+    )
+    mode.add_argument("--concurrency", type=int, help="闭环模式的并发数")
+    load.add_argument("--duration", type=float, default=10.0, help="持续时间（秒）")
+    load.add_argument(
+        "--warmup", type=float, default=1.0, help="预热时间（秒），不计入结果"
+    )
+    load.add_argument(
+        "--max-outstanding", type=int, default=10000, help="开环模式的最大在途请求数"
+    )
+
+    sdk = parser.add_argument_group("SDK配置")
+    sdk.add_argument("--max-connections", type=int, default=100)
+    sdk.add_argument("--timeout", type=int, default=30)
+    sdk.add_argument("--adaptive-concurrency", action="store_true")
+    sdk.add_argument(
+        "--backend", choices=("asyncio", "uvloop", "trio"), default="asyncio"
+    )
+
+    parser.add_argument("--json", action="store_true", help="以JSON输出报告")
+    parser.add_argument("--serve", type=int, help=argparse.SUPPRESS)
+
+    args = parser.parse_args(argv)
+    if args.serve is None and not args.stand_in and not args.base_url:
+        parser.error("需要--base-url或--stand-in")
+    if args.rate is not None and args.rate <= 0:
+        parser.error("--rate必须大于0")
+    if args.concurrency is not None and args.concurrency <= 0:
+        parser.error("--concurrency必须大于0")
+    return args
+
+
+async def _run(args: argparse.Namespace, base_url: str) -> LoadTestReport:
+    config = SSOConfig(
+        client_id=args.client_id,
+        client_secret=args.client_secret,
+        sso_base_url=base_url,
+        timeout=args.timeout,
+        max_connections=args.max_connections,
+        adaptive_concurrency=args.adaptive_concurrency,
+    )
+    async with TreerSSOClient(config, http_client=AsyncHTTPClient(config)) as client:
+        test = LoadTest(client, args.operation, args.token, args.max_outstanding)
+        if args.concurrency is not None:
+            if args.warmup > 0:
+                await test.run_closed(args.concurrency, args.warmup)
+            return await test.run_closed(args.concurrency, args.duration)
+        rate = args.rate if args.rate is not None else 100.0
+        if args.warmup > 0:
+            await test.run_open(rate, args.warmup)
+        return await test.run_open(rate, args.duration)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """命令行入口"""
+    args = _parse_args(argv)
+    if args.serve is not None:
+        anyio.run(serve_stand_in, args.serve, args.stand_in_delay / 1000)
+        return
+
+    process = None
+    base_url = args.base_url
+    if args.stand_in:
+        process, base_url = _start_stand_in_process(args.stand_in_delay / 1000)
+    try:
+        backend = "trio" if args.backend == "trio" else "asyncio"
+        options = {"use_uvloop": True} if args.backend == "uvloop" else None
+        report = anyio.run(
+            _run, args, base_url, backend=backend, backend_options=options
+        )
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    if args.json:
+        print(json.dumps(report.to_dict(), ensure_ascii=False, indent=2))
+    else:
+        print(report.format())
+
+
+if __name__ == "__main__":
+    main()
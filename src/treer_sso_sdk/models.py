@@ -4,11 +4,21 @@
 Treer SSO SDK数据模型
 """
 
+import json
+import re
+from collections.abc import ItemsView, KeysView, Mapping, ValuesView
 from dataclasses import dataclass, field
-from typing import Optional, Dict, Any
+from typing import (
+    Optional, Dict, Any, FrozenSet, Iterable, Iterator, List, Tuple, Type, Union
+)
 from datetime import datetime
 
+from .compiled import mypyc_attr
+from .exceptions import SSOError
+from .scopes import has_all, has_any, parse_scopes
 
+
+@mypyc_attr(native_class=False)
 @dataclass
 class UserProfile:
     """用户档案信息
@@ -19,14 +29,15 @@ class UserProfile:
         avatar_url: 头像URL
         locale: 语言设置，默认为中文
         timezone: 时区设置，默认为上海时区
-        additional_info: 附加信息字典
+        additional_info: 附加信息字典；启用config.lazy_additional_info_size时，
+            较大的附加信息为首次访问时才解析的LazyJSON
     """
     first_name: Optional[str] = None
     last_name: Optional[str] = None
     avatar_url: Optional[str] = None
     locale: str = "zh"
     timezone: str = "Asia/Shanghai"
-    additional_info: Dict[str, Any] = field(default_factory=dict)
+    additional_info: Union[Dict[str, Any], 'LazyJSON'] = field(default_factory=dict)
     
     @property
     def full_name(self) -> str:
@@ -35,6 +46,32 @@ class UserProfile:
         return " ".join(names) if names else ""
 
 
+def _parse_profile(profile_data: Optional[Dict[str, Any]]) -> Optional[UserProfile]:
+    """解析用户档案"""
+    if not profile_data:
+        return None
+    return UserProfile(
+        first_name=profile_data.get('first_name'),
+        last_name=profile_data.get('last_name'),
+        avatar_url=profile_data.get('avatar_url'),
+        locale=profile_data.get('locale', 'zh'),
+        timezone=profile_data.get('timezone', 'Asia/Shanghai'),
+        additional_info=profile_data.get('additional_info', {})
+    )
+
+
+def _parse_datetime(value: Any) -> Optional[datetime]:
+    """解析ISO 8601日期时间，格式错误时返回None"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (ValueError, AttributeError):
+        # 如果日期格式解析失败，忽略该字段
+        return None
+
+
+@mypyc_attr(native_class=False)
 @dataclass
 class UserInfo:
     """用户信息数据类
@@ -78,59 +115,94 @@ class UserInfo:
         if 'username' not in data:
             raise KeyError("缺少必需字段: username")
         
-        # 解析用户档案
-        profile_data = data.get('profile')
-        profile = None
-        if profile_data:
-            profile = UserProfile(
-                first_name=profile_data.get('first_name'),
-                last_name=profile_data.get('last_name'),
-                avatar_url=profile_data.get('avatar_url'),
-                locale=profile_data.get('locale', 'zh'),
-                timezone=profile_data.get('timezone', 'Asia/Shanghai'),
-                additional_info=profile_data.get('additional_info', {})
-            )
-        
-        # 解析日期时间字段
-        created_at = None
-        updated_at = None
-        
-        if data.get('created_at'):
-            try:
-                created_at = datetime.fromisoformat(
-                    data['created_at'].replace('Z', '+00:00')
-                )
-            except (ValueError, AttributeError):
-                # 如果日期格式解析失败，忽略该字段
-                pass
-        
-        if data.get('updated_at'):
-            try:
-                updated_at = datetime.fromisoformat(
-                    data['updated_at'].replace('Z', '+00:00')
-                )
-            except (ValueError, AttributeError):
-                # 如果日期格式解析失败，忽略该字段
-                pass
-        
         return cls(
             id=str(data['id']),
             username=data['username'],
             email=data.get('email'),
             phone=data.get('phone'),
             is_active=data.get('is_active', True),
-            profile=profile,
-            created_at=created_at,
-            updated_at=updated_at
+            profile=_parse_profile(data.get('profile')),
+            created_at=_parse_datetime(data.get('created_at')),
+            updated_at=_parse_datetime(data.get('updated_at'))
         )
     
     def to_dict(self) -> Dict[str, Any]:
         """将UserInfo实例转换为字典
         
+        结果在实例上缓存，字段（包括profile的字段）被重新赋值后自动失效；
+        每次返回新的字典，调用方修改返回值不影响缓存。
+        原地修改profile.additional_info不会被检测到，此后需调用invalidate()
+        
         Returns:
             包含用户信息的字典
         """
-        result = {
+        result = dict(self._serialization().data)
+        if 'profile' in result:
+            profile = result['profile'] = dict(result['profile'])
+            if isinstance(profile['additional_info'], LazyJSON):
+                profile['additional_info'] = dict(profile['additional_info'])
+        return result
+    
+    def to_json_bytes(self) -> bytes:
+        """序列化为UTF-8编码的紧凑JSON（结果缓存，失效规则同to_dict）"""
+        cache = self._serialization()
+        if cache.json is None:
+            cache.json = json.dumps(
+                cache.data,
+                ensure_ascii=False,
+                separators=(',', ':'),
+                default=_json_default,
+            ).encode('utf-8')
+        return cache.json
+    
+    def to_bytes(self) -> bytes:
+        """序列化为紧凑的二进制格式（结果缓存，失效规则同to_dict）
+        
+        可通过from_bytes还原，解码速度明显快于json.loads加from_dict
+        """
+        cache = self._serialization()
+        if cache.binary is None:
+            cache.binary = _encode_user_info(self)
+        return cache.binary
+    
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'UserInfo':
+        """从to_bytes的结果还原UserInfo实例
+        
+        Raises:
+            ValueError: 数据格式错误或版本不支持
+        """
+        return _decode_user_info(cls, data)
+    
+    def invalidate(self) -> None:
+        """丢弃序列化缓存"""
+        self.__dict__.pop("_serialized", None)
+    
+    def _fingerprint(self) -> Tuple[Any, ...]:
+        """参与序列化的全部字段值，用于判断缓存是否仍然有效"""
+        profile = self.profile
+        fields = (
+            self.id, self.username, self.email, self.phone, self.is_active,
+            self.created_at, self.updated_at, profile
+        )
+        if profile is None:
+            return fields
+        return fields + (
+            profile.first_name, profile.last_name, profile.avatar_url,
+            profile.locale, profile.timezone, profile.additional_info
+        )
+    
+    def _serialization(self) -> '_SerializationCache':
+        # 读取时比较字段快照而不是拦截赋值，构造实例没有额外开销
+        fingerprint = self._fingerprint()
+        cache = self.__dict__.get("_serialized")
+        if cache is None or cache.fingerprint != fingerprint:
+            cache = _SerializationCache(self._build_dict(), fingerprint)
+            self.__dict__["_serialized"] = cache
+        return cache
+    
+    def _build_dict(self) -> Dict[str, Any]:
+        result: Dict[str, Any] = {
             'id': self.id,
             'username': self.username,
             'email': self.email,
@@ -157,8 +229,470 @@ class UserInfo:
         return result
 
 
+@mypyc_attr(native_class=False)
+class _LazyField:
+    """首次访问时从原始字典解析字段值，并缓存在实例字典中"""
+    
+    def __init__(self, parse: Any) -> None:
+        self.parse = parse
+    
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+    
+    def __get__(self, obj: Any, objtype: Optional[type] = None) -> Any:
+        if obj is None:
+            return self
+        attributes = obj.__dict__
+        try:
+            return attributes[self.name]
+        except KeyError:
+            raw = attributes.get('_raw')
+            value = self.parse(raw.get(self.name)) if raw is not None else None
+            attributes[self.name] = value
+            return value
+    
+    def __set__(self, obj: Any, value: Any) -> None:
+        obj.__dict__[self.name] = value
+
+
+_USER_INFO_FIELDS = tuple(UserInfo.__dataclass_fields__)
+
+
+@mypyc_attr(native_class=False)
+class LazyUserInfo(UserInfo):
+    """延迟解析的UserInfo
+    
+    构造时只读取id、username、email、phone和is_active，保留原始字典；
+    profile、created_at和updated_at在首次访问时解析并缓存。
+    其余行为与UserInfo一致（isinstance、序列化等）；与字段值相同的UserInfo比较时相等
+    
+    Example:
+        >>> user_info = LazyUserInfo.from_dict(response.json())
+        >>> user_info.username          # 不解析档案与时间
+        >>> user_info.profile.full_name  # 首次访问时解析
+    """
+    
+    profile = _LazyField(_parse_profile)
+    created_at = _LazyField(_parse_datetime)
+    updated_at = _LazyField(_parse_datetime)
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'LazyUserInfo':
+        """从字典创建LazyUserInfo实例（不复制字典，调用方不应再修改它）
+        
+        Raises:
+            KeyError: 缺少必需的字段
+        """
+        if 'id' not in data:
+            raise KeyError("缺少必需字段: id")
+        if 'username' not in data:
+            raise KeyError("缺少必需字段: username")
+        
+        user_info = cls.__new__(cls)
+        user_info.__dict__.update(
+            id=str(data['id']),
+            username=data['username'],
+            email=data.get('email'),
+            phone=data.get('phone'),
+            is_active=data.get('is_active', True),
+            _raw=data
+        )
+        return user_info
+    
+    def __eq__(self, other: object) -> bool:
+        # dataclass生成的__eq__要求类型完全相同，这里按字段值与任意UserInfo比较
+        if not isinstance(other, UserInfo):
+            return NotImplemented
+        return all(
+            getattr(self, name) == getattr(other, name) for name in _USER_INFO_FIELDS
+        )
+    
+    __hash__ = None  # type: ignore[assignment]
+
+
+@mypyc_attr(native_class=False)
+class LazyJSON:
+    """首次访问时才解析的JSON对象（只读Mapping）
+    
+    保留原始JSON文本，读取键、迭代或求长度时解析一次并缓存结果，格式错误时抛出SSOError。
+    用于体积较大、通常不会被读取的profile.additional_info：不读取时只占用
+    原始文本的内存；to_bytes直接写入原始文本，to_dict返回解析后的普通字典。
+    未继承collections.abc.Mapping（编译构建中与ABCMeta元类冲突），而是注册为其虚拟子类
+    
+    Attributes:
+        raw: 原始JSON文本
+    """
+    
+    __slots__ = ('raw', '_value')
+    
+    def __init__(self, raw: str) -> None:
+        self.raw = raw
+        self._value: Optional[Dict[str, Any]] = None
+    
+    @property
+    def parsed(self) -> bool:
+        """是否已经解析"""
+        return self._value is not None
+    
+    def _parse(self) -> Dict[str, Any]:
+        if self._value is None:
+            try:
+                self._value = json.loads(self.raw)
+            except json.JSONDecodeError as e:
+                # 延迟解析时只检查了括号配对，格式错误在首次访问时才会发现
+                raise SSOError(f"响应解析失败: {e}") from e
+        return self._value
+    
+    def __getitem__(self, key: str) -> Any:
+        return self._parse()[key]
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._parse())
+    
+    def __len__(self) -> int:
+        return len(self._parse())
+    
+    def __contains__(self, key: object) -> bool:
+        return key in self._parse()
+    
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, LazyJSON):
+            return self._parse() == other._parse()
+        return self._parse() == other
+    
+    __hash__ = None  # type: ignore[assignment]
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._parse().get(key, default)
+    
+    def keys(self) -> KeysView[str]:
+        return self._parse().keys()
+    
+    def values(self) -> ValuesView[Any]:
+        return self._parse().values()
+    
+    def items(self) -> ItemsView[str, Any]:
+        return self._parse().items()
+    
+    def __repr__(self) -> str:
+        if self._value is None:
+            return f"LazyJSON(<{len(self.raw)}字符，未解析>)"
+        return f"LazyJSON({self._value!r})"
+
+
+Mapping.register(LazyJSON)
+
+
+_JSON_STRING = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+_JSON_TOKEN = re.compile(_JSON_STRING + r'|[{}\[\]:,]')
+_JSON_NESTING = re.compile(_JSON_STRING + r'|[{}\[\]]')
+# 解析时替代additional_info对象的占位值（原始JSON中不可能出现未转义的NUL）
+_LAZY_PLACEHOLDER = '\x00lazy'
+
+
+def _json_default(value: Any) -> Any:
+    """json.dumps无法直接序列化的值"""
+    if isinstance(value, LazyJSON):
+        return dict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _skip_json_object(text: str, pos: int) -> int:
+    """返回从pos开始（已越过左括号）的对象或数组的结束位置，格式错误时返回-1"""
+    depth = 1
+    for match in _JSON_NESTING.finditer(text, pos):
+        first = match.group()[0]
+        if first == '{' or first == '[':
+            depth += 1
+        elif first == '}' or first == ']':
+            depth -= 1
+            if depth == 0:
+                return match.end()
+    return -1
+
+
+def _find_additional_info(text: str) -> Optional[Tuple[int, int]]:
+    """查找"profile"对象中"additional_info"对象值在JSON文本中的范围
+    
+    只扫描字符串与结构符号，additional_info之后的内容不再扫描
+    """
+    # 每层容器当前的键（数组为None），以及该层是否为对象
+    keys: List[Optional[str]] = []
+    objects: List[bool] = []
+    expect_key = False
+    for match in _JSON_TOKEN.finditer(text):
+        token = match.group()
+        first = token[0]
+        if first == '"':
+            if expect_key:
+                keys[-1] = token
+                expect_key = False
+        elif first == '{' or first == '[':
+            if (
+                first == '{'
+                and len(keys) >= 2
+                and keys[-1] == '"additional_info"'
+                and keys[-2] == '"profile"'
+            ):
+                end = _skip_json_object(text, match.end())
+                return (match.start(), end) if end > 0 else None
+            keys.append(None)
+            objects.append(first == '{')
+            expect_key = first == '{'
+        elif first == '}' or first == ']':
+            if not keys:
+                return None
+            keys.pop()
+            objects.pop()
+            expect_key = False
+        elif first == ',':
+            expect_key = bool(objects) and objects[-1]
+    return None
+
+
+def loads_user_info(text: str, lazy_additional_info_size: int = 0) -> Any:
+    """解析用户信息响应的JSON文本
+    
+    profile.additional_info对象的JSON文本长度不小于lazy_additional_info_size时
+    不解析该对象，以LazyJSON保留原始文本；为0时等同于json.loads
+    
+    Args:
+        text: 响应文本（用户对象本身，或包装在ApiResponse的data字段中）
+        lazy_additional_info_size: 延迟解析的最小长度（字符），0表示禁用
+    
+    Raises:
+        json.JSONDecodeError: JSON格式错误
+    """
+    span = _find_additional_info(text) if lazy_additional_info_size else None
+    if span is None or span[1] - span[0] < lazy_additional_info_size:
+        return json.loads(text)
+    start, end = span
+    data = json.loads(text[:start] + '"\\u0000lazy"' + text[end:])
+    user = data.get('data', data) if isinstance(data, dict) else None
+    profile = user.get('profile') if isinstance(user, dict) else None
+    if (
+        not isinstance(profile, dict)
+        or profile.get('additional_info') != _LAZY_PLACEHOLDER
+    ):
+        # 匹配到的不是用户档案（如嵌套在其他字段中），按普通JSON解析
+        return json.loads(text)
+    profile['additional_info'] = LazyJSON(text[start:end])
+    return data
+
+
+class _SerializationCache:
+    """UserInfo的序列化缓存"""
+    
+    __slots__ = ('data', 'fingerprint', 'json', 'binary')
+    
+    def __init__(self, data: Dict[str, Any], fingerprint: Tuple[Any, ...]) -> None:
+        self.data = data
+        self.fingerprint = fingerprint
+        self.json: Optional[bytes] = None
+        self.binary: Optional[bytes] = None
+
+
+# 二进制格式: 头部（版本、标志位、profile标志位，各1字节）+ 以NUL分隔的
+# 字符串字段的UTF-8内容。标志位记录可选字段是否存在，解码时只需一次UTF-8解码
+# 和一次split；日期时间保存为ISO 8601字符串，additional_info保存为JSON
+# （JSON会转义NUL，为空时为空字符串）
+_BINARY_VERSION = 1
+_HAS_EMAIL = 0x01
+_HAS_PHONE = 0x02
+_IS_ACTIVE = 0x04
+_HAS_PROFILE = 0x08
+_HAS_CREATED_AT = 0x10
+_HAS_UPDATED_AT = 0x20
+_HAS_FIRST_NAME = 0x01
+_HAS_LAST_NAME = 0x02
+_HAS_AVATAR_URL = 0x04
+_SEPARATOR = '\x00'
+
+
+def _encode_user_info(user_info: 'UserInfo') -> bytes:
+    flags = _IS_ACTIVE if user_info.is_active else 0
+    profile_flags = 0
+    fields = [user_info.id, user_info.username]
+    if user_info.email is not None:
+        flags |= _HAS_EMAIL
+        fields.append(user_info.email)
+    if user_info.phone is not None:
+        flags |= _HAS_PHONE
+        fields.append(user_info.phone)
+    profile = user_info.profile
+    if profile is not None:
+        flags |= _HAS_PROFILE
+        for bit, value in (
+            (_HAS_FIRST_NAME, profile.first_name),
+            (_HAS_LAST_NAME, profile.last_name),
+            (_HAS_AVATAR_URL, profile.avatar_url),
+        ):
+            if value is not None:
+                profile_flags |= bit
+                fields.append(value)
+        fields.append(profile.locale)
+        fields.append(profile.timezone)
+        additional_info = profile.additional_info
+        if isinstance(additional_info, LazyJSON):
+            # 直接写入原始文本，不需要解析
+            fields.append(additional_info.raw)
+        else:
+            fields.append(
+                json.dumps(additional_info, ensure_ascii=False, separators=(',', ':'))
+                if additional_info else ''
+            )
+    if user_info.created_at is not None:
+        flags |= _HAS_CREATED_AT
+        fields.append(user_info.created_at.isoformat())
+    if user_info.updated_at is not None:
+        flags |= _HAS_UPDATED_AT
+        fields.append(user_info.updated_at.isoformat())
+    
+    body = _SEPARATOR.join(fields)
+    if body.count(_SEPARATOR) != len(fields) - 1:
+        raise ValueError("UserInfo字段包含NUL字符，无法编码为二进制格式")
+    return bytes((_BINARY_VERSION, flags, profile_flags)) + body.encode('utf-8')
+
+
+def _decode_user_info(cls: Type['UserInfo'], data: bytes) -> 'UserInfo':
+    if len(data) < 3:
+        raise ValueError("UserInfo二进制数据被截断")
+    version, flags, profile_flags = data[0], data[1], data[2]
+    if version != _BINARY_VERSION:
+        raise ValueError(f"不支持的UserInfo二进制格式版本: {version}")
+    try:
+        fields = data[3:].decode('utf-8').split(_SEPARATOR)
+        user_id, username = fields[0], fields[1]
+        index = 2
+        email = phone = None
+        if flags & _HAS_EMAIL:
+            email = fields[index]
+            index += 1
+        if flags & _HAS_PHONE:
+            phone = fields[index]
+            index += 1
+        profile = None
+        if flags & _HAS_PROFILE:
+            first_name = last_name = avatar_url = None
+            if profile_flags & _HAS_FIRST_NAME:
+                first_name = fields[index]
+                index += 1
+            if profile_flags & _HAS_LAST_NAME:
+                last_name = fields[index]
+                index += 1
+            if profile_flags & _HAS_AVATAR_URL:
+                avatar_url = fields[index]
+                index += 1
+            additional_info = fields[index + 2]
+            # 绕过__init__直接填充实例字典
+            profile = UserProfile.__new__(UserProfile)
+            profile.__dict__.update(
+                first_name=first_name,
+                last_name=last_name,
+                avatar_url=avatar_url,
+                locale=fields[index],
+                timezone=fields[index + 1],
+                additional_info=json.loads(additional_info) if additional_info else {}
+            )
+            index += 3
+        created_at = updated_at = None
+        if flags & _HAS_CREATED_AT:
+            created_at = datetime.fromisoformat(fields[index])
+            index += 1
+        if flags & _HAS_UPDATED_AT:
+            updated_at = datetime.fromisoformat(fields[index])
+            index += 1
+    except (IndexError, UnicodeDecodeError) as e:
+        raise ValueError(f"UserInfo二进制数据无效: {e}") from e
+    if index != len(fields):
+        raise ValueError("UserInfo二进制数据字段数不一致")
+    
+    user_info = cls.__new__(cls)
+    user_info.__dict__.update(
+        id=user_id,
+        username=username,
+        email=email,
+        phone=phone,
+        is_active=bool(flags & _IS_ACTIVE),
+        profile=profile,
+        created_at=created_at,
+        updated_at=updated_at
+    )
+    return user_info
+
+
+@mypyc_attr(allow_interpreted_subclasses=True)
+@dataclass
+class CachedUserInfo:
+    """缓存的用户信息及其验证器
+    
+    Attributes:
+        user_info: 用户信息
+        expires_at: 新鲜期截止时间（Unix时间戳），过期后需向服务端重新验证
+        etag: 响应的ETag头，用于If-None-Match条件请求
+        last_modified: 响应的Last-Modified头，用于If-Modified-Since条件请求
+        body_size: 原始响应体大小（字节），用于统计304节省的流量
+        fetched_at: 最近一次从服务端获取或验证的时间（Unix时间戳）
+        token_expires_at: 访问令牌的过期时间（Unix时间戳），过期后条目失效
+        scope: 访问令牌的授权范围
+    """
+    user_info: UserInfo
+    expires_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    body_size: int = 0
+    fetched_at: float = 0.0
+    token_expires_at: Optional[float] = None
+    scope: Optional[str] = None
+    
+    @property
+    def has_validator(self) -> bool:
+        """是否可以发起条件请求"""
+        return bool(self.etag or self.last_modified)
+
+
+@mypyc_attr(allow_interpreted_subclasses=True)
 @dataclass
-class TokenResponse:
+class UserInfoResult:
+    """用户信息查询结果
+    
+    Attributes:
+        user_info: 用户信息
+        stale: 是否为超出新鲜期的缓存结果（stale-while-revalidate或stale-if-error）
+        age: 距最近一次从服务端获取或验证的秒数，直接来自服务端时为0
+    """
+    user_info: UserInfo
+    stale: bool = False
+    age: float = 0.0
+
+
+@mypyc_attr(allow_interpreted_subclasses=True)
+class _ScopeChecks:
+    """基于scope字段（空格分隔的授权范围字符串）的授权检查"""
+    
+    scope: Optional[str]
+    
+    @property
+    def scopes(self) -> FrozenSet[str]:
+        """解析后的授权范围集合（相同scope字符串只解析一次）"""
+        return parse_scopes(self.scope)
+    
+    def has_scope(self, name: str) -> bool:
+        """是否具备指定scope"""
+        return name in parse_scopes(self.scope)
+    
+    def has_all(self, names: Union[str, Iterable[str]]) -> bool:
+        """是否具备全部指定scope"""
+        return has_all(self.scope, names)
+    
+    def has_any(self, names: Union[str, Iterable[str]]) -> bool:
+        """是否具备任一指定scope"""
+        return has_any(self.scope, names)
+
+
+@mypyc_attr(allow_interpreted_subclasses=True)
+@dataclass
+class TokenResponse(_ScopeChecks):
     """访问令牌响应
     
     Attributes:
@@ -177,4 +711,56 @@ class TokenResponse:
     @property
     def authorization_header(self) -> str:
         """获取Authorization头部值"""
-        return f"{self.token_type} {self.access_token}" 
\ No newline at end of file
+        return f"{self.token_type} {self.access_token}"
+
+
+def _optional_timestamp(data: Dict[str, Any], name: str) -> Optional[int]:
+    """读取可选的Unix时间戳字段，字符串或浮点数转换为int"""
+    value = data.get(name)
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError, OverflowError):
+        raise SSOError(f"令牌自省响应的{name}字段无效: {value!r}") from None
+
+
+@mypyc_attr(allow_interpreted_subclasses=True)
+@dataclass
+class TokenIntrospection(_ScopeChecks):
+    """令牌自省结果（RFC 7662）
+
+    只保留资源服务器判断"令牌是否有效、属于谁、具备哪些授权范围"所需的字段
+
+    Attributes:
+        active: 令牌当前是否有效；为False时其他字段均为None
+        sub: 令牌所属用户ID
+        username: 用户名
+        client_id: 令牌签发给的客户端ID
+        scope: 令牌授权范围
+        exp: 令牌过期时间（Unix时间戳，秒）
+        iat: 令牌签发时间（Unix时间戳，秒）
+    """
+    active: bool
+    sub: Optional[str] = None
+    username: Optional[str] = None
+    client_id: Optional[str] = None
+    scope: Optional[str] = None
+    exp: Optional[int] = None
+    iat: Optional[int] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'TokenIntrospection':
+        """从自省接口的响应创建，忽略未使用的字段"""
+        if data.get("active") is not True:
+            return cls(active=False)
+        sub = data.get("sub")
+        return cls(
+            active=True,
+            sub=str(sub) if sub is not None else None,
+            username=data.get("username"),
+            client_id=data.get("client_id"),
+            scope=data.get("scope"),
+            exp=_optional_timestamp(data, "exp"),
+            iat=_optional_timestamp(data, "iat"),
+        )
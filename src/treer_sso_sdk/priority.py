@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Treer SSO SDK请求优先级
+
+为交互式请求（如登录回调中的get_user_info_by_code）与后台批量请求划分优先级，
+在HTTP连接池前增加按优先级排队的准入控制：后台请求最多占用一定比例的容量，
+等待中的高优先级请求总是先被放行。
+"""
+
+import contextvars
+import time
+from collections import deque
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Deque, Dict, Iterator, Optional
+
+import anyio
+import httpx
+
+
+class Priority(IntEnum):
+    """请求优先级，数值越小优先级越高"""
+
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+_current_priority: contextvars.ContextVar[Priority] = contextvars.ContextVar(
+    "treer_sso_priority", default=Priority.INTERACTIVE
+)
+
+
+def current_priority() -> Priority:
+    """获取当前上下文的请求优先级"""
+    return _current_priority.get()
+
+
+@contextmanager
+def request_priority(priority: Priority) -> Iterator[None]:
+    """在上下文内为SDK发出的请求设置优先级
+
+    优先级通过contextvars传递，对上下文内创建的任务同样生效
+
+    Example:
+        >>> with request_priority(Priority.BACKGROUND):
+        ...     await client.get_user_info(token)
+    """
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+class AdmissionTimeout(httpx.PoolTimeout):
+    """在本地准入队列中等待超时，请求尚未发往SSO服务，不反映端点的健康状况"""
+
+
+class RequestTiming:
+    """一次请求的计时，准入放行后重新开始计时
+
+    Attributes:
+        started: 开始时间（time.monotonic()），放行后为放行时间
+    """
+
+    __slots__ = ("started",)
+
+    def __init__(self) -> None:
+        self.started = time.monotonic()
+
+    def elapsed(self) -> float:
+        """从开始（或放行）到现在的秒数"""
+        return time.monotonic() - self.started
+
+
+_current_timing: contextvars.ContextVar[Optional[RequestTiming]] = (
+    contextvars.ContextVar("treer_sso_timing", default=None)
+)
+
+
+@contextmanager
+def request_timing() -> Iterator[RequestTiming]:
+    """在上下文内为请求计时，不计入本地准入排队的等待时间
+
+    客户端据此只把SSO端点自身的耗时计入端点统计
+    """
+    timing = RequestTiming()
+    token = _current_timing.set(timing)
+    try:
+        yield timing
+    finally:
+        _current_timing.reset(token)
+
+
+def mark_admitted() -> None:
+    """请求通过准入后调用，当前上下文的计时从此刻重新开始"""
+    timing = _current_timing.get()
+    if timing is not None:
+        timing.started = time.monotonic()
+
+
+class _Waiter:
+    """排队中的请求"""
+
+    __slots__ = ("event", "granted")
+
+    def __init__(self) -> None:
+        self.event = anyio.Event()
+        self.granted = False
+
+
+class PriorityAdmission:
+    """按优先级排队的准入控制
+
+    Args:
+        capacity: 最大同时放行的请求数（通常等于连接池大小）
+        background_share: 后台请求最多可占用的容量比例（0~1）
+    """
+
+    def __init__(self, capacity: int, background_share: float = 0.5) -> None:
+        self.capacity = capacity
+        self.limits: Dict[Priority, int] = {
+            Priority.INTERACTIVE: capacity,
+            Priority.BACKGROUND: max(1, int(capacity * background_share)),
+        }
+        self.in_flight: Dict[Priority, int] = {p: 0 for p in Priority}
+        self._waiters: Dict[Priority, Deque[_Waiter]] = {p: deque() for p in Priority}
+
+    @property
+    def total_in_flight(self) -> int:
+        """当前放行中的请求总数"""
+        return sum(self.in_flight.values())
+
+    def waiting(self, priority: Optional[Priority] = None) -> int:
+        """排队中的请求数
+
+        Args:
+            priority: 仅统计该优先级，为None时统计全部
+        """
+        if priority is not None:
+            return len(self._waiters[priority])
+        return sum(len(q) for q in self._waiters.values())
+
+    def _can_admit(self, priority: Priority) -> bool:
+        return (
+            self.total_in_flight < self.capacity
+            and self.in_flight[priority] < self.limits[priority]
+        )
+
+    def _has_higher_waiters(self, priority: Priority) -> bool:
+        return any(self._waiters[p] for p in Priority if p < priority)
+
+    def try_acquire(self, priority: Priority) -> bool:
+        """不排队地申请放行
+
+        Args:
+            priority: 请求优先级
+
+        Returns:
+            是否放行；存在同级或更高优先级的等待者时不插队
+        """
+        if (
+            not self._waiters[priority]
+            and not self._has_higher_waiters(priority)
+            and self._can_admit(priority)
+        ):
+            self.in_flight[priority] += 1
+            return True
+        return False
+
+    async def acquire(self, priority: Priority) -> None:
+        """申请放行，必要时排队等待
+
+        Args:
+            priority: 请求优先级
+        """
+        if self.try_acquire(priority):
+            return
+
+        waiter = _Waiter()
+        self._waiters[priority].append(waiter)
+        try:
+            await waiter.event.wait()
+        except BaseException:
+            if waiter.granted:
+                # 已被放行但调用方取消，归还名额
+                self.release(priority)
+            else:
+                self._waiters[priority].remove(waiter)
+            raise
+
+    def release(self, priority: Priority) -> None:
+        """归还名额并按优先级唤醒等待者
+
+        Args:
+            priority: 请求优先级
+        """
+        self.in_flight[priority] -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        for priority in Priority:
+            queue = self._waiters[priority]
+            while queue and self._can_admit(priority):
+                waiter = queue.popleft()
+                self.in_flight[priority] += 1
+                waiter.granted = True
+                waiter.event.set()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Treer SSO SDK多租户客户端注册表
+
+多个应用（各自的client_id/client_secret）访问同一SSO服务时，共享一个
+AsyncHTTPClient（连接池、TLS会话、DNS缓存与并发限制），每个租户只持有轻量的
+TreerSSOClient，并有独立的统计和并发上限。
+"""
+
+import dataclasses
+from typing import Any, Dict, Iterator, Optional
+
+import anyio
+import httpx
+
+from . import forksafe
+from .client import TreerSSOClient
+from .config import SSOConfig
+from .endpoints import EndpointSelector
+from .exceptions import SSOConfigError
+from .http_client import AsyncHTTPClient
+from .interfaces import HTTPClientInterface
+from .priority import (
+    AdmissionTimeout,
+    PriorityAdmission,
+    current_priority,
+    mark_admitted,
+)
+
+
+class TenantHTTPClient(HTTPClientInterface):
+    """租户视图的HTTP客户端
+
+    在共享HTTP客户端之前按租户并发上限排队，关闭时不关闭共享连接池
+
+    Args:
+        shared: 共享的HTTP客户端
+        max_in_flight: 该租户的最大在途请求数
+        timeout: 排队等待超时（秒）
+    """
+
+    def __init__(
+        self,
+        shared: HTTPClientInterface,
+        max_in_flight: int,
+        timeout: float,
+    ) -> None:
+        self.shared = shared
+        self.admission = PriorityAdmission(max_in_flight, background_share=1.0)
+        self.timeout = timeout
+        forksafe.register(self)
+
+    def _after_fork(self) -> None:
+        """子进程中重建排队状态"""
+        self.admission = PriorityAdmission(
+            self.admission.capacity, background_share=1.0
+        )
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self._send(self.shared.post, url, **kwargs)
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self._send(self.shared.get, url, **kwargs)
+
+    async def _send(self, send: Any, url: str, **kwargs: Any) -> httpx.Response:
+        priority = current_priority()
+        if not self.admission.try_acquire(priority):
+            try:
+                with anyio.fail_after(self.timeout):
+                    await self.admission.acquire(priority)
+            except TimeoutError:
+                raise AdmissionTimeout("等待租户请求准入超时")
+        mark_admitted()
+        try:
+            response: httpx.Response = await send(url, **kwargs)
+            return response
+        finally:
+            self.admission.release(priority)
+
+    async def close(self) -> None:
+        """共享连接池由注册表关闭"""
+        pass
+
+
+# 由共享的HTTP客户端与端点选择器使用的配置字段，租户无法单独覆盖
+_TRANSPORT_FIELDS = frozenset(
+    {
+        "sso_base_url",
+        "sso_base_urls",
+        "timeout",
+        "verify_ssl",
+        "share_ssl_context",
+        "dns_cache_ttl",
+        "dns_stale_ttl",
+        "max_connections",
+        "adaptive_concurrency",
+        "background_share",
+        "max_response_size",
+    }
+)
+
+
+class SSOClientRegistry:
+    """多租户SSO客户端注册表
+
+    Args:
+        config: 共享配置，决定SSO地址、连接池、超时等传输层参数；
+            其中的client_id/client_secret不会用于租户请求
+        http_client: 共享的HTTP客户端（可选，默认根据config创建AsyncHTTPClient）
+
+    Example:
+        >>> registry = SSOClientRegistry(SSOConfig("shared", "unused"))
+        >>> registry.register("food", "food_client_id", "food_secret", max_in_flight=4)
+        >>> user_info = await registry.get("food").get_user_info_by_code(code)
+        >>> await registry.close()
+    """
+
+    def __init__(
+        self,
+        config: SSOConfig,
+        http_client: Optional[HTTPClientInterface] = None,
+    ) -> None:
+        self.config = config
+        self.http_client = http_client or AsyncHTTPClient(config)
+        self.endpoints = EndpointSelector(config.endpoints)
+        self._tenants: Dict[str, TreerSSOClient] = {}
+
+    def register(
+        self,
+        tenant: str,
+        client_id: str,
+        client_secret: str,
+        max_in_flight: Optional[int] = None,
+        **overrides: Any,
+    ) -> TreerSSOClient:
+        """注册租户
+
+        Args:
+            tenant: 租户名称
+            client_id: 租户的OAuth 2.0客户端ID
+            client_secret: 租户的OAuth 2.0客户端密钥
+            max_in_flight: 租户最大在途请求数，默认等于连接池大小
+            **overrides: 覆盖共享配置中的其他非传输层字段（如缓存相关配置）；
+                SSO地址、超时、连接池、TLS、DNS等传输层字段由所有租户共享，不能覆盖
+
+        Returns:
+            该租户的TreerSSOClient
+
+        Raises:
+            SSOConfigError: 租户已存在、覆盖了传输层字段或配置无效
+        """
+        if tenant in self._tenants:
+            raise SSOConfigError(f"租户已注册: {tenant}")
+        shared = sorted(_TRANSPORT_FIELDS.intersection(overrides))
+        if shared:
+            raise SSOConfigError(
+                f"传输层配置由所有租户共享，不能按租户覆盖: {', '.join(shared)}"
+            )
+        if max_in_flight is not None and max_in_flight <= 0:
+            raise SSOConfigError("max_in_flight必须大于0")
+
+        tenant_config = dataclasses.replace(
+            self.config,
+            client_id=client_id,
+            client_secret=client_secret,
+            **overrides,
+        )
+        tenant_http_client = TenantHTTPClient(
+            self.http_client,
+            max_in_flight or self.config.max_connections,
+            self.config.timeout,
+        )
+        client = TreerSSOClient(tenant_config, http_client=tenant_http_client)
+        # 各租户访问同一组端点，共享端点健康状态
+        client.endpoints = self.endpoints
+        self._tenants[tenant] = client
+        return client
+
+    def get(self, tenant: str) -> TreerSSOClient:
+        """获取租户客户端
+
+        Raises:
+            SSOConfigError: 租户未注册
+        """
+        try:
+            return self._tenants[tenant]
+        except KeyError:
+            raise SSOConfigError(f"租户未注册: {tenant}") from None
+
+    async def unregister(self, tenant: str) -> None:
+        """注销租户并释放其缓存等资源"""
+        client = self._tenants.pop(tenant, None)
+        if client is not None:
+            await client.close()
+
+    def __contains__(self, tenant: object) -> bool:
+        return tenant in self._tenants
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._tenants)
+
+    def __len__(self) -> int:
+        return len(self._tenants)
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """按租户导出统计
+
+        Returns:
+            {租户名称: 统计字典}，统计字典在ClientStats字段之外包含
+            in_flight（在途请求数）和waiting（排队请求数）
+        """
+        result = {}
+        for tenant, client in self._tenants.items():
+            metrics = client.stats.to_dict()
+            http_client = client.http_client
+            if isinstance(http_client, TenantHTTPClient):
+                metrics["in_flight"] = http_client.admission.total_in_flight
+                metrics["waiting"] = http_client.admission.waiting()
+            result[tenant] = metrics
+        return result
+
+    async def close(self) -> None:
+        """关闭全部租户客户端和共享连接池"""
+        for tenant in list(self._tenants):
+            await self.unregister(tenant)
+        await self.http_client.close()
+
+    async def __aenter__(self) -> "SSOClientRegistry":
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        await self.close()
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Treer SSO SDK DNS解析与缓存
+
+为SSO主机提供可插拔的异步解析器、进程内TTL缓存、解析失败时的过期结果兜底，
+以及在多条A/AAAA记录之间的轮询，并通过httpcore网络后端接入httpx传输层。
+"""
+
+import ipaddress
+import logging
+import socket
+import ssl
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    cast,
+)
+
+import anyio
+import httpcore
+import httpx
+
+from .interfaces import ResolverInterface
+from .singleflight import SingleFlight
+
+
+class SystemResolver(ResolverInterface):
+    """基于系统getaddrinfo的解析器
+
+    通过anyio在工作线程中执行getaddrinfo，不阻塞事件循环
+    """
+
+    async def resolve(self, host: str, port: int) -> List[str]:
+        """解析主机名
+
+        Args:
+            host: 主机名
+            port: 端口
+
+        Returns:
+            去重后的IP地址列表，保持系统返回的顺序
+        """
+        infos = await anyio.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        addresses: List[str] = []
+        for _family, _type, _proto, _canonname, sockaddr in infos:
+            address = str(sockaddr[0])
+            if address not in addresses:
+                addresses.append(address)
+        return addresses
+
+
+@dataclass
+class _DNSEntry:
+    """DNS缓存条目"""
+
+    addresses: List[str]
+    expires_at: float
+    stale_until: float
+    cursor: int = 0
+
+
+class CachingResolver(ResolverInterface):
+    """带TTL缓存的解析器
+
+    - 在TTL内直接返回缓存结果，不再访问底层解析器
+    - TTL过期后重新解析；若解析失败且仍在stale_ttl窗口内，返回过期结果
+    - 每次返回的地址列表按轮询方式旋转，使新连接均匀分布到各条记录上
+    - 同一主机的并发解析会合并为一次底层调用
+
+    Args:
+        resolver: 底层解析器，默认为SystemResolver
+        ttl: 缓存有效期（秒）
+        stale_ttl: 过期后仍允许在解析失败时使用的时长（秒）
+        clock: 单调时钟函数，主要用于测试
+    """
+
+    def __init__(
+        self,
+        resolver: Optional[ResolverInterface] = None,
+        ttl: float = 60.0,
+        stale_ttl: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.resolver = resolver or SystemResolver()
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._clock = clock
+        self._cache: Dict[Tuple[str, int], _DNSEntry] = {}
+        # 只合并并发解析，结果由_cache按TTL管理
+        self._pending: SingleFlight[List[str]] = SingleFlight(ttl=0)
+        self.logger = logging.getLogger(__name__)
+
+    async def resolve(self, host: str, port: int) -> List[str]:
+        """解析主机名（带缓存）
+
+        Args:
+            host: 主机名
+            port: 端口
+
+        Returns:
+            按轮询顺序旋转后的IP地址列表
+
+        Raises:
+            OSError: 解析失败且没有可用的过期缓存
+        """
+        key = (host, port)
+        now = self._clock()
+        entry = self._cache.get(key)
+
+        if entry is None or now >= entry.expires_at:
+            entry = await self._refresh(key, entry, now)
+
+        return self._rotate(entry)
+
+    def invalidate(self, host: Optional[str] = None) -> None:
+        """清除缓存
+
+        Args:
+            host: 仅清除该主机的缓存，为None时清除全部
+        """
+        if host is None:
+            self._cache.clear()
+            return
+        for key in [key for key in self._cache if key[0] == host]:
+            del self._cache[key]
+
+    async def _refresh(
+        self,
+        key: Tuple[str, int],
+        entry: Optional[_DNSEntry],
+        now: float,
+    ) -> _DNSEntry:
+        """重新解析并更新缓存，失败时尝试使用过期结果"""
+        try:
+            addresses = await self._resolve_once(key)
+        except OSError as e:
+            if entry is not None and now < entry.stale_until:
+                self.logger.warning("DNS解析失败，使用过期缓存: %s (%s)", key[0], e)
+                return entry
+            raise
+
+        if not addresses:
+            raise socket.gaierror(f"DNS解析无结果: {key[0]}")
+
+        cursor = entry.cursor if entry is not None else 0
+        now = self._clock()
+        entry = _DNSEntry(
+            addresses=addresses,
+            expires_at=now + self.ttl,
+            stale_until=now + self.ttl + self.stale_ttl,
+            cursor=cursor,
+        )
+        self._cache[key] = entry
+        return entry
+
+    async def _resolve_once(self, key: Tuple[str, int]) -> List[str]:
+        """合并同一主机的并发解析请求"""
+        host, port = key
+        return await self._pending.do(
+            f"{host}|{port}", lambda: self.resolver.resolve(host, port)
+        )
+
+    @staticmethod
+    def _rotate(entry: _DNSEntry) -> List[str]:
+        """按轮询顺序旋转地址列表"""
+        addresses = entry.addresses
+        start = entry.cursor % len(addresses)
+        entry.cursor = start + 1
+        return addresses[start:] + addresses[:start]
+
+
+def _is_ip_address(host: str) -> bool:
+    """判断主机是否为IP字面量"""
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return True
+
+
+class ResolvingNetworkBackend(httpcore.AsyncNetworkBackend):
+    """使用自定义解析器建立TCP连接的httpcore网络后端
+
+    连接时先通过解析器获取地址列表，依次尝试直到连接成功。
+    TLS的SNI与证书校验仍使用原始主机名（由httpcore传入server_hostname）。
+
+    Args:
+        resolver: 解析器
+        backend: 实际执行网络I/O的后端，默认为httpcore.AnyIOBackend（基于anyio）
+    """
+
+    def __init__(
+        self,
+        resolver: ResolverInterface,
+        backend: Optional[httpcore.AsyncNetworkBackend] = None,
+    ) -> None:
+        self.resolver = resolver
+        self.backend = backend or httpcore.AnyIOBackend()
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: Optional[float] = None,
+        local_address: Optional[str] = None,
+        socket_options: Optional[Iterable[httpcore.SOCKET_OPTION]] = None,
+    ) -> httpcore.AsyncNetworkStream:
+        if _is_ip_address(host):
+            addresses = [host]
+        else:
+            try:
+                addresses = await self.resolver.resolve(host, port)
+            except OSError as e:
+                raise httpcore.ConnectError(f"DNS解析失败: {host}: {e}") from e
+
+        last_error: Optional[Exception] = None
+        for address in addresses:
+            try:
+                return await self.backend.connect_tcp(
+                    address,
+                    port,
+                    timeout=timeout,
+                    local_address=local_address,
+                    socket_options=socket_options,
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                last_error = e
+
+        assert last_error is not None
+        raise last_error
+
+    async def connect_unix_socket(
+        self,
+        path: str,
+        timeout: Optional[float] = None,
+        socket_options: Optional[Iterable[httpcore.SOCKET_OPTION]] = None,
+    ) -> httpcore.AsyncNetworkStream:
+        return await self.backend.connect_unix_socket(
+            path, timeout=timeout, socket_options=socket_options
+        )
+
+    async def sleep(self, seconds: float) -> None:
+        await self.backend.sleep(seconds)
+
+
+# httpcore异常与同名httpx异常的对应关系（与httpx.AsyncHTTPTransport一致）
+_HTTPCORE_ERRORS: Dict[Type[Exception], Type[httpx.TransportError]] = {
+    getattr(httpcore, name): getattr(httpx, name)
+    for name in (
+        "ConnectTimeout",
+        "ReadTimeout",
+        "WriteTimeout",
+        "PoolTimeout",
+        "TimeoutException",
+        "ConnectError",
+        "ReadError",
+        "WriteError",
+        "NetworkError",
+        "ProxyError",
+        "UnsupportedProtocol",
+        "LocalProtocolError",
+        "RemoteProtocolError",
+        "ProtocolError",
+    )
+}
+
+
+@contextmanager
+def _map_httpcore_errors(request: httpx.Request) -> Iterator[None]:
+    """把httpcore异常转换为对应的httpx异常"""
+    try:
+        yield
+    except Exception as e:
+        for cls in type(e).__mro__:
+            mapped = _HTTPCORE_ERRORS.get(cls)
+            if mapped is not None:
+                raise mapped(str(e), request=request) from e
+        raise
+
+
+class _ResponseStream(httpx.AsyncByteStream):
+    """把httpcore响应流包装为httpx响应流"""
+
+    def __init__(self, stream: AsyncIterable[bytes], request: httpx.Request) -> None:
+        self._stream = stream
+        self._request = request
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        with _map_httpcore_errors(self._request):
+            async for part in self._stream:
+                yield part
+
+    async def aclose(self) -> None:
+        aclose = getattr(self._stream, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+class ResolvingTransport(httpx.AsyncBaseTransport):
+    """通过自定义解析器建立连接的httpx传输层
+
+    httpx.AsyncHTTPTransport不接受网络后端参数，这里直接使用httpcore的公开API
+    创建连接池（httpcore.AsyncConnectionPool(network_backend=...)），
+    请求与响应的转换方式与httpx.AsyncHTTPTransport相同
+
+    Args:
+        resolver: 解析器
+        ssl_context: TLS配置
+        limits: 连接池限制
+    """
+
+    def __init__(
+        self,
+        resolver: ResolverInterface,
+        ssl_context: ssl.SSLContext,
+        limits: httpx.Limits,
+    ) -> None:
+        self._pool = httpcore.AsyncConnectionPool(
+            ssl_context=ssl_context,
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            network_backend=ResolvingNetworkBackend(resolver),
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        assert isinstance(request.stream, httpx.AsyncByteStream)
+        core_request = httpcore.Request(
+            method=request.method,
+            url=httpcore.URL(
+                scheme=request.url.raw_scheme,
+                host=request.url.raw_host,
+                port=request.url.port,
+                target=request.url.raw_path,
+            ),
+            headers=request.headers.raw,
+            content=request.stream,
+            extensions=request.extensions,
+        )
+        with _map_httpcore_errors(request):
+            response = await self._pool.handle_async_request(core_request)
+        return httpx.Response(
+            status_code=response.status,
+            headers=response.headers,
+            stream=_ResponseStream(
+                cast(AsyncIterable[bytes], response.stream), request
+            ),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self._pool.aclose()
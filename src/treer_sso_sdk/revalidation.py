@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Treer SSO SDK会话定期重新验证
+
+应用通常在登录后长期信任本地会话（见session.SessionSigner），用户在SSO中被停用
+或令牌被吊销后仍能继续访问。SessionRevalidator定期用每个会话的访问令牌请求
+/users/me，发现变化时通知应用：
+
+- 会话保存在分层时间轮（timingwheel.TimingWheel）中，数十万个会话只需一个调度任务
+- 每个会话的下次验证时间带随机抖动，避免同一时刻登录的会话同时到期
+- 到期的会话分批验证，每批并发执行，批次之间按目标速率限速；请求使用
+  BACKGROUND优先级，不挤占交互式请求的连接池容量
+- 通过TreerSSOClient.revalidate_user_info发起条件请求，用户信息未变化时服务端返回304
+"""
+
+import logging
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Awaitable, Callable, Deque, Dict, List, Optional
+
+import anyio
+from anyio.abc import TaskStatus
+
+from .client import TreerSSOClient
+from .events import EventLogger
+from .exceptions import SSOConfigError, SSOError, SSOInvalidTokenError
+from .models import UserInfo
+from .priority import Priority, request_priority
+from .timingwheel import TimingWheel
+
+
+class SessionChangeKind(str, Enum):
+    """会话变化类型"""
+
+    CHANGED = "changed"
+    DEACTIVATED = "deactivated"
+    INVALID = "invalid"
+
+
+@dataclass
+class SessionChange:
+    """会话变化事件
+
+    Attributes:
+        session_id: 会话ID
+        kind: 变化类型：用户信息变化（CHANGED）、用户被停用（DEACTIVATED，is_active
+            变为False）或访问令牌无效（INVALID）；后两种情况会话不再被跟踪
+        previous: 上次验证时的用户信息（未知时为None）
+        current: 本次验证得到的用户信息，令牌无效时为None
+    """
+
+    session_id: str
+    kind: SessionChangeKind
+    previous: Optional[UserInfo]
+    current: Optional[UserInfo]
+
+
+class _TrackedSession:
+    """被跟踪的会话"""
+
+    __slots__ = ("session_id", "access_token", "user_info")
+
+    def __init__(
+        self, session_id: str, access_token: str, user_info: Optional[UserInfo]
+    ) -> None:
+        self.session_id = session_id
+        self.access_token = access_token
+        self.user_info = user_info
+
+
+class SessionRevalidator:
+    """会话定期重新验证调度器
+
+    Args:
+        client: SSO客户端
+        on_change: 会话变化时调用的协程函数，异常只记录不中断调度
+        interval: 每个会话的验证间隔（秒），默认300
+        jitter: 验证间隔的随机抖动比例（0~1），默认0.1即±10%
+        rate: 每秒最多验证的会话数，默认50
+        batch_size: 每批并发验证的会话数，默认20
+        tick: 时间轮精度（秒），默认1
+        clock: 时间函数，主要用于测试
+        rng: 返回[0, 1)随机数的函数，主要用于测试
+
+    条件请求使用的ETag保存在客户端的用户信息缓存中（LRU，容量为
+    SSOConfig.user_info_cache_size，默认10000），与客户端的其他请求共享。
+    跟踪的会话数超过缓存容量时，条目在下次验证前就被淘汰，请求不再带
+    If-None-Match，每次都下载完整响应而不是304。跟踪大量会话时应按会话数
+    调大user_info_cache_size，或为重新验证单独创建一个客户端
+
+    Example:
+        >>> revalidator = SessionRevalidator(client, on_change=handle_change)
+        >>> revalidator.track(session_id, token_response.access_token, user_info)
+        >>> async with anyio.create_task_group() as tg:
+        ...     await tg.start(revalidator.run)
+    """
+
+    def __init__(
+        self,
+        client: TreerSSOClient,
+        on_change: Optional[Callable[[SessionChange], Awaitable[None]]] = None,
+        interval: float = 300.0,
+        jitter: float = 0.1,
+        rate: float = 50.0,
+        batch_size: int = 20,
+        tick: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        if interval <= 0:
+            raise SSOConfigError("interval必须大于0")
+        if not 0 <= jitter < 1:
+            raise SSOConfigError("jitter必须在0到1之间")
+        if rate <= 0:
+            raise SSOConfigError("rate必须大于0")
+        if batch_size < 1:
+            raise SSOConfigError("batch_size不能小于1")
+        self.client = client
+        self.on_change = on_change
+        self.interval = interval
+        self.jitter = jitter
+        self.rate = rate
+        self.batch_size = batch_size
+        self._clock = clock
+        self._rng = rng
+        self._wheel: TimingWheel[_TrackedSession] = TimingWheel(
+            tick=tick, start=clock()
+        )
+        self._sessions: Dict[str, _TrackedSession] = {}
+        self._pending: Deque[_TrackedSession] = deque()
+        self.logger = logging.getLogger(__name__)
+        self.events = EventLogger(__name__)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    def track(
+        self,
+        session_id: str,
+        access_token: str,
+        user_info: Optional[UserInfo] = None,
+        delay: Optional[float] = None,
+    ) -> None:
+        """开始跟踪会话，已跟踪的会话ID会被替换
+
+        Args:
+            session_id: 会话ID
+            access_token: 会话对应的访问令牌
+            user_info: 登录时得到的用户信息，用于判断之后是否变化
+            delay: 首次验证的延迟（秒），默认为带抖动的验证间隔
+        """
+        self.untrack(session_id)
+        session = _TrackedSession(session_id, access_token, user_info)
+        self._sessions[session_id] = session
+        self._schedule(session, delay)
+
+    def untrack(self, session_id: str) -> bool:
+        """停止跟踪会话（如用户登出）
+
+        Returns:
+            会话是否被跟踪
+        """
+        if self._sessions.pop(session_id, None) is None:
+            return False
+        self._wheel.cancel(session_id)
+        return True
+
+    async def run(
+        self, *, task_status: TaskStatus[None] = anyio.TASK_STATUS_IGNORED
+    ) -> None:
+        """持续验证到期的会话，直到被取消"""
+        task_status.started()
+        while True:
+            await self.revalidate_due()
+            await anyio.sleep(self._wheel.tick)
+
+    async def revalidate_due(self) -> int:
+        """验证所有已到期的会话
+
+        Returns:
+            验证的会话数
+        """
+        self._pending.extend(self._wheel.advance(self._clock()))
+        total = 0
+        while self._pending:
+            batch: List[_TrackedSession] = []
+            while self._pending and len(batch) < self.batch_size:
+                session = self._pending.popleft()
+                # 排队期间被取消跟踪或替换的会话不再验证
+                if self._is_tracked(session):
+                    batch.append(session)
+            if not batch:
+                break
+
+            started = anyio.current_time()
+            async with anyio.create_task_group() as tg:
+                for session in batch:
+                    tg.start_soon(self._revalidate, session)
+            total += len(batch)
+            elapsed = anyio.current_time() - started
+            if self.events.enabled():
+                self.events.emit(
+                    "sso.session.revalidate_batch",
+                    size=len(batch),
+                    queued=len(self._pending),
+                    duration_ms=round(elapsed * 1000, 2),
+                )
+            # 按目标速率限速，批次之间到期的会话加入队列
+            await anyio.sleep(max(0.0, len(batch) / self.rate - elapsed))
+            self._pending.extend(self._wheel.advance(self._clock()))
+        return total
+
+    def _schedule(
+        self, session: _TrackedSession, delay: Optional[float] = None
+    ) -> None:
+        if delay is None:
+            delay = self.interval * (1 + self.jitter * (2 * self._rng() - 1))
+        self._wheel.schedule(session.session_id, session, self._clock() + delay)
+
+    def _is_tracked(self, session: _TrackedSession) -> bool:
+        return self._sessions.get(session.session_id) is session
+
+    async def _revalidate(self, session: _TrackedSession) -> None:
+        try:
+            with request_priority(Priority.BACKGROUND):
+                user_info = await self.client.revalidate_user_info(session.access_token)
+        except SSOInvalidTokenError:
+            if self._is_tracked(session):
+                del self._sessions[session.session_id]
+                await self._notify(
+                    SessionChange(
+                        session.session_id,
+                        SessionChangeKind.INVALID,
+                        session.user_info,
+                        None,
+                    )
+                )
+            return
+        except SSOError as e:
+            if self.events.enabled(logging.WARNING):
+                self.events.emit(
+                    "sso.session.revalidate_failed", logging.WARNING, error=str(e)
+                )
+            if self._is_tracked(session):
+                self._schedule(session)
+            return
+        except Exception:
+            # 批次任务组中的异常会中断整个调度，只记录不抛出
+            self.logger.exception("重新验证会话失败")
+            if self._is_tracked(session):
+                self._schedule(session)
+            return
+
+        if not self._is_tracked(session):
+            return
+        previous, session.user_info = session.user_info, user_info
+        if not user_info.is_active:
+            del self._sessions[session.session_id]
+            await self._notify(
+                SessionChange(
+                    session.session_id,
+                    SessionChangeKind.DEACTIVATED,
+                    previous,
+                    user_info,
+                )
+            )
+            return
+        self._schedule(session)
+        if previous is not None and previous.to_dict() != user_info.to_dict():
+            await self._notify(
+                SessionChange(
+                    session.session_id, SessionChangeKind.CHANGED, previous, user_info
+                )
+            )
+
+    async def _notify(self, change: SessionChange) -> None:
+        if self.events.enabled(logging.INFO):
+            self.events.emit(
+                "sso.session.changed", logging.INFO, kind=change.kind.value
+            )
+        if self.on_change is None:
+            return
+        try:
+            await self.on_change(change)
+        except Exception:
+            self.logger.exception("会话变化回调失败")
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Treer SSO SDK授权范围解析与匹配
+
+scope字符串只解析一次：相同字符串复用同一个frozenset（scope名称经过intern），
+授权检查变为集合运算。路由上的权限要求可预先编译为ScopeRequirement；
+scope名称固定时还可以注册ScopeVocabulary，把检查进一步变为整数位运算。
+"""
+
+import sys
+from functools import lru_cache
+from typing import AbstractSet, Dict, FrozenSet, Iterable, Union
+
+from .compiled import mypyc_attr
+from .exceptions import SSOConfigError
+
+Scopes = Union[None, str, AbstractSet[str]]
+
+
+@lru_cache(maxsize=1024)
+def _parse(scope: str) -> FrozenSet[str]:
+    return frozenset(sys.intern(name) for name in scope.split())
+
+
+def parse_scopes(scope: Scopes) -> FrozenSet[str]:
+    """把scope字符串解析为frozenset
+
+    Args:
+        scope: 空格分隔的scope字符串，或已解析的集合；None视为空
+
+    Returns:
+        scope集合，相同字符串返回同一个对象
+    """
+    if type(scope) is frozenset:
+        return scope
+    if scope is None:
+        return frozenset()
+    if isinstance(scope, str):
+        return _parse(scope)
+    return frozenset(scope)
+
+
+def _names(scopes: Union[str, Iterable[str]]) -> FrozenSet[str]:
+    if isinstance(scopes, str):
+        return parse_scopes(scopes)
+    return frozenset(scopes)
+
+
+@mypyc_attr(allow_interpreted_subclasses=True)
+class ScopeRequirement:
+    """预编译的授权范围要求
+
+    Args:
+        all_of: 必须全部具备的scope（字符串或可迭代对象）
+        any_of: 至少具备其一的scope，为空时不检查
+
+    Example:
+        >>> can_order = ScopeRequirement(all_of="orders:read orders:write")
+        >>> can_order.matches(token_response.scopes)
+        True
+    """
+
+    __slots__ = ("all_of", "any_of")
+
+    def __init__(
+        self,
+        all_of: Union[str, Iterable[str]] = (),
+        any_of: Union[str, Iterable[str]] = (),
+    ) -> None:
+        self.all_of = _names(all_of)
+        self.any_of = _names(any_of)
+
+    def matches(self, scopes: Scopes) -> bool:
+        """判断授权范围是否满足要求"""
+        granted = parse_scopes(scopes)
+        if not self.all_of <= granted:
+            return False
+        return not self.any_of or not self.any_of.isdisjoint(granted)
+
+    def __call__(self, scopes: Scopes) -> bool:
+        return self.matches(scopes)
+
+    def __repr__(self) -> str:
+        return (
+            f"ScopeRequirement(all_of={sorted(self.all_of)}, "
+            f"any_of={sorted(self.any_of)})"
+        )
+
+
+@mypyc_attr(allow_interpreted_subclasses=True)
+class ScopeVocabulary:
+    """已注册的scope词表，按位编码授权范围
+
+    词表之外的scope在编码时被忽略；要求中出现未注册的scope视为配置错误
+
+    Args:
+        names: scope名称，按顺序分配位
+
+    Example:
+        >>> vocabulary = ScopeVocabulary(["profile", "orders:read", "orders:write"])
+        >>> can_order = vocabulary.requirement(all_of="orders:read orders:write")
+        >>> can_order.matches(vocabulary.mask(token_response.scope))
+        True
+    """
+
+    def __init__(self, names: Iterable[str]) -> None:
+        self._bits: Dict[str, int] = {}
+        for name in names:
+            if name not in self._bits:
+                self._bits[sys.intern(name)] = 1 << len(self._bits)
+        self._mask_cache: Dict[FrozenSet[str], int] = {}
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._bits
+
+    def __len__(self) -> int:
+        return len(self._bits)
+
+    def mask(self, scopes: Scopes) -> int:
+        """把授权范围编码为位掩码（结果按scope集合缓存）"""
+        granted = parse_scopes(scopes)
+        mask = self._mask_cache.get(granted)
+        if mask is None:
+            mask = 0
+            for name in granted:
+                mask |= self._bits.get(name, 0)
+            if len(self._mask_cache) < 1024:
+                self._mask_cache[granted] = mask
+        return mask
+
+    def requirement(
+        self,
+        all_of: Union[str, Iterable[str]] = (),
+        any_of: Union[str, Iterable[str]] = (),
+    ) -> "MaskRequirement":
+        """预编译位掩码形式的授权范围要求
+
+        Raises:
+            SSOConfigError: 要求中包含未注册的scope
+        """
+        return MaskRequirement(self._strict_mask(all_of), self._strict_mask(any_of))
+
+    def _strict_mask(self, scopes: Union[str, Iterable[str]]) -> int:
+        mask = 0
+        for name in _names(scopes):
+            bit = self._bits.get(name)
+            if bit is None:
+                raise SSOConfigError(f"未注册的scope: {name}")
+            mask |= bit
+        return mask
+
+
+@mypyc_attr(allow_interpreted_subclasses=True)
+class MaskRequirement:
+    """位掩码形式的授权范围要求，由ScopeVocabulary.requirement创建"""
+
+    __slots__ = ("all_mask", "any_mask")
+
+    def __init__(self, all_mask: int, any_mask: int = 0) -> None:
+        self.all_mask = all_mask
+        self.any_mask = any_mask
+
+    def matches(self, mask: int) -> bool:
+        """判断位掩码是否满足要求"""
+        if mask & self.all_mask != self.all_mask:
+            return False
+        return not self.any_mask or bool(mask & self.any_mask)
+
+    def __call__(self, mask: int) -> bool:
+        return self.matches(mask)
+
+
+def has_scope(scopes: Scopes, name: str) -> bool:
+    """是否具备指定scope"""
+    return name in parse_scopes(scopes)
+
+
+def has_all(scopes: Scopes, names: Union[str, Iterable[str]]) -> bool:
+    """是否具备全部指定scope"""
+    return _names(names) <= parse_scopes(scopes)
+
+
+def has_any(scopes: Scopes, names: Union[str, Iterable[str]]) -> bool:
+    """是否具备任一指定scope"""
+    return not _names(names).isdisjoint(parse_scopes(scopes))
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Treer SSO SDK本地会话令牌
+
+授权码换取用户信息后，把用户的核心字段与过期时间签名为紧凑的会话令牌
+（适合放入Cookie）。之后的请求只需本地做一次HMAC校验即可得到用户信息，
+不访问网络也不查询缓存。
+
+令牌格式: v1.<密钥ID>.<载荷>.<签名>，载荷为紧凑JSON的base64url编码，
+签名为HMAC-SHA256。签名总是使用当前密钥，校验时接受所有已配置的密钥，
+轮换时先添加新密钥并设为当前密钥，待旧令牌全部过期后再移除旧密钥。
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import time
+from typing import Any, Callable, Dict, Mapping, Optional
+
+from .exceptions import SSOConfigError, SSOInvalidTokenError
+from .models import UserInfo, UserProfile
+
+_VERSION = "v1"
+_MIN_KEY_LENGTH = 32
+
+# 浏览器对单个Cookie（名称+值）的限制约为4096字节
+MAX_COOKIE_SIZE = 4096
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+class SessionSigner:
+    """会话令牌签发与校验
+
+    Args:
+        keys: {密钥ID: 密钥}，每个密钥至少32字节；密钥ID会出现在令牌中，
+            不能包含"."
+        active_key_id: 用于签发的密钥ID，默认为keys中的第一个
+        ttl: 会话有效期（秒），默认3600
+        max_size: 令牌最大长度（字节），超出时签发失败，默认4096
+        clock: 时间函数，主要用于测试
+
+    Example:
+        >>> signer = SessionSigner({"2024-06": new_key, "2024-01": old_key})
+        >>> token = signer.sign(user_info)
+        >>> user_info = signer.verify(token)
+    """
+
+    def __init__(
+        self,
+        keys: Mapping[str, bytes],
+        active_key_id: Optional[str] = None,
+        ttl: float = 3600.0,
+        max_size: int = MAX_COOKIE_SIZE,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if not keys:
+            raise SSOConfigError("会话密钥不能为空")
+        for key_id, key in keys.items():
+            if not key_id or "." in key_id:
+                raise SSOConfigError(f"会话密钥ID无效: {key_id!r}")
+            if len(key) < _MIN_KEY_LENGTH:
+                raise SSOConfigError(f"会话密钥长度不能小于{_MIN_KEY_LENGTH}字节")
+        if active_key_id is None:
+            active_key_id = next(iter(keys))
+        if active_key_id not in keys:
+            raise SSOConfigError(f"未知的会话密钥ID: {active_key_id}")
+        if ttl <= 0:
+            raise SSOConfigError("ttl必须大于0")
+        if max_size <= 0:
+            raise SSOConfigError("max_size必须大于0")
+
+        self.keys: Dict[str, bytes] = dict(keys)
+        self.active_key_id = active_key_id
+        self.ttl = ttl
+        self.max_size = max_size
+        self._clock = clock
+
+    def sign(self, user_info: UserInfo, ttl: Optional[float] = None) -> str:
+        """签发会话令牌
+
+        Args:
+            user_info: 用户信息，只保存id、username、email、phone、is_active与姓名
+            ttl: 本次令牌的有效期（秒），默认使用签名器的ttl，不会超过它
+
+        Returns:
+            会话令牌
+
+        Raises:
+            SSOConfigError: 令牌长度超过max_size
+        """
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        claims = self._encode_claims(user_info)
+        claims["x"] = int(self._clock() + ttl)
+        payload = _b64encode(
+            json.dumps(claims, separators=(",", ":"), ensure_ascii=False).encode(
+                "utf-8"
+            )
+        )
+        signing_input = f"{_VERSION}.{self.active_key_id}.{payload}"
+        signature = self._signature(self.keys[self.active_key_id], signing_input)
+        token = f"{signing_input}.{signature}"
+        if len(token) > self.max_size:
+            raise SSOConfigError(f"会话令牌长度{len(token)}超过上限{self.max_size}字节")
+        return token
+
+    def verify(self, token: str) -> UserInfo:
+        """校验会话令牌
+
+        Args:
+            token: 会话令牌
+
+        Returns:
+            令牌中保存的用户信息
+
+        Raises:
+            SSOInvalidTokenError: 格式错误、签名无效、密钥未知或已过期
+        """
+        if len(token) > self.max_size:
+            raise SSOInvalidTokenError("会话令牌过长", "invalid_session")
+        # 合法令牌只包含ASCII字符；非ASCII输入会使签名计算与比较抛出其他异常
+        if not token.isascii():
+            raise SSOInvalidTokenError("会话令牌格式错误", "invalid_session")
+        parts = token.split(".")
+        if len(parts) != 4 or parts[0] != _VERSION:
+            raise SSOInvalidTokenError("会话令牌格式错误", "invalid_session")
+        _, key_id, payload, signature = parts
+
+        key = self.keys.get(key_id)
+        if key is None:
+            raise SSOInvalidTokenError("会话令牌密钥未知", "invalid_session")
+        expected = self._signature(key, f"{_VERSION}.{key_id}.{payload}")
+        if not hmac.compare_digest(expected, signature):
+            raise SSOInvalidTokenError("会话令牌签名无效", "invalid_session")
+
+        try:
+            claims = json.loads(_b64decode(payload))
+            expires_at = claims["x"]
+            user_info = self._decode_claims(claims)
+        except (ValueError, KeyError, TypeError):
+            raise SSOInvalidTokenError("会话令牌载荷无效", "invalid_session") from None
+        if expires_at <= self._clock():
+            raise SSOInvalidTokenError("会话已过期", "session_expired")
+        return user_info
+
+    @staticmethod
+    def _signature(key: bytes, signing_input: str) -> str:
+        digest = hmac.new(key, signing_input.encode("ascii"), hashlib.sha256).digest()
+        return _b64encode(digest)
+
+    @staticmethod
+    def _encode_claims(user_info: UserInfo) -> Dict[str, Any]:
+        """用单字母键压缩用户字段，省略空值与默认值"""
+        claims: Dict[str, Any] = {"i": user_info.id, "u": user_info.username}
+        if user_info.email:
+            claims["e"] = user_info.email
+        if user_info.phone:
+            claims["p"] = user_info.phone
+        if not user_info.is_active:
+            claims["a"] = 0
+        if user_info.profile is not None:
+            if user_info.profile.first_name:
+                claims["f"] = user_info.profile.first_name
+            if user_info.profile.last_name:
+                claims["l"] = user_info.profile.last_name
+        return claims
+
+    @staticmethod
+    def _decode_claims(claims: Dict[str, Any]) -> UserInfo:
+        profile = None
+        if "f" in claims or "l" in claims:
+            profile = UserProfile(first_name=claims.get("f"), last_name=claims.get("l"))
+        return UserInfo(
+            id=str(claims["i"]),
+            username=claims["u"],
+            email=claims.get("e"),
+            phone=claims.get("p"),
+            is_active=bool(claims.get("a", 1)),
+            profile=profile,
+        )
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Treer SSO SDK请求去重
+
+合并相同键的并发调用，并在短时间窗口内复用成功结果。
+用于授权码换取令牌：浏览器重复提交OAuth回调时，重复请求直接得到同一个
+TokenResponse，而不会因授权码已被使用而失败。
+"""
+
+import functools
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Generic, Optional, Tuple, TypeVar
+
+import anyio
+
+from . import forksafe
+from .concurrency import run_shielded
+
+T = TypeVar("T")
+
+# 默认最多保留的成功结果数，超出后淘汰最早的结果
+DEFAULT_MAX_ENTRIES = 10000
+
+
+class _Flight(Generic[T]):
+    """一次进行中的调用"""
+
+    __slots__ = ("finished", "completed", "result", "error")
+
+    def __init__(self) -> None:
+        self.finished = anyio.Event()
+        self.completed = False
+        self.result: Optional[T] = None
+        self.error: Optional[Exception] = None
+
+
+class SingleFlight(Generic[T]):
+    """单飞（single-flight）调用合并器
+
+    Args:
+        ttl: 成功结果的复用时长（秒），0表示只合并并发调用
+        max_entries: 最多保留的结果数
+    """
+
+    def __init__(
+        self, ttl: float = 10.0, max_entries: int = DEFAULT_MAX_ENTRIES
+    ) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._in_flight: Dict[str, _Flight[T]] = {}
+        self._results: "OrderedDict[str, Tuple[float, T]]" = OrderedDict()
+        forksafe.register(self)
+
+    def _after_fork(self) -> None:
+        """子进程中丢弃父进程的进行中任务，保留已完成的结果"""
+        self._in_flight = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """执行调用，相同键的调用共享同一结果
+
+        调用不随发起者取消（见concurrency.run_shielded），单个调用方被取消
+        不会影响其他等待者
+
+        Args:
+            key: 去重键
+            fn: 实际执行调用的协程函数
+
+        Returns:
+            调用结果
+        """
+        while True:
+            now = time.monotonic()
+            cached = self._results.get(key)
+            if cached is not None:
+                if cached[0] > now:
+                    return cached[1]
+                del self._results[key]
+
+            flight = self._in_flight.get(key)
+            if flight is None:
+                flight = self._in_flight[key] = _Flight()
+                await run_shielded(functools.partial(self._run, key, flight, fn))
+            else:
+                await flight.finished.wait()
+            if flight.error is not None:
+                raise flight.error
+            if flight.completed:
+                return flight.result  # type: ignore[return-value]
+            # 调用本身被取消（如事件循环关闭）而没有结果，重新发起
+
+    async def _run(
+        self, key: str, flight: _Flight[T], fn: Callable[[], Awaitable[T]]
+    ) -> None:
+        try:
+            flight.result = await fn()
+            flight.completed = True
+        except Exception as e:
+            flight.error = e
+        finally:
+            if self._in_flight.get(key) is flight:
+                del self._in_flight[key]
+            flight.finished.set()
+        if flight.completed and self.ttl > 0:
+            self._store(key, flight.result)  # type: ignore[arg-type]
+
+    def _store(self, key: str, result: T) -> None:
+        now = time.monotonic()
+        self._results[key] = (now + self.ttl, result)
+        self._results.move_to_end(key)
+        # 结果按写入顺序排列，先清理过期条目，再按数量上限淘汰
+        while self._results:
+            oldest_key, (expires_at, _) = next(iter(self._results.items()))
+            if expires_at > now and len(self._results) <= self.max_entries:
+                break
+            del self._results[oldest_key]
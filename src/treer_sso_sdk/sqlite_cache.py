@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Treer SSO SDK持久化用户信息缓存
+
+基于SQLite（WAL模式）保存用户信息与令牌元数据，进程重启后可直接复用，
+避免滚动发布时新实例集中请求/users/me。
+"""
+
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import forksafe
+from .cache import MemoryUserInfoCache
+from .interfaces import UserInfoCacheInterface
+from .models import CachedUserInfo, UserInfo
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS user_info_cache (
+        key TEXT PRIMARY KEY,
+        payload TEXT NOT NULL,
+        expires_at REAL NOT NULL,
+        fetched_at REAL NOT NULL,
+        etag TEXT,
+        last_modified TEXT,
+        body_size INTEGER NOT NULL DEFAULT 0,
+        token_expires_at REAL,
+        scope TEXT
+    )
+    """,
+    # prune()按这两列删除过期条目
+    "CREATE INDEX IF NOT EXISTS user_info_cache_fetched_at "
+    "ON user_info_cache (fetched_at)",
+    "CREATE INDEX IF NOT EXISTS user_info_cache_token_expires_at "
+    "ON user_info_cache (token_expires_at)",
+)
+
+_COLUMNS = (
+    "payload, expires_at, fetched_at, etag, last_modified, body_size, "
+    "token_expires_at, scope"
+)
+
+_PRUNE = (
+    "DELETE FROM user_info_cache WHERE fetched_at < ? "
+    "OR (token_expires_at IS NOT NULL AND token_expires_at < ?)"
+)
+
+# 写入线程中的写操作：(缓存键, 序号, SQL, 参数)，缓存键为None时不跟踪
+_Write = Tuple[Optional[str], int, str, Tuple[Any, ...]]
+
+
+class SQLiteUserInfoCache(UserInfoCacheInterface):
+    """SQLite持久化用户信息缓存
+
+    - 键为访问令牌的SHA-256摘要，数据库中不保存令牌原文
+    - 打开时不加载任何数据，按需读取单行并放入进程内LRU，启动开销与缓存规模无关
+    - 写入与清理由专用线程执行（WAL模式，多个进程可共享同一文件），
+      等待文件锁不会阻塞事件循环；尚未写入的条目在内存中可见
+    - 读取使用只读连接且不等待锁，遇到锁冲突时按未命中处理
+    - 数据库文件包含用户个人信息，新建时权限为0600
+    - 打开时在后台清理超过max_age或令牌已过期的旧条目，读取时同样忽略这些条目
+
+    Args:
+        path: 数据库文件路径
+        max_entries: 进程内LRU的最大条目数
+        max_age: 条目最后一次验证后保留的最长时间（秒），默认7天
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 10000,
+        max_age: float = 7 * 24 * 3600,
+    ) -> None:
+        self.path = path
+        self.max_age = max_age
+        self._memory = MemoryUserInfoCache(max_entries)
+        self.logger = logging.getLogger(__name__)
+
+        self._create()
+        self._inherited: List[sqlite3.Connection] = []
+        self._db = self._connect_reader()
+        self._init_writer()
+        now = time.time()
+        self._submit(None, _PRUNE, (now - self.max_age, now))
+        forksafe.register(self)
+
+    def _create(self) -> None:
+        """创建数据库文件（权限0600）、表与索引，并启用WAL模式"""
+        try:
+            fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+        except FileExistsError:
+            pass
+        else:
+            os.close(fd)
+        with closing(self._connect()) as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            for statement in _SCHEMA:
+                db.execute(statement)
+
+    def _connect(self) -> sqlite3.Connection:
+        """写入连接，只在写入线程中使用，可以等待文件锁"""
+        db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute("PRAGMA busy_timeout=5000")
+        return db
+
+    def _connect_reader(self) -> sqlite3.Connection:
+        """读取连接，在调用方线程（通常是事件循环）中使用，从不等待锁"""
+        db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        db.execute("PRAGMA query_only=ON")
+        db.execute("PRAGMA busy_timeout=0")
+        return db
+
+    def _init_writer(self) -> None:
+        self._queue: "queue.Queue[Optional[_Write]]" = queue.Queue()
+        self._pending: Dict[str, Tuple[int, Optional[CachedUserInfo]]] = {}
+        self._lock = threading.Lock()
+        self._sequence = 0
+        self._writer: Optional[threading.Thread] = None
+
+    def _after_fork(self) -> None:
+        """子进程中重新打开数据库连接并重建写入线程
+
+        SQLite连接不能跨fork使用；继承的连接保留引用而不关闭，
+        避免在子进程中释放父进程持有的文件锁。进程内LRU保留；
+        父进程尚未写入的条目由父进程写入，子进程中仍然可见
+        """
+        pending = self._pending
+        self._inherited.append(self._db)
+        self._db = self._connect_reader()
+        self._init_writer()
+        self._pending = dict(pending)
+
+    def get(self, key: str) -> Optional[CachedUserInfo]:
+        entry = self._memory.get(key)
+        if entry is not None:
+            return entry
+        with self._lock:
+            pending = self._pending.get(key)
+        if pending is not None:
+            return pending[1]
+
+        now = time.time()
+        try:
+            row = self._db.execute(
+                f"SELECT {_COLUMNS} FROM user_info_cache WHERE key = ? "
+                "AND fetched_at >= ? "
+                "AND (token_expires_at IS NULL OR token_expires_at >= ?)",
+                (key, now - self.max_age, now),
+            ).fetchone()
+        except sqlite3.OperationalError as e:
+            # 数据库被锁定时不等待，按未命中处理
+            self.logger.debug("读取持久化缓存失败: %s", e)
+            return None
+        if row is None:
+            return None
+
+        try:
+            entry = self._decode(row)
+        except (ValueError, KeyError) as e:
+            self.logger.warning("持久化缓存条目损坏，已删除: %s", e)
+            self.delete(key)
+            return None
+        self._memory.set(key, entry)
+        return entry
+
+    def set(self, key: str, entry: CachedUserInfo) -> None:
+        self._memory.set(key, entry)
+        self._submit(
+            key,
+            f"INSERT OR REPLACE INTO user_info_cache (key, {_COLUMNS}) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, *self._encode(entry)),
+            entry,
+        )
+
+    def delete(self, key: str) -> None:
+        self._memory.delete(key)
+        self._submit(key, "DELETE FROM user_info_cache WHERE key = ?", (key,))
+
+    def prune(self) -> int:
+        """删除超过max_age或令牌已过期的条目
+
+        在调用方线程中执行并可能等待文件锁，不要在事件循环中直接调用
+
+        Returns:
+            删除的条目数
+        """
+        now = time.time()
+        with closing(self._connect()) as db:
+            cursor = db.execute(_PRUNE, (now - self.max_age, now))
+            return cursor.rowcount
+
+    def flush(self) -> None:
+        """等待已提交的写入完成"""
+        self._queue.join()
+
+    def close(self) -> None:
+        """写入尚未完成的条目并关闭数据库连接"""
+        writer = self._writer
+        if writer is not None:
+            self._queue.put(None)
+            writer.join()
+            self._writer = None
+        self._db.close()
+
+    def _submit(
+        self,
+        key: Optional[str],
+        sql: str,
+        params: Tuple[Any, ...],
+        entry: Optional[CachedUserInfo] = None,
+    ) -> None:
+        """提交写操作到写入线程，写入前对get可见"""
+        with self._lock:
+            self._sequence += 1
+            if key is not None:
+                self._pending[key] = (self._sequence, entry)
+            self._queue.put((key, self._sequence, sql, params))
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._write_loop,
+                    args=(self._queue,),
+                    name="treer-sso-sqlite-cache",
+                    daemon=True,
+                )
+                self._writer.start()
+
+    def _write_loop(self, writes: "queue.Queue[Optional[_Write]]") -> None:
+        with closing(self._connect()) as db:
+            while True:
+                write = writes.get()
+                if write is None:
+                    writes.task_done()
+                    return
+                key, sequence, sql, params = write
+                try:
+                    db.execute(sql, params)
+                except sqlite3.Error as e:
+                    self.logger.warning("写入持久化缓存失败: %s", e)
+                finally:
+                    if key is not None:
+                        with self._lock:
+                            pending = self._pending.get(key)
+                            if pending is not None and pending[0] == sequence:
+                                del self._pending[key]
+                    writes.task_done()
+
+    @staticmethod
+    def _encode(entry: CachedUserInfo) -> Tuple[Any, ...]:
+        return (
+            json.dumps(entry.user_info.to_dict(), ensure_ascii=False),
+            entry.expires_at,
+            entry.fetched_at,
+            entry.etag,
+            entry.last_modified,
+            entry.body_size,
+            entry.token_expires_at,
+            entry.scope,
+        )
+
+    @staticmethod
+    def _decode(row: Tuple[Any, ...]) -> CachedUserInfo:
+        (
+            payload,
+            expires_at,
+            fetched_at,
+            etag,
+            last_modified,
+            body_size,
+            token_expires_at,
+            scope,
+        ) = row
+        return CachedUserInfo(
+            user_info=UserInfo.from_dict(json.loads(payload)),
+            expires_at=expires_at,
+            etag=etag,
+            last_modified=last_modified,
+            body_size=body_size,
+            fetched_at=fetched_at,
+            token_expires_at=token_expires_at,
+            scope=scope,
+        )
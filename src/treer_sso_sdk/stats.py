@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Treer SSO SDK客户端统计
+"""
+
+from dataclasses import asdict, dataclass
+from typing import Any, Dict
+
+import httpx
+
+# 响应体被提前读取并重新构造时，原始响应从网络读取的字节数保存在该扩展中
+BYTES_DOWNLOADED_EXTENSION = "treer_sso.bytes_downloaded"
+
+
+@dataclass
+class ClientStats:
+    """TreerSSOClient运行统计
+
+    Attributes:
+        requests: 发往SSO服务的请求数
+        user_info_cache_hits: 用户信息缓存在新鲜期内命中的次数
+        introspection_cache_hits: 令牌自省缓存命中的次数
+        stale_served: 返回过期缓存结果的次数
+        not_modified: 条件请求得到304的次数
+        bytes_received: 实际接收的响应体字节数（压缩后）
+        bytes_decoded: 解压后的响应体字节数
+        bytes_saved_compression: 响应压缩节省的字节数
+        bytes_saved_not_modified: 304响应避免重新下载的字节数
+    """
+
+    requests: int = 0
+    user_info_cache_hits: int = 0
+    introspection_cache_hits: int = 0
+    stale_served: int = 0
+    not_modified: int = 0
+    bytes_received: int = 0
+    bytes_decoded: int = 0
+    bytes_saved_compression: int = 0
+    bytes_saved_not_modified: int = 0
+
+    @property
+    def bytes_saved(self) -> int:
+        """节省的总字节数"""
+        return self.bytes_saved_compression + self.bytes_saved_not_modified
+
+    def record_response(self, response: httpx.Response) -> None:
+        """记录一次已读取完毕的响应
+
+        Args:
+            response: HTTP响应对象
+        """
+        self.requests += 1
+        decoded = len(response.content)
+        # 未经过网络读取的响应（如测试中直接构造的响应）没有原始字节数
+        received = (
+            response.extensions.get(BYTES_DOWNLOADED_EXTENSION)
+            or response.num_bytes_downloaded
+            or decoded
+        )
+        self.bytes_received += received
+        self.bytes_decoded += decoded
+        if decoded > received:
+            self.bytes_saved_compression += decoded - received
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典，便于导出到监控系统"""
+        result = asdict(self)
+        result["bytes_saved"] = self.bytes_saved
+        return result
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Treer SSO SDK预编译请求模板
+
+每个SSOConfig对应一组模板，在创建客户端时预先编码请求中不变的部分：
+令牌接口表单中的grant_type/client_id/client_secret、自省接口的客户端认证头、
+各端点的完整URL以及固定请求头。每次请求只需拼接授权码或访问令牌，httpx无需再编码表单字典；
+URL的解析结果由AsyncHTTPClient缓存。
+"""
+
+import base64
+from typing import ClassVar, Dict, Optional, Tuple
+from urllib.parse import quote_plus, urlencode
+
+from .compiled import mypyc_attr
+from .config import SSOConfig
+from .endpoints import Endpoint
+
+TOKEN_PATH = "/api/v1/oauth/token"
+USER_INFO_PATH = "/api/v1/users/me"
+INTROSPECT_PATH = "/api/v1/oauth/introspect"
+
+
+@mypyc_attr(allow_interpreted_subclasses=True)
+class RequestTemplates:
+    """SSO请求模板
+
+    Args:
+        config: SSO配置对象
+    """
+
+    # 固定请求头，调用方不应修改
+    TOKEN_HEADERS: ClassVar[Dict[str, str]] = {
+        "Content-Type": "application/x-www-form-urlencoded"
+    }
+
+    def __init__(self, config: SSOConfig) -> None:
+        self._token_form_prefix = urlencode(
+            {
+                "grant_type": "authorization_code",
+                "client_id": config.client_id,
+                "client_secret": config.client_secret,
+            }
+        ).encode("ascii")
+        # RFC 7662的客户端认证：HTTP Basic，凭据按RFC 6749 2.3.1先做表单编码
+        credentials = (
+            f"{quote_plus(config.client_id)}:{quote_plus(config.client_secret)}"
+        )
+        self.introspect_headers: Dict[str, str] = {
+            "Content-Type": "application/x-www-form-urlencoded",
+            "Authorization": "Basic "
+            + base64.b64encode(credentials.encode("utf-8")).decode("ascii"),
+        }
+        self._urls: Dict[Tuple[str, str], str] = {}
+
+    def url(self, endpoint: Endpoint, path: str) -> str:
+        """获取端点上接口的完整URL（按端点与路径缓存）"""
+        key = (endpoint.base_url, path)
+        url = self._urls.get(key)
+        if url is None:
+            url = self._urls[key] = endpoint.url(path)
+        return url
+
+    def token_form(self, authorization_code: str, redirect_uri: Optional[str]) -> bytes:
+        """编码授权码换取令牌的表单请求体"""
+        body = b"".join(
+            (
+                self._token_form_prefix,
+                b"&code=",
+                quote_plus(authorization_code).encode("ascii"),
+            )
+        )
+        if redirect_uri:
+            body += b"&redirect_uri=" + quote_plus(redirect_uri).encode("ascii")
+        return body
+
+    @staticmethod
+    def introspection_form(token: str, token_type_hint: Optional[str]) -> bytes:
+        """编码令牌自省的表单请求体"""
+        body = b"token=" + quote_plus(token).encode("ascii")
+        if token_type_hint:
+            body += b"&token_type_hint=" + quote_plus(token_type_hint).encode("ascii")
+        return body
+
+    @staticmethod
+    def user_info_headers(access_token: str) -> Dict[str, str]:
+        """用户信息接口的请求头（每次返回新字典，可追加条件请求头）"""
+        return {"Authorization": "Bearer " + access_token}
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Treer SSO SDK分层时间轮
+
+用于调度大量周期性任务（如数十万个会话的重新验证）：添加、取消与到期都是O(1)
+（均摊），不为每个条目创建定时器或任务。
+
+第0层有slots个槽，每槽tick秒；第k层每槽覆盖slots^k个tick。条目按到期时间放入
+能容纳它的最低一层，上层的槽转到时把条目重新放入下层（级联），最终在第0层到期。
+超出最高层范围的条目先放在最高层最远的槽中，级联时按实际到期时间重新放置。
+"""
+
+import math
+from typing import Dict, Generic, Hashable, List, Tuple, TypeVar
+
+from .exceptions import SSOConfigError
+
+T = TypeVar("T")
+
+
+class TimingWheel(Generic[T]):
+    """分层时间轮
+
+    Args:
+        tick: 时间精度（秒），条目最多晚tick秒到期
+        slots: 每层的槽数
+        levels: 层数，可调度的最远时间为tick * slots^levels秒（默认约194天）
+        start: 起始时间，与advance()使用同一时钟
+
+    Example:
+        >>> wheel = TimingWheel(tick=1.0, start=time.monotonic())
+        >>> wheel.schedule("session-1", session, time.monotonic() + 300)
+        >>> for session in wheel.advance(time.monotonic()):
+        ...     ...
+    """
+
+    def __init__(
+        self, tick: float = 1.0, slots: int = 64, levels: int = 4, start: float = 0.0
+    ) -> None:
+        if tick <= 0:
+            raise SSOConfigError("tick必须大于0")
+        if slots < 2:
+            raise SSOConfigError("slots不能小于2")
+        if levels < 1:
+            raise SSOConfigError("levels不能小于1")
+        self.tick = tick
+        self.slots = slots
+        self.levels = levels
+        self._origin = start
+        self._current = 0
+        self._spans = [slots**level for level in range(levels + 1)]
+        # 每个槽是{键: (到期tick, 条目)}，便于按键取消
+        self._wheels: List[List[Dict[Hashable, Tuple[int, T]]]] = [
+            [{} for _ in range(slots)] for _ in range(levels)
+        ]
+        self._positions: Dict[Hashable, Tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._positions
+
+    def schedule(self, key: Hashable, item: T, deadline: float) -> None:
+        """在deadline到期时返回item，相同键已存在时替换
+
+        Args:
+            key: 条目键
+            item: 到期时由advance()返回的对象
+            deadline: 到期时间，早于当前时间时在下一个tick到期
+        """
+        self.cancel(key)
+        due = math.ceil((deadline - self._origin) / self.tick)
+        self._place(key, item, max(due, self._current + 1))
+
+    def cancel(self, key: Hashable) -> bool:
+        """取消条目
+
+        Returns:
+            条目是否存在
+        """
+        position = self._positions.pop(key, None)
+        if position is None:
+            return False
+        level, slot = position
+        del self._wheels[level][slot][key]
+        return True
+
+    def advance(self, now: float) -> List[T]:
+        """把时间轮推进到now，返回期间到期的条目（按到期顺序）"""
+        target = math.floor((now - self._origin) / self.tick)
+        expired: List[T] = []
+        while self._current < target:
+            if not self._positions:
+                self._current = target
+                break
+            self._current += 1
+            tick = self._current
+            # 先级联高层，条目逐层下移，到期的条目最终落入第0层当前槽
+            for level in range(self.levels - 1, 0, -1):
+                if tick % self._spans[level] == 0:
+                    self._cascade(level, (tick // self._spans[level]) % self.slots)
+            bucket = self._wheels[0][tick % self.slots]
+            if bucket:
+                self._wheels[0][tick % self.slots] = {}
+                for key, (due, item) in bucket.items():
+                    if due > tick:
+                        # 只有一层时超出范围的条目停在第0层，转满一圈后重新放置
+                        self._place(key, item, due)
+                        continue
+                    del self._positions[key]
+                    expired.append(item)
+        return expired
+
+    def _cascade(self, level: int, slot: int) -> None:
+        bucket = self._wheels[level][slot]
+        if not bucket:
+            return
+        self._wheels[level][slot] = {}
+        for key, (due, item) in bucket.items():
+            self._place(key, item, due)
+
+    def _place(self, key: Hashable, item: T, due: int) -> None:
+        delta = due - self._current
+        for level in range(self.levels):
+            if delta < self._spans[level + 1]:
+                break
+        else:
+            # 超出范围：放在最高层最远的槽，级联时再按实际到期时间放置
+            level = self.levels - 1
+            slot = (
+                (self._current + self._spans[self.levels] - 1) // self._spans[level]
+            ) % self.slots
+            self._wheels[level][slot][key] = (due, item)
+            self._positions[key] = (level, slot)
+            return
+        slot = (due // self._spans[level]) % self.slots
+        self._wheels[level][slot][key] = (due, item)
+        self._positions[key] = (level, slot)
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Treer SSO SDK TLS配置共享
+
+加载CA证书包需要数毫秒CPU并占用可观内存。这里按证书校验设置在进程内缓存
+SSLContext，所有AsyncHTTPClient共用；同时按服务器主机名缓存TLS会话，
+新连接（包括其他客户端实例建立的连接）可以恢复会话，省去完整握手。
+"""
+
+import os
+import ssl
+import threading
+from typing import Any, Dict, Optional, Tuple, Union
+
+import certifi
+
+
+class _ResumingSSLObject(ssl.SSLObject):
+    """握手完成或收到会话票据后，把会话交给SSLContext缓存
+
+    TLS 1.2的会话在握手完成时可用；TLS 1.3的会话票据在握手之后到达，
+    由握手后的第一次成功读取处理。只在这两个时刻检查一次会话，
+    服务端不签发票据时后续读取没有额外开销
+    """
+
+    _session_checked = False
+
+    def do_handshake(self) -> None:
+        super().do_handshake()
+        self._session_checked = self._save_session()
+
+    def read(self, len: int = 1024, buffer: Any = None) -> Any:
+        data = super().read(len, buffer)
+        if not self._session_checked:
+            self._session_checked = True
+            self._save_session()
+        return data
+
+    def _save_session(self) -> bool:
+        """保存带票据的会话，返回是否已保存"""
+        context = self.context
+        session = self.session
+        if (
+            isinstance(context, SessionCachingSSLContext)
+            and session is not None
+            and session.has_ticket
+            and self.server_hostname
+        ):
+            context.store_session(self.server_hostname, session)
+            return True
+        return False
+
+
+class SessionCachingSSLContext(ssl.SSLContext):
+    """按服务器主机名缓存并复用TLS会话的客户端SSLContext
+
+    httpcore的各网络后端通过wrap_bio建立TLS连接，这里在未显式指定会话时
+    自动带上同一主机名最近的会话。注意anyio会在线程中调用非标准SSLContext的
+    wrap_bio，每个新连接多一次线程切换，开销远小于一次完整握手
+    """
+
+    sslobject_class = _ResumingSSLObject
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self._sessions: Dict[str, ssl.SSLSession] = {}
+        self._sessions_lock = threading.Lock()
+
+    def store_session(self, server_hostname: str, session: ssl.SSLSession) -> None:
+        """保存主机名对应的TLS会话"""
+        with self._sessions_lock:
+            self._sessions[server_hostname] = session
+
+    def get_session(self, server_hostname: str) -> Optional[ssl.SSLSession]:
+        """获取主机名对应的TLS会话"""
+        with self._sessions_lock:
+            return self._sessions.get(server_hostname)
+
+    def wrap_bio(
+        self,
+        incoming: ssl.MemoryBIO,
+        outgoing: ssl.MemoryBIO,
+        server_side: bool = False,
+        server_hostname: Optional[Union[str, bytes]] = None,
+        session: Optional[ssl.SSLSession] = None,
+    ) -> ssl.SSLObject:
+        if session is None and not server_side and server_hostname:
+            # anyio传入IDNA编码后的bytes，SSLObject.server_hostname为str
+            if isinstance(server_hostname, bytes):
+                hostname = server_hostname.decode("ascii")
+            else:
+                hostname = server_hostname
+            session = self.get_session(hostname)
+        return super().wrap_bio(
+            incoming,
+            outgoing,
+            server_side=server_side,
+            server_hostname=server_hostname,
+            session=session,
+        )
+
+
+_contexts: Dict[Tuple[Any, ...], ssl.SSLContext] = {}
+_contexts_lock = threading.Lock()
+
+
+def _create_ssl_context(verify: bool) -> ssl.SSLContext:
+    """创建客户端SSLContext，证书来源与httpx默认行为一致"""
+    ctx = SessionCachingSSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    if verify:
+        if os.environ.get("SSL_CERT_FILE"):
+            ctx.load_verify_locations(cafile=os.environ["SSL_CERT_FILE"])
+        elif os.environ.get("SSL_CERT_DIR"):
+            ctx.load_verify_locations(capath=os.environ["SSL_CERT_DIR"])
+        else:
+            ctx.load_verify_locations(cafile=certifi.where())
+    else:
+        ctx.check_hostname = False
+        ctx.verify_mode = ssl.CERT_NONE
+    return ctx
+
+
+def get_ssl_context(verify: bool = True) -> ssl.SSLContext:
+    """获取进程内共享的SSLContext
+
+    Args:
+        verify: 是否验证服务器证书
+
+    Returns:
+        按校验设置（及SSL_CERT_FILE/SSL_CERT_DIR环境变量）缓存的SSLContext
+    """
+    key = (
+        verify,
+        os.environ.get("SSL_CERT_FILE"),
+        os.environ.get("SSL_CERT_DIR"),
+    )
+    ctx = _contexts.get(key)
+    if ctx is None:
+        with _contexts_lock:
+            ctx = _contexts.get(key)
+            if ctx is None:
+                ctx = _create_ssl_context(verify)
+                _contexts[key] = ctx
+    return ctx
+
+
+def clear_ssl_context_cache() -> None:
+    """清空共享的SSLContext（例如CA证书文件更新之后）"""
+    with _contexts_lock:
+        _contexts.clear()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试ASGI中间件
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from treer_sso_sdk import SSOConfig, SSOConfigError, SSOMiddleware, TreerSSOClient
+from treer_sso_sdk.asgi import get_sso_context
+from treer_sso_sdk.http_client import AsyncHTTPClient
+
+
+class UserServer:
+    """记录/users/me调用次数的模拟SSO服务"""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        if request.headers["Authorization"] != "Bearer good":
+            return httpx.Response(401, json={"message": "令牌无效"})
+        return httpx.Response(200, json={"id": 1, "username": "alice"})
+
+
+async def app(scope, receive, send):
+    """同一请求内并发获取两次当前用户的下游应用"""
+    context = get_sso_context(scope)
+    if scope["path"] == "/optional":
+        user = await context.user()
+        body = b"anonymous" if user is None else user.username.encode()
+    else:
+        users = await asyncio.gather(context.require_user(), context.require_user())
+        body = ",".join(user.username for user in users).encode()
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": body})
+
+
+@pytest.fixture
+def server():
+    return UserServer()
+
+
+@pytest.fixture
+def sso_client(server):
+    config = SSOConfig(client_id="id", client_secret="secret")
+    http_client = AsyncHTTPClient(config, transport=httpx.MockTransport(server))
+    return TreerSSOClient(config, http_client=http_client)
+
+
+def make_http_client(middleware) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=middleware), base_url="http://app"
+    )
+
+
+class TestSSOMiddleware:
+    """SSOMiddleware测试类"""
+
+    async def test_user_resolved_once_per_request(self, sso_client, server):
+        """测试同一请求内多次获取用户只请求一次SSO"""
+        async with make_http_client(SSOMiddleware(app, client=sso_client)) as http:
+            response = await http.get("/", headers={"Authorization": "Bearer good"})
+        assert response.status_code == 200
+        assert response.text == "alice,alice"
+        assert server.calls == 1
+
+    async def test_missing_and_invalid_token(self, sso_client, server):
+        """测试缺少令牌与令牌无效时返回401"""
+        async with make_http_client(SSOMiddleware(app, client=sso_client)) as http:
+            optional = await http.get("/optional")
+            missing = await http.get("/")
+            invalid = await http.get("/", headers={"Authorization": "Bearer bad"})
+
+        assert optional.text == "anonymous"
+        assert missing.status_code == 401
+        assert invalid.status_code == 401
+        assert invalid.headers["www-authenticate"] == 'Bearer error="invalid_token"'
+        assert json.loads(invalid.text)["error_description"] == "令牌无效"
+        # 同一请求内两次require_user，失败结果也只请求一次
+        assert server.calls == 1
+
+    async def test_lifespan_closes_owned_client(self):
+        """测试lifespan关闭时关闭中间件创建的客户端"""
+        middleware = SSOMiddleware(app, config=SSOConfig("id", "secret"))
+        closed = []
+
+        async def close():
+            closed.append(True)
+
+        middleware.client.close = close
+
+        async def lifespan_app(scope, receive, send):
+            while True:
+                message = await receive()
+                await send({"type": message["type"] + ".complete"})
+                if message["type"] == "lifespan.shutdown":
+                    return
+
+        middleware.app = lifespan_app
+        messages = iter([{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}])
+        sent = []
+
+        async def receive():
+            return next(messages)
+
+        async def send(message):
+            sent.append(message["type"])
+
+        await middleware({"type": "lifespan"}, receive, send)
+        assert sent == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+        assert closed == [True]
+
+    def test_requires_config_or_client(self, sso_client):
+        """测试config与client必须且只能提供一个"""
+        with pytest.raises(SSOConfigError):
+            SSOMiddleware(app)
+        with pytest.raises(SSOConfigError):
+            SSOMiddleware(app, config=SSOConfig("id", "secret"), client=sso_client)
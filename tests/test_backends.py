@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试asyncio、uvloop与trio后端
+
+使用anyio的pytest插件，每个用例分别在三种后端上运行；未安装uvloop或trio时跳过对应后端。
+"""
+
+import importlib.util
+import time
+from typing import List
+
+import anyio
+import httpx
+import pytest
+
+from treer_sso_sdk import SSOConfig, TreerSSOClient
+from treer_sso_sdk.asgi import SSORequestContext
+from treer_sso_sdk.http_client import AsyncHTTPClient
+from treer_sso_sdk.priority import Priority, PriorityAdmission
+from treer_sso_sdk.resolver import CachingResolver
+from treer_sso_sdk.singleflight import SingleFlight
+
+USER_JSON = {"id": 1, "username": "alice", "email": "alice@example.com"}
+
+
+def _backend(name, options=None, module=None):
+    marks = []
+    if module is not None and importlib.util.find_spec(module) is None:
+        marks.append(pytest.mark.skip(reason=f"未安装{module}"))
+    value = (name, options) if options else name
+    return pytest.param(value, id=module or name, marks=marks)
+
+
+@pytest.fixture(
+    params=[
+        _backend("asyncio"),
+        _backend("asyncio", {"use_uvloop": True}, module="uvloop"),
+        _backend("trio", module="trio"),
+    ]
+)
+def anyio_backend(request):
+    return request.param
+
+
+pytestmark = pytest.mark.anyio
+
+
+class SSOServer:
+    """模拟SSO服务，每个请求延迟一段时间"""
+
+    def __init__(self, delay: float = 0.01) -> None:
+        self.delay = delay
+        self.requests: List[str] = []
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request.url.path)
+        await anyio.sleep(self.delay)
+        if request.url.path.endswith("/oauth/token"):
+            code = httpx.QueryParams(request.content.decode())["code"]
+            return httpx.Response(
+                200, json={"access_token": f"token-{code}", "expires_in": 3600}
+            )
+        return httpx.Response(200, json=USER_JSON, headers={"ETag": '"v1"'})
+
+
+def make_client(server: SSOServer, **options) -> TreerSSOClient:
+    config = SSOConfig(client_id="id", client_secret="secret", **options)
+    http_client = AsyncHTTPClient(config, transport=httpx.MockTransport(server))
+    return TreerSSOClient(config, http_client=http_client)
+
+
+class TestBackends:
+    """多后端测试类"""
+
+    async def test_user_info_by_code(self):
+        """测试完整登录流程"""
+        server = SSOServer()
+        async with make_client(server) as client:
+            user_info = await client.get_user_info_by_code("code-1")
+        assert user_info.username == "alice"
+
+    async def test_concurrent_code_exchange_merged(self):
+        """测试并发重复的授权码只发送一次请求"""
+        server = SSOServer()
+        results = []
+        async with make_client(server) as client:
+            async with anyio.create_task_group() as tg:
+                for _ in range(5):
+
+                    async def exchange() -> None:
+                        results.append(await client.get_access_token("code-1"))
+
+                    tg.start_soon(exchange)
+        assert {r.access_token for r in results} == {"token-code-1"}
+        assert server.requests.count("/api/v1/oauth/token") == 1
+
+    async def test_single_flight_survives_leader_cancel(self):
+        """测试发起者被取消时其他等待者仍得到结果"""
+        flight: SingleFlight[str] = SingleFlight(ttl=0)
+        results = []
+
+        async def fetch() -> str:
+            await anyio.sleep(0.05)
+            return "value"
+
+        async def follower() -> None:
+            await anyio.sleep(0.01)
+            results.append(await flight.do("key", fetch))
+
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(follower)
+            with anyio.move_on_after(0.02):
+                await flight.do("key", fetch)
+        assert results == ["value"]
+
+    async def test_priority_admission(self):
+        """测试排队、唤醒与取消归还"""
+        admission = PriorityAdmission(1)
+        order = []
+
+        async def worker(priority: Priority, name: str) -> None:
+            await admission.acquire(priority)
+            order.append(name)
+            await anyio.sleep(0.01)
+            admission.release(priority)
+
+        await admission.acquire(Priority.INTERACTIVE)
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(worker, Priority.BACKGROUND, "background")
+            await anyio.sleep(0.01)
+            tg.start_soon(worker, Priority.INTERACTIVE, "interactive")
+            await anyio.sleep(0.01)
+            with anyio.move_on_after(0.01):
+                await admission.acquire(Priority.INTERACTIVE)
+            admission.release(Priority.INTERACTIVE)
+        assert order == ["interactive", "background"]
+        assert admission.total_in_flight == 0
+        assert admission.waiting() == 0
+
+    async def test_admission_timeout(self):
+        """测试排队超时转换为PoolTimeout"""
+        server = SSOServer(delay=0.2)
+        config = SSOConfig(
+            client_id="id", client_secret="secret", timeout=0.05, max_connections=1
+        )
+        http_client = AsyncHTTPClient(config, transport=httpx.MockTransport(server))
+        errors = []
+
+        async def fetch() -> None:
+            try:
+                await http_client.get("https://sso.example.com/api/v1/users/me")
+            except httpx.PoolTimeout as e:
+                errors.append(e)
+
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(fetch)
+            tg.start_soon(fetch)
+        assert len(errors) == 1
+        await http_client.close()
+
+    async def test_resolver_merges_concurrent_lookups(self):
+        """测试并发解析合并为一次"""
+        calls = []
+
+        class SlowResolver:
+            async def resolve(self, host: str, port: int) -> List[str]:
+                calls.append(host)
+                await anyio.sleep(0.01)
+                return ["10.0.0.1"]
+
+        resolver = CachingResolver(SlowResolver())
+        results = []
+
+        async def lookup() -> None:
+            results.append(await resolver.resolve("sso.example.com", 443))
+
+        async with anyio.create_task_group() as tg:
+            for _ in range(3):
+                tg.start_soon(lookup)
+        assert calls == ["sso.example.com"]
+        assert results == [["10.0.0.1"]] * 3
+
+    async def test_system_resolver(self):
+        """测试系统解析器"""
+        resolver = CachingResolver()
+        assert "127.0.0.1" in await resolver.resolve("127.0.0.1", 80)
+
+    async def test_stale_while_revalidate_in_context(self):
+        """测试async with内在后台刷新过期缓存"""
+        server = SSOServer()
+        async with make_client(
+            server, user_info_cache_ttl=60, user_info_stale_while_revalidate=300
+        ) as client:
+            await client.get_user_info("token")
+            for entry in client.user_info_cache._entries.values():
+                entry.expires_at = time.time() - 1
+
+            result = await client.get_user_info_result("token")
+            assert result.stale
+            while client._revalidating:
+                await anyio.sleep(0.005)
+            assert not (await client.get_user_info_result("token")).stale
+        assert len(server.requests) == 2
+
+    async def test_close_inside_context(self):
+        """测试在async with内调用close()不会取消调用方"""
+        server = SSOServer()
+        reached = False
+        async with make_client(server) as client:
+            await client.get_user_info("token")
+            await client.close()
+            await anyio.sleep(0.01)
+            reached = True
+        assert reached
+        assert client._task_group is None
+
+    async def test_cross_task_enter_exit(self):
+        """测试在一个任务中进入上下文、在另一个任务中退出"""
+        server = SSOServer()
+        client = make_client(
+            server, user_info_cache_ttl=60, user_info_stale_while_revalidate=300
+        )
+
+        async def enter(*, task_status=anyio.TASK_STATUS_IGNORED) -> None:
+            await client.__aenter__()
+            task_status.started()
+
+        async with anyio.create_task_group() as tg:
+            await tg.start(enter)
+
+        await client.get_user_info("token")
+        for entry in client.user_info_cache._entries.values():
+            entry.expires_at = time.time() - 1
+        assert (await client.get_user_info_result("token")).stale
+        while client._revalidating:
+            await anyio.sleep(0.005)
+        assert len(server.requests) == 2
+
+        async def leave() -> None:
+            await client.__aexit__(None, None, None)
+
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(leave)
+        assert client._task_group is None
+
+    async def test_request_context_shares_lookup(self):
+        """测试请求上下文的并发解析只请求一次"""
+        server = SSOServer()
+        async with make_client(server) as client:
+            context = SSORequestContext(client, "token")
+            users = []
+
+            async def lookup() -> None:
+                users.append(await context.user())
+
+            async with anyio.create_task_group() as tg:
+                for _ in range(3):
+                    tg.start_soon(lookup)
+        assert len(users) == 3
+        assert len(server.requests) == 1
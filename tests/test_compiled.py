@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试可选编译构建的运行时辅助函数
+"""
+
+from treer_sso_sdk import SSOInvalidTokenError, UserInfo
+from treer_sso_sdk.compiled import is_compiled, mypyc_attr
+
+
+class TestCompiled:
+    """编译构建测试类"""
+
+    def test_is_compiled_matches_models_module(self):
+        """测试编译检测与模型模块的实际类型一致"""
+        from treer_sso_sdk import models
+
+        assert is_compiled() is not models.__file__.endswith(".py")
+
+    def test_mypyc_attr_keeps_class(self):
+        """测试未编译时mypyc_attr不修改类"""
+
+        class Plain:
+            pass
+
+        assert mypyc_attr(native_class=False)(Plain) is Plain
+
+    def test_public_classes_stay_python_classes(self):
+        """测试公开类可以被继承（编译版本同样适用）"""
+
+        class CustomError(SSOInvalidTokenError):
+            pass
+
+        error = CustomError("无效的访问令牌", "invalid_token")
+        assert isinstance(error, SSOInvalidTokenError)
+        assert str(error) == "[invalid_token] 无效的访问令牌"
+
+        class CustomUser(UserInfo):
+            pass
+
+        user = CustomUser.from_dict({"id": 1, "username": "alice"})
+        assert isinstance(user, CustomUser)
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试多端点选择与故障转移
+"""
+
+import random
+from typing import List
+
+import anyio
+import httpx
+
+from treer_sso_sdk import SSOConfig, SSONetworkError, TreerSSOClient
+from treer_sso_sdk.endpoints import EndpointSelector
+from treer_sso_sdk.http_client import AsyncHTTPClient
+from treer_sso_sdk.interfaces import HTTPClientInterface
+
+
+class FakeClock:
+    """可手动推进的时钟"""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeHTTPClient(HTTPClientInterface):
+    """按主机返回结果的假HTTP客户端"""
+
+    def __init__(self, down: List[str]) -> None:
+        self.down = down
+        self.urls: List[str] = []
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.get(url, **kwargs)
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        self.urls.append(url)
+        request = httpx.Request("GET", url)
+        if any(url.startswith(host) for host in self.down):
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(200, json={"id": 1, "username": "alice"}, request=request)
+
+    async def close(self) -> None:
+        pass
+
+
+class TestEndpointSelector:
+    """EndpointSelector测试类"""
+
+    def test_prefers_lower_latency(self):
+        """测试二选一时选择延迟较低的端点"""
+        selector = EndpointSelector(["https://a", "https://b"], rng=random.Random(0))
+        fast, slow = selector.endpoints
+        selector.observe(fast, 0.01, True)
+        selector.observe(slow, 0.5, True)
+
+        picks = [selector.select() for _ in range(20)]
+        assert all(pick is fast for pick in picks)
+
+    def test_eject_and_readmit(self):
+        """测试连续失败摘除与到期恢复"""
+        clock = FakeClock()
+        selector = EndpointSelector(
+            ["https://a", "https://b"],
+            failure_threshold=2,
+            base_ejection_time=10,
+            clock=clock,
+        )
+        bad, good = selector.endpoints
+        selector.observe(bad, 0.1, False)
+        assert bad in selector.healthy()
+        selector.observe(bad, 0.1, False)
+        assert selector.healthy() == [good]
+        assert selector.select() is good
+
+        clock.now = 11
+        assert bad in selector.healthy()
+
+        # 恢复后一次失败即再次摘除，且时长翻倍
+        selector.observe(bad, 0.1, False)
+        assert bad.ejected_until == 31
+
+    def test_all_ejected_picks_earliest(self):
+        """测试全部摘除时选择最早恢复的端点"""
+        clock = FakeClock()
+        selector = EndpointSelector(
+            ["https://a", "https://b"], failure_threshold=1, clock=clock
+        )
+        a, b = selector.endpoints
+        selector.observe(b, 0.1, False)
+        clock.now = 1
+        selector.observe(a, 0.1, False)
+        assert selector.select() is b
+
+
+class TestClientFailover:
+    """TreerSSOClient端点故障转移测试类"""
+
+    async def test_failover_on_connect_error(self):
+        """测试连接失败时切换到其他端点"""
+        config = SSOConfig(
+            client_id="id",
+            client_secret="secret",
+            sso_base_url="https://eu.example.com",
+            sso_base_urls=["https://ru.example.com/"],
+        )
+        http_client = FakeHTTPClient(down=["https://eu.example.com"])
+        client = TreerSSOClient(config, http_client=http_client)
+        client.endpoints.failure_threshold = 1
+
+        for _ in range(5):
+            user_info = await client.get_user_info("token")
+            assert user_info.username == "alice"
+
+        assert http_client.urls[-1] == "https://ru.example.com/api/v1/users/me"
+        assert len(client.endpoints.healthy()) == 1
+
+    async def test_local_queue_not_blamed_on_endpoints(self):
+        """测试本地准入排队的耗时与超时不计入端点统计"""
+        config = SSOConfig(
+            client_id="id",
+            client_secret="secret",
+            sso_base_url="https://eu.example.com",
+            sso_base_urls=["https://ru.example.com/"],
+            max_connections=1,
+            timeout=0.1,
+        )
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            await anyio.sleep(0.02)
+            return httpx.Response(200, json={"id": 1, "username": "alice"})
+
+        http_client = AsyncHTTPClient(config, transport=httpx.MockTransport(handler))
+        client = TreerSSOClient(config, http_client=http_client)
+        errors = []
+
+        async def lookup(token: str) -> None:
+            try:
+                await client.get_user_info(token)
+            except SSONetworkError as e:
+                errors.append(e)
+
+        async with anyio.create_task_group() as tg:
+            for i in range(10):
+                tg.start_soon(lookup, f"token-{i}")
+
+        # 排队超时的请求失败，但端点本身没有出错
+        assert errors
+        assert len(client.endpoints.healthy()) == 2
+        for endpoint in client.endpoints.endpoints:
+            assert endpoint.consecutive_failures == 0
+            assert endpoint.latency is None or endpoint.latency < 0.05
+        await client.close()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试结构化事件日志
+"""
+
+import logging
+
+import httpx
+import pytest
+
+from treer_sso_sdk import SSOConfig, SSOConfigError, TreerSSOClient
+from treer_sso_sdk.cache import token_cache_key
+from treer_sso_sdk.events import EventLogger
+from treer_sso_sdk.http_client import AsyncHTTPClient
+
+
+class TestEventLogger:
+    """EventLogger测试类"""
+
+    def test_disabled_level(self, caplog):
+        """测试级别未开启时不记录"""
+        caplog.set_level(logging.INFO, logger="test.events")
+        events = EventLogger("test.events")
+        assert not events.enabled()
+        assert events.enabled(logging.WARNING)
+
+    def test_structured_record(self, caplog):
+        """测试记录包含事件名与字段"""
+        caplog.set_level(logging.DEBUG, logger="test.events")
+        events = EventLogger("test.events")
+        assert events.enabled()
+        events.emit("sso.request", status=200, duration_ms=1.5)
+        record = caplog.records[-1]
+        assert record.sso_event == "sso.request"
+        assert record.sso_fields == {"status": 200, "duration_ms": 1.5}
+        assert record.getMessage() == "sso.request status=200 duration_ms=1.5"
+
+    def test_sampling(self, caplog):
+        """测试DEBUG事件按采样率记录，WARNING不采样"""
+        caplog.set_level(logging.DEBUG, logger="test.events")
+        values = iter([0.05, 0.5, 0.09, 0.95])
+        events = EventLogger("test.events", sample_rate=0.1, rng=lambda: next(values))
+        assert [events.enabled() for _ in range(4)] == [True, False, True, False]
+        assert events.enabled(logging.WARNING)
+
+    def test_invalid_sample_rate(self):
+        """测试采样率配置校验"""
+        with pytest.raises(SSOConfigError):
+            SSOConfig("id", "secret", log_sample_rate=1.5)
+
+
+class TestClientEvents:
+    """客户端事件测试类"""
+
+    async def test_request_event(self, caplog):
+        """测试用户信息请求事件包含端点、状态、耗时与令牌摘要"""
+        caplog.set_level(logging.DEBUG, logger="treer_sso_sdk.client")
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json={"id": 1, "username": "alice"})
+
+        config = SSOConfig("id", "secret", "https://sso.example.com")
+        http_client = AsyncHTTPClient(config, transport=httpx.MockTransport(handler))
+        async with TreerSSOClient(config, http_client=http_client) as client:
+            await client.get_user_info("secret-token")
+
+        [record] = [r for r in caplog.records if r.sso_event == "sso.request"]
+        fields = record.sso_fields
+        assert fields["endpoint"] == "https://sso.example.com"
+        assert fields["path"] == "/api/v1/users/me"
+        assert fields["status"] == 200
+        assert fields["duration_ms"] >= 0
+        assert fields["token_id"] == token_cache_key("secret-token")[:12]
+        assert "secret-token" not in record.getMessage()
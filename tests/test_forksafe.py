@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试fork后的资源重建
+"""
+
+import os
+
+import pytest
+
+from treer_sso_sdk import SQLiteUserInfoCache, SSOConfig, TreerSSOClient
+from treer_sso_sdk.http_client import AsyncHTTPClient
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(os, "register_at_fork"), reason="当前平台不支持fork"
+)
+
+
+def run_in_child(check) -> int:
+    """在fork出的子进程中执行检查，返回子进程退出码"""
+    pid = os.fork()
+    if pid == 0:
+        try:
+            ok = check()
+        except BaseException:
+            ok = False
+        os._exit(0 if ok else 1)
+    _, status = os.waitpid(pid, 0)
+    return os.waitstatus_to_exitcode(status)
+
+
+class TestForkSafety:
+    """fork安全测试类"""
+
+    def test_http_client_rebuilds_pool_in_child(self):
+        """测试子进程丢弃继承的连接池，父进程不受影响"""
+        config = SSOConfig("id", "secret", "https://sso.example.com")
+        http_client = AsyncHTTPClient(config)
+        parent_pool = http_client.client
+        resolver = http_client.resolver
+
+        def check() -> bool:
+            return (
+                http_client._client is None
+                and http_client.client is not parent_pool
+                and http_client.resolver is resolver
+            )
+
+        assert run_in_child(check) == 0
+        assert http_client._client is parent_pool
+
+    def test_client_keeps_config_and_cache(self):
+        """测试子进程保留配置与用户信息缓存，清空后台任务与端点在途计数"""
+        config = SSOConfig("id", "secret", "https://sso.example.com")
+        client = TreerSSOClient(config)
+        cache = client.user_info_cache
+        client._revalidating.add("key")
+        endpoint = client.endpoints.endpoints[0]
+        endpoint.in_flight = 2
+
+        def check() -> bool:
+            return (
+                client.config is config
+                and client.user_info_cache is cache
+                and not client._revalidating
+                and client.http_client._client is None
+                and endpoint.in_flight == 0
+            )
+
+        assert run_in_child(check) == 0
+        assert client._revalidating == {"key"}
+        assert endpoint.in_flight == 2
+
+    def test_sqlite_cache_reopens_connection(self, tmp_path):
+        """测试子进程使用新的SQLite连接且数据可读"""
+        cache = SQLiteUserInfoCache(str(tmp_path / "cache.db"))
+        parent_db = cache._db
+
+        def check() -> bool:
+            return cache._db is not parent_db and cache._db.execute(
+                "SELECT 1"
+            ).fetchone() == (1,)
+
+        assert run_in_child(check) == 0
+        cache.close()
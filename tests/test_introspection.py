@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试令牌自省（RFC 7662）
+"""
+
+import asyncio
+import base64
+import time
+from typing import List
+from urllib.parse import parse_qs
+
+import httpx
+import pytest
+
+from treer_sso_sdk import (
+    IntrospectionCache,
+    SSOAuthenticationError,
+    SSOConfig,
+    SSOConfigError,
+    SSOError,
+    TokenIntrospection,
+    TreerSSOClient,
+)
+from treer_sso_sdk.interfaces import HTTPClientInterface
+
+
+class IntrospectionHTTPClient(HTTPClientInterface):
+    """返回固定自省结果的假HTTP客户端"""
+
+    def __init__(self, status: int = 200, body=None, delay: float = 0.0) -> None:
+        self.status = status
+        self.body = body if body is not None else {"active": False}
+        self.delay = delay
+        self.requests: List[dict] = []
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        self.requests.append({"url": url, **kwargs})
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return httpx.Response(
+            self.status, json=self.body, request=httpx.Request("POST", url)
+        )
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+def active_body(**fields) -> dict:
+    body = {
+        "active": True,
+        "sub": 42,
+        "username": "alice",
+        "client_id": "app",
+        "scope": "openid profile",
+        "exp": int(time.time()) + 3600,
+        "iat": int(time.time()),
+        "token_type": "Bearer",
+        "aud": "ignored",
+    }
+    body.update(fields)
+    return body
+
+
+def make_client(http_client: HTTPClientInterface, **config) -> TreerSSOClient:
+    return TreerSSOClient(
+        SSOConfig(client_id="my app", client_secret="s3cr&t", **config),
+        http_client=http_client,
+    )
+
+
+class TestIntrospection:
+    """introspect_token测试类"""
+
+    async def test_client_authenticated_post(self):
+        """测试使用Basic认证POST令牌与类型提示"""
+        http_client = IntrospectionHTTPClient(body=active_body())
+        client = make_client(http_client)
+        result = await client.introspect_token("tok en")
+
+        request = http_client.requests[0]
+        assert request["url"].endswith("/api/v1/oauth/introspect")
+        assert parse_qs(request["content"].decode()) == {
+            "token": ["tok en"],
+            "token_type_hint": ["access_token"],
+        }
+        scheme, credentials = request["headers"]["Authorization"].split(" ")
+        assert scheme == "Basic"
+        assert base64.b64decode(credentials) == b"my+app:s3cr%26t"
+        assert result.active is True
+        assert result.sub == "42"
+        assert result.username == "alice"
+        assert result.has_all("openid profile")
+
+    async def test_active_result_cached_until_exp(self):
+        """测试有效结果缓存到令牌过期"""
+        http_client = IntrospectionHTTPClient(body=active_body())
+        client = make_client(http_client)
+        first = await client.introspect_token("token")
+        second = await client.introspect_token("token")
+        assert second is first
+        assert len(http_client.requests) == 1
+        assert client.stats.introspection_cache_hits == 1
+
+        key = next(iter(client.introspection_cache._entries))
+        assert client.introspection_cache.get(key, first.exp + 1) is None
+        await client.introspect_token("token")
+        assert len(http_client.requests) == 2
+
+    async def test_string_exp_coerced(self):
+        """测试字符串或浮点数的exp/iat转换为int后正常缓存"""
+        exp = int(time.time()) + 3600
+        http_client = IntrospectionHTTPClient(
+            body=active_body(exp=str(exp), iat=exp - 3599.75)
+        )
+        client = make_client(http_client)
+        result = await client.introspect_token("token")
+        assert result.exp == exp
+        assert result.iat == exp - 3600
+        assert await client.introspect_token("token") is result
+        assert len(http_client.requests) == 1
+
+    @pytest.mark.parametrize("exp", ["soon", [1], {"value": 1}])
+    async def test_invalid_exp(self, exp):
+        """测试无法转换的exp抛出SSOError"""
+        client = make_client(IntrospectionHTTPClient(body=active_body(exp=exp)))
+        with pytest.raises(SSOError, match="exp"):
+            await client.introspect_token("token")
+
+    async def test_inactive_not_cached(self):
+        """测试无效结果只保留active字段且不缓存"""
+        http_client = IntrospectionHTTPClient(
+            body={"active": False, "username": "alice"}
+        )
+        client = make_client(http_client)
+        result = await client.introspect_token("token")
+        await client.introspect_token("token")
+        assert result == TokenIntrospection(active=False)
+        assert len(http_client.requests) == 2
+
+    async def test_concurrent_calls_coalesced(self):
+        """测试相同令牌的并发调用只发送一次请求"""
+        http_client = IntrospectionHTTPClient(body=active_body(), delay=0.01)
+        client = make_client(http_client)
+        results = await asyncio.gather(
+            *(client.introspect_token("token") for _ in range(5))
+        )
+        assert len(http_client.requests) == 1
+        assert all(result is results[0] for result in results)
+
+    async def test_client_auth_failure(self):
+        """测试客户端认证失败"""
+        client = make_client(IntrospectionHTTPClient(status=401, body={}))
+        with pytest.raises(SSOAuthenticationError):
+            await client.introspect_token("token")
+
+    async def test_cache_disabled(self):
+        """测试introspection_cache_size为0时不缓存"""
+        http_client = IntrospectionHTTPClient(body=active_body())
+        client = make_client(http_client, introspection_cache_size=0)
+        await client.introspect_token("token")
+        await client.introspect_token("token")
+        assert len(http_client.requests) == 2
+
+    def test_invalid_cache_size(self):
+        """测试introspection_cache_size不能为负"""
+        with pytest.raises(SSOConfigError):
+            SSOConfig(
+                client_id="id", client_secret="secret", introspection_cache_size=-1
+            )
+
+
+class TestIntrospectionCache:
+    """IntrospectionCache测试类"""
+
+    def test_bounded_lru(self):
+        """测试条目数上限与LRU淘汰"""
+        cache = IntrospectionCache(max_entries=2)
+        now = 1000.0
+        for key in ("a", "b"):
+            cache.set(key, TokenIntrospection(active=True, exp=2000), now)
+        cache.get("a", now)
+        cache.set("c", TokenIntrospection(active=True, exp=2000), now)
+        assert len(cache) == 2
+        assert cache.get("b", now) is None
+        assert cache.get("a", now) is not None
+
+    def test_without_exp_not_cached(self):
+        """测试没有exp或已过期的结果不缓存"""
+        cache = IntrospectionCache()
+        cache.set("a", TokenIntrospection(active=True), 1000.0)
+        cache.set("b", TokenIntrospection(active=True, exp=999), 1000.0)
+        assert len(cache) == 0
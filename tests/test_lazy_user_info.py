@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试延迟解析的UserInfo
+"""
+
+import dataclasses
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+
+from treer_sso_sdk import LazyUserInfo, SSOConfig, TreerSSOClient, UserInfo
+from treer_sso_sdk.http_client import AsyncHTTPClient
+
+DATA = {
+    "id": 42,
+    "username": "alice",
+    "email": "alice@example.com",
+    "profile": {"first_name": "Alice", "additional_info": {"tier": "gold"}},
+    "created_at": "2024-01-01T00:00:00Z",
+    "updated_at": "not a date",
+}
+
+
+class TestLazyUserInfo:
+    """LazyUserInfo测试类"""
+
+    def test_defers_parsing(self):
+        """测试构造时不解析档案与时间，访问后缓存"""
+        user = LazyUserInfo.from_dict(DATA)
+        assert user.id == "42"
+        assert "profile" not in user.__dict__
+        assert "created_at" not in user.__dict__
+
+        assert user.profile.first_name == "Alice"
+        assert user.profile is user.profile
+        assert user.created_at == datetime(2024, 1, 1, tzinfo=timezone.utc)
+        assert user.updated_at is None
+
+    def test_compatible_with_user_info(self):
+        """测试与UserInfo结果一致"""
+        lazy = LazyUserInfo.from_dict(DATA)
+        eager = UserInfo.from_dict(DATA)
+        assert isinstance(lazy, UserInfo)
+        assert lazy.to_dict() == eager.to_dict()
+        assert UserInfo.from_bytes(lazy.to_bytes()) == eager
+        assert dataclasses.replace(lazy, username="bob").profile == eager.profile
+
+    def test_equality(self):
+        """测试与字段值相同的UserInfo相等（双向），字段不同时不相等"""
+        lazy = LazyUserInfo.from_dict(DATA)
+        eager = UserInfo.from_dict(DATA)
+        assert lazy == eager
+        assert eager == lazy
+        assert lazy == LazyUserInfo.from_dict(DATA)
+        assert lazy != dataclasses.replace(eager, username="bob")
+        assert lazy != "alice"
+
+    def test_assignment(self):
+        """测试赋值覆盖延迟字段并使序列化缓存失效"""
+        user = LazyUserInfo.from_dict(DATA)
+        assert user.to_dict()["profile"]["first_name"] == "Alice"
+        user.profile = None
+        assert user.profile is None
+        assert "profile" not in user.to_dict()
+
+    def test_missing_fields(self):
+        """测试缺少必需字段"""
+        with pytest.raises(KeyError):
+            LazyUserInfo.from_dict({"id": 1})
+
+    async def test_client_returns_lazy(self):
+        """测试lazy_user_info配置"""
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json=DATA)
+
+        config = SSOConfig("id", "secret", lazy_user_info=True)
+        http_client = AsyncHTTPClient(config, transport=httpx.MockTransport(handler))
+        async with TreerSSOClient(config, http_client=http_client) as client:
+            user = await client.get_user_info("token")
+        assert isinstance(user, LazyUserInfo)
+        assert user.profile.additional_info == {"tier": "gold"}
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试自适应并发限制
+"""
+
+import asyncio
+import random
+import time
+
+import httpx
+import pytest
+
+from treer_sso_sdk import (
+    AIMDLimiter,
+    GradientLimiter,
+    SSOConfig,
+    SSOOverloadError,
+)
+from treer_sso_sdk.http_client import AsyncHTTPClient
+
+
+class StandInServer:
+    """容量有限、延迟可变的模拟SSO服务
+
+    同时最多处理capacity个请求，其余请求在服务端排队，
+    因此过多的在途请求只会增加延迟
+    """
+
+    def __init__(self, capacity: int, base_latency: float) -> None:
+        self.capacity = asyncio.Semaphore(capacity)
+        self.base_latency = base_latency
+        self.random = random.Random(42)
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        async with self.capacity:
+            jitter = self.random.uniform(0.5, 1.5)
+            await asyncio.sleep(self.base_latency * jitter)
+        return httpx.Response(200, json={"id": 1, "username": "alice"})
+
+
+class TestAIMDLimiter:
+    """AIMDLimiter测试类"""
+
+    def test_increase_and_backoff(self):
+        """测试加性增与乘性减"""
+        limiter = AIMDLimiter(initial_limit=10, max_limit=20)
+        for _ in range(10):
+            assert limiter.try_acquire()
+        limiter.release(0.01)
+        assert limiter.limit == 11
+
+        limiter.release(0.01, dropped=True)
+        assert limiter.limit == 9
+
+    def test_reject_when_full(self):
+        """测试达到上限后立即拒绝"""
+        limiter = AIMDLimiter(initial_limit=2, min_limit=1, max_limit=2)
+        assert limiter.try_acquire()
+        assert limiter.try_acquire()
+        assert not limiter.try_acquire()
+        assert limiter.rejected == 1
+
+
+class TestGradientLimiter:
+    """GradientLimiter测试类"""
+
+    @pytest.mark.parametrize("rtt", [None, 0.05])
+    def test_all_dropped(self, rtt):
+        """测试全部请求超时（rtt为None）或被429/503拒绝时上限收缩到下界"""
+        limiter = GradientLimiter(initial_limit=50, max_limit=100)
+        for _ in range(10_000):
+            assert limiter.try_acquire()
+            limiter.release(rtt, dropped=True)
+        assert limiter.limit == 1
+        assert limiter.rtt_noload is None
+
+        # 恢复后按正常样本重新增长
+        for _ in range(200):
+            assert limiter.try_acquire()
+            limiter.release(0.01)
+        assert limiter.rtt_noload == 0.01
+
+    def test_zero_rtt_window(self):
+        """测试时钟精度不足、窗口内耗时全为0时不抛出ZeroDivisionError"""
+        limiter = GradientLimiter(initial_limit=10, max_limit=100)
+        for _ in range(20):
+            for _ in range(int(limiter.limit)):
+                assert limiter.try_acquire()
+            for _ in range(int(limiter.limit)):
+                limiter.release(0.0)
+        assert limiter.rtt_noload == 0.0
+        assert limiter.limit > 10
+
+
+class TestAdaptiveConcurrencySimulation:
+    """自适应并发限制仿真测试类"""
+
+    async def test_gradient_limiter_under_overload(self):
+        """测试服务端过载时限制器收缩上限、拒绝多余请求并控制延迟"""
+        server = StandInServer(capacity=4, base_latency=0.01)
+        limiter = GradientLimiter(
+            initial_limit=20, min_limit=2, max_limit=40, smoothing=0.5
+        )
+        config = SSOConfig(client_id="id", client_secret="secret", max_connections=40)
+        http_client = AsyncHTTPClient(
+            config, limiter=limiter, transport=httpx.MockTransport(server)
+        )
+
+        latencies = []
+        overloads = 0
+        deadline = time.monotonic() + 1.5
+
+        async def caller() -> None:
+            nonlocal overloads
+            while time.monotonic() < deadline:
+                started = time.monotonic()
+                try:
+                    await http_client.get("https://sso.example.com/api/v1/users/me")
+                except SSOOverloadError:
+                    overloads += 1
+                    await asyncio.sleep(0.005)
+                    continue
+                latencies.append(time.monotonic() - started)
+
+        await asyncio.gather(*(caller() for _ in range(40)))
+        await http_client.close()
+
+        # 只统计收敛后的后半段
+        settled = sorted(latencies[len(latencies) // 2 :])
+        p50 = settled[len(settled) // 2]
+        assert overloads > 0
+        assert limiter.limit < 12
+        # 无限制时40个在途请求在容量为4的服务端排队，延迟约为10倍基础延迟
+        assert p50 < 0.01 * 4
+        assert limiter.in_flight == 0
+
+    async def test_disabled_by_default(self):
+        """测试默认不启用并发限制"""
+        config = SSOConfig(client_id="id", client_secret="secret")
+        http_client = AsyncHTTPClient(config)
+        assert http_client.limiter is None
+
+        config = SSOConfig(
+            client_id="id", client_secret="secret", adaptive_concurrency=True
+        )
+        assert isinstance(AsyncHTTPClient(config).limiter, GradientLimiter)
+
+    def test_invalid_limits(self):
+        """测试无效的上下限"""
+        with pytest.raises(ValueError):
+            GradientLimiter(initial_limit=5, min_limit=10, max_limit=20)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试负载测试工具
+"""
+
+import anyio
+import httpx
+import pytest
+
+from treer_sso_sdk import SSOConfig, TreerSSOClient
+from treer_sso_sdk.http_client import AsyncHTTPClient
+from treer_sso_sdk.interfaces import HTTPClientInterface
+from treer_sso_sdk.loadtest import LoadTest, _parse_args, _percentile, serve_stand_in
+
+
+class FailingHTTPClient(HTTPClientInterface):
+    """总是连接失败的HTTP客户端"""
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        raise httpx.ConnectError("connection refused")
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        raise httpx.ConnectError("connection refused")
+
+    async def close(self) -> None:
+        pass
+
+
+class TestPercentile:
+    """测试分位数计算"""
+
+    def test_nearest_rank(self):
+        """最近秩法"""
+        values = [float(i) for i in range(1, 101)]
+        assert _percentile(values, 50) == 50.0
+        assert _percentile(values, 99) == 99.0
+        assert _percentile(values, 99.9) == 100.0
+        assert _percentile([], 50) == 0.0
+
+
+class TestLoadTest:
+    """测试开环与闭环负载"""
+
+    async def _run_against_stand_in(self, run):
+        async with anyio.create_task_group() as tg:
+            port = await tg.start(serve_stand_in)
+            config = SSOConfig(
+                client_id="loadtest",
+                client_secret="loadtest",
+                sso_base_url=f"http://127.0.0.1:{port}",
+                max_connections=10,
+            )
+            async with TreerSSOClient(
+                config, http_client=AsyncHTTPClient(config)
+            ) as client:
+                report = await run(client)
+            tg.cancel_scope.cancel()
+        return report
+
+    async def test_open_loop_login(self):
+        """开环模式按目标速率发起登录请求并报告连接池状态"""
+        report = await self._run_against_stand_in(
+            lambda client: LoadTest(client, "login", sample_interval=0.01).run_open(
+                200, 0.25
+            )
+        )
+        assert report.mode == "open"
+        assert report.requests == 50
+        assert report.succeeded == 50
+        assert report.errors == {}
+        assert report.pool_capacity == 10
+        assert report.pool_max_in_flight >= 1
+        assert report.latency_ms["p50"] >= report.service_time_ms["p50"]
+
+    async def test_closed_loop_user_info(self):
+        """闭环模式持续发起用户信息请求"""
+        report = await self._run_against_stand_in(
+            lambda client: LoadTest(client, "user-info").run_closed(4, 0.2)
+        )
+        assert report.mode == "closed"
+        assert report.concurrency == 4
+        assert report.succeeded == report.requests > 0
+        assert "p99" in report.format()
+
+    async def test_errors_counted_by_class(self):
+        """失败按异常类型计数"""
+        client = TreerSSOClient(
+            SSOConfig(client_id="loadtest", client_secret="loadtest", max_retries=0),
+            http_client=FailingHTTPClient(),
+        )
+        report = await LoadTest(client, "login").run_open(100, 0.05)
+        assert report.succeeded == 0
+        assert report.errors == {"SSONetworkError": report.requests}
+
+    async def test_max_outstanding_drops(self):
+        """开环模式在途请求达到上限时丢弃而不是等待"""
+
+        class SlowHTTPClient(FailingHTTPClient):
+            async def post(self, url: str, **kwargs) -> httpx.Response:
+                await anyio.sleep(1)
+                raise httpx.ConnectError("connection refused")
+
+        client = TreerSSOClient(
+            SSOConfig(client_id="loadtest", client_secret="loadtest", max_retries=0),
+            http_client=SlowHTTPClient(),
+        )
+        report = await LoadTest(client, "login", max_outstanding=2).run_open(100, 0.1)
+        assert report.requests == 2
+        assert report.dropped == 8
+
+
+class TestArguments:
+    """测试命令行参数"""
+
+    def test_requires_target(self):
+        """缺少--base-url与--stand-in时报错"""
+        with pytest.raises(SystemExit):
+            _parse_args(["--rate", "10"])
+
+    def test_rate_and_concurrency_exclusive(self):
+        """--rate与--concurrency互斥"""
+        with pytest.raises(SystemExit):
+            _parse_args(["--stand-in", "--rate", "10", "--concurrency", "5"])
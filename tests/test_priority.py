@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试请求优先级准入控制
+"""
+
+import asyncio
+
+from treer_sso_sdk import Priority, request_priority
+from treer_sso_sdk.priority import PriorityAdmission, current_priority
+
+
+class TestPriorityAdmission:
+    """PriorityAdmission测试类"""
+
+    async def test_background_share_limit(self):
+        """测试后台请求最多占用部分容量"""
+        admission = PriorityAdmission(capacity=4, background_share=0.5)
+        assert admission.try_acquire(Priority.BACKGROUND)
+        assert admission.try_acquire(Priority.BACKGROUND)
+        assert not admission.try_acquire(Priority.BACKGROUND)
+
+        # 剩余容量仍可供交互式请求使用
+        assert admission.try_acquire(Priority.INTERACTIVE)
+        assert admission.try_acquire(Priority.INTERACTIVE)
+        assert not admission.try_acquire(Priority.INTERACTIVE)
+
+    async def test_interactive_served_first(self):
+        """测试高优先级等待者先被放行"""
+        admission = PriorityAdmission(capacity=1, background_share=1.0)
+        await admission.acquire(Priority.INTERACTIVE)
+        order = []
+
+        async def worker(priority: Priority) -> None:
+            await admission.acquire(priority)
+            order.append(priority)
+            admission.release(priority)
+
+        tasks = [
+            asyncio.create_task(worker(Priority.BACKGROUND)),
+            asyncio.create_task(worker(Priority.BACKGROUND)),
+            asyncio.create_task(worker(Priority.INTERACTIVE)),
+        ]
+        await asyncio.sleep(0)
+        assert admission.waiting() == 3
+
+        admission.release(Priority.INTERACTIVE)
+        await asyncio.gather(*tasks)
+        assert order == [
+            Priority.INTERACTIVE,
+            Priority.BACKGROUND,
+            Priority.BACKGROUND,
+        ]
+        assert admission.total_in_flight == 0
+
+    async def test_cancelled_waiter(self):
+        """测试取消排队中的请求"""
+        admission = PriorityAdmission(capacity=1)
+        await admission.acquire(Priority.INTERACTIVE)
+        task = asyncio.create_task(admission.acquire(Priority.INTERACTIVE))
+        await asyncio.sleep(0)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        assert admission.waiting() == 0
+        admission.release(Priority.INTERACTIVE)
+        assert admission.total_in_flight == 0
+
+
+def test_request_priority_context():
+    """测试优先级上下文"""
+    assert current_priority() is Priority.INTERACTIVE
+    with request_priority(Priority.BACKGROUND):
+        assert current_priority() is Priority.BACKGROUND
+    assert current_priority() is Priority.INTERACTIVE
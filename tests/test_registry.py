@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试多租户客户端注册表
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from treer_sso_sdk import SSOClientRegistry, SSOConfig, SSOConfigError
+from treer_sso_sdk.http_client import AsyncHTTPClient
+
+
+class CountingServer:
+    """记录最大并发和client_id的模拟SSO服务"""
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.client_ids = []
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.in_flight -= 1
+        if request.url.path.endswith("/oauth/token"):
+            form = dict(httpx.QueryParams(request.content.decode()))
+            self.client_ids.append(form["client_id"])
+            return httpx.Response(200, json={"access_token": "t-" + form["code"]})
+        return httpx.Response(200, json={"id": 1, "username": "alice"})
+
+
+@pytest.fixture
+def server():
+    return CountingServer()
+
+
+@pytest.fixture
+def registry(server):
+    config = SSOConfig(client_id="shared", client_secret="unused")
+    http_client = AsyncHTTPClient(config, transport=httpx.MockTransport(server))
+    return SSOClientRegistry(config, http_client=http_client)
+
+
+class TestSSOClientRegistry:
+    """SSOClientRegistry测试类"""
+
+    async def test_tenants_share_pool(self, registry, server):
+        """测试租户共享连接池并使用各自的凭据"""
+        food = registry.register("food", "food_id", "food_secret")
+        shop = registry.register("shop", "shop_id", "shop_secret")
+
+        await food.get_user_info_by_code("a")
+        await shop.get_access_token("b")
+
+        assert food.http_client.shared is shop.http_client.shared
+        assert server.client_ids == ["food_id", "shop_id"]
+        metrics = registry.metrics()
+        assert metrics["food"]["requests"] == 2
+        assert metrics["shop"]["requests"] == 1
+        await registry.close()
+
+    async def test_per_tenant_limit(self, registry, server):
+        """测试租户并发上限"""
+        batch = registry.register("batch", "batch_id", "secret", max_in_flight=2)
+        await asyncio.gather(*(batch.get_user_info(f"t{i}") for i in range(6)))
+        assert server.max_in_flight == 2
+        await registry.close()
+
+    def test_duplicate_and_unknown_tenant(self, registry):
+        """测试重复注册与未注册租户"""
+        registry.register("food", "food_id", "food_secret")
+        with pytest.raises(SSOConfigError):
+            registry.register("food", "food_id", "food_secret")
+        with pytest.raises(SSOConfigError):
+            registry.get("shop")
+
+    @pytest.mark.parametrize(
+        "override", [{"sso_base_url": "https://other.example.com"}, {"timeout": 5}]
+    )
+    def test_transport_override_rejected(self, registry, override):
+        """测试租户不能覆盖共享的传输层配置"""
+        with pytest.raises(SSOConfigError):
+            registry.register("food", "food_id", "food_secret", **override)
+        assert "food" not in registry
+        client = registry.register(
+            "food", "food_id", "food_secret", user_info_cache_ttl=60
+        )
+        assert client.config.user_info_cache_ttl == 60
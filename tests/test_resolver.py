@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试DNS解析缓存
+"""
+
+import socket
+from typing import List
+
+import anyio
+import httpcore
+import pytest
+from anyio.abc import SocketAttribute
+
+from treer_sso_sdk import CachingResolver, SSOConfig
+from treer_sso_sdk.http_client import AsyncHTTPClient
+from treer_sso_sdk.interfaces import ResolverInterface
+from treer_sso_sdk.resolver import ResolvingNetworkBackend
+
+
+class FakeResolver(ResolverInterface):
+    """记录调用次数的假解析器"""
+
+    def __init__(self, addresses: List[str]) -> None:
+        self.addresses = addresses
+        self.calls = 0
+        self.fail = False
+
+    async def resolve(self, host: str, port: int) -> List[str]:
+        self.calls += 1
+        if self.fail:
+            raise socket.gaierror("temporary failure")
+        return list(self.addresses)
+
+
+class FakeClock:
+    """可手动推进的时钟"""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestCachingResolver:
+    """CachingResolver测试类"""
+
+    async def test_cache_within_ttl(self):
+        """测试TTL内命中缓存"""
+        fake = FakeResolver(["10.0.0.1"])
+        clock = FakeClock()
+        resolver = CachingResolver(fake, ttl=10, stale_ttl=0, clock=clock)
+
+        assert await resolver.resolve("sso", 443) == ["10.0.0.1"]
+        clock.now = 9
+        assert await resolver.resolve("sso", 443) == ["10.0.0.1"]
+        assert fake.calls == 1
+
+        clock.now = 11
+        await resolver.resolve("sso", 443)
+        assert fake.calls == 2
+
+    async def test_stale_on_error(self):
+        """测试解析失败时返回过期结果"""
+        fake = FakeResolver(["10.0.0.1"])
+        clock = FakeClock()
+        resolver = CachingResolver(fake, ttl=10, stale_ttl=30, clock=clock)
+        await resolver.resolve("sso", 443)
+
+        fake.fail = True
+        clock.now = 20
+        assert await resolver.resolve("sso", 443) == ["10.0.0.1"]
+
+        clock.now = 41
+        with pytest.raises(OSError):
+            await resolver.resolve("sso", 443)
+
+    async def test_round_robin(self):
+        """测试多条记录轮询"""
+        fake = FakeResolver(["10.0.0.1", "10.0.0.2", "::1"])
+        resolver = CachingResolver(fake, ttl=60)
+
+        firsts = [(await resolver.resolve("sso", 443))[0] for _ in range(4)]
+        assert firsts == ["10.0.0.1", "10.0.0.2", "::1", "10.0.0.1"]
+        assert fake.calls == 1
+
+
+class RecordingBackend(httpcore.AsyncNetworkBackend):
+    """记录连接地址的网络后端，第一个地址连接失败"""
+
+    def __init__(self) -> None:
+        self.attempts: List[str] = []
+
+    async def connect_tcp(
+        self, host, port, timeout=None, local_address=None, socket_options=None
+    ):
+        self.attempts.append(host)
+        if len(self.attempts) == 1:
+            raise httpcore.ConnectError("refused")
+        return object()
+
+
+class TestResolvingNetworkBackend:
+    """ResolvingNetworkBackend测试类"""
+
+    async def test_falls_through_addresses(self):
+        """测试逐个尝试解析出的地址"""
+        backend = RecordingBackend()
+        network = ResolvingNetworkBackend(
+            FakeResolver(["10.0.0.1", "10.0.0.2"]), backend
+        )
+
+        await network.connect_tcp("sso.example.com", 443)
+        assert backend.attempts == ["10.0.0.1", "10.0.0.2"]
+
+    async def test_ip_literal_skips_resolver(self):
+        """测试IP字面量不经过解析器"""
+        fake = FakeResolver(["10.0.0.1"])
+        backend = RecordingBackend()
+        backend.attempts.append("warmup")
+        network = ResolvingNetworkBackend(fake, backend)
+
+        await network.connect_tcp("127.0.0.1", 443)
+        assert fake.calls == 0
+
+    async def test_http_client_wiring(self):
+        """测试HTTP客户端使用缓存解析器"""
+        fake = FakeResolver(["10.0.0.1"])
+        config = SSOConfig(client_id="id", client_secret="secret")
+        http_client = AsyncHTTPClient(config, resolver=fake)
+
+        assert isinstance(http_client.resolver, CachingResolver)
+        assert http_client.resolver.resolver is fake
+        backend = http_client.client._transport._pool._network_backend
+        assert isinstance(backend, ResolvingNetworkBackend)
+        await http_client.close()
+
+    async def test_request_through_resolver(self):
+        """测试请求经解析器得到的地址发出，主机名保持不变"""
+        async with anyio.create_task_group() as tg:
+            port, requests = await tg.start(serve_once)
+            config = SSOConfig(client_id="id", client_secret="secret")
+            http_client = AsyncHTTPClient(config, resolver=FakeResolver(["127.0.0.1"]))
+            response = await http_client.get(f"http://sso.test:{port}/api/v1/users/me")
+            await http_client.close()
+
+        assert response.json() == {"ok": True}
+        assert requests[0].startswith(b"GET /api/v1/users/me HTTP/1.1")
+        assert f"Host: sso.test:{port}".encode() in requests[0]
+
+    async def test_env_proxy_honoured(self, monkeypatch):
+        """测试配置了环境代理时请求仍经过代理"""
+        for name in (
+            "NO_PROXY",
+            "no_proxy",
+            "ALL_PROXY",
+            "all_proxy",
+            "HTTPS_PROXY",
+            "https_proxy",
+            "http_proxy",
+        ):
+            monkeypatch.delenv(name, raising=False)
+        fake = FakeResolver(["10.0.0.1"])
+        async with anyio.create_task_group() as tg:
+            port, requests = await tg.start(serve_once)
+            monkeypatch.setenv("HTTP_PROXY", f"http://127.0.0.1:{port}")
+            config = SSOConfig(client_id="id", client_secret="secret")
+            http_client = AsyncHTTPClient(config, resolver=fake)
+            response = await http_client.get("http://sso.test/api/v1/users/me")
+            await http_client.close()
+
+        assert response.json() == {"ok": True}
+        # 代理收到绝对URL形式的请求行
+        assert requests[0].startswith(b"GET http://sso.test/api/v1/users/me HTTP/1.1")
+        assert fake.calls == 0
+
+
+async def serve_once(*, task_status=anyio.TASK_STATUS_IGNORED):
+    """在随机端口上应答一个HTTP请求，返回端口与收到的请求"""
+    requests: List[bytes] = []
+    listener = (await anyio.create_tcp_listener(local_host="127.0.0.1")).listeners[0]
+    async with listener:
+        task_status.started((listener.extra(SocketAttribute.local_port), requests))
+        async with await listener.accept() as stream:
+            data = b""
+            while b"\r\n\r\n" not in data:
+                data += await stream.receive()
+            requests.append(data)
+            body = b'{"ok": true}'
+            await stream.send(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                b"Connection: close\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body)
+            )
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试响应体大小上限与延迟解析的additional_info
+"""
+
+import gzip
+import json
+
+import httpx
+import pytest
+
+from treer_sso_sdk import (
+    LazyJSON,
+    SSOConfig,
+    SSOConfigError,
+    SSOError,
+    SSOResponseTooLargeError,
+    TreerSSOClient,
+    UserInfo,
+)
+from treer_sso_sdk.http_client import AsyncHTTPClient
+from treer_sso_sdk.models import loads_user_info
+from treer_sso_sdk.stats import ClientStats
+
+USER_URL = "https://sso.example.com/api/v1/users/me"
+
+
+def make_http_client(handler, **config) -> AsyncHTTPClient:
+    config = SSOConfig(
+        client_id="id",
+        client_secret="secret",
+        sso_base_url="https://sso.example.com",
+        **config,
+    )
+    return AsyncHTTPClient(config, transport=httpx.MockTransport(handler))
+
+
+class ChunkStream(httpx.AsyncByteStream):
+    """逐块产生响应体并记录已产生的块数"""
+
+    def __init__(self, chunk: bytes, count: int) -> None:
+        self.chunk = chunk
+        self.count = count
+        self.sent = 0
+
+    async def __aiter__(self):
+        for _ in range(self.count):
+            self.sent += 1
+            yield self.chunk
+
+
+class TestMaxResponseSize:
+    """max_response_size测试类"""
+
+    async def test_within_limit(self):
+        """测试未超出上限时响应体完整可用"""
+        http_client = make_http_client(
+            lambda request: httpx.Response(200, json={"id": 1}), max_response_size=1024
+        )
+        response = await http_client.get(USER_URL)
+        assert response.json() == {"id": 1}
+        await http_client.close()
+
+    async def test_content_length_rejected_before_reading(self):
+        """测试Content-Length超出上限时不读取响应体"""
+        stream = ChunkStream(b"x" * 100, 10)
+        http_client = make_http_client(
+            lambda request: httpx.Response(
+                200, headers={"Content-Length": "1000"}, stream=stream
+            ),
+            max_response_size=500,
+        )
+        with pytest.raises(SSOResponseTooLargeError) as exc_info:
+            await http_client.get(USER_URL)
+        assert exc_info.value.error_code == "response_too_large"
+        assert exc_info.value.details["limit"] == 500
+        assert stream.sent == 0
+        await http_client.close()
+
+    async def test_streaming_aborts_early(self):
+        """测试没有Content-Length时读取到超出上限即中止"""
+        stream = ChunkStream(b"x" * 100, 100)
+        http_client = make_http_client(
+            lambda request: httpx.Response(200, stream=stream), max_response_size=250
+        )
+        with pytest.raises(SSOResponseTooLargeError):
+            await http_client.get(USER_URL)
+        assert stream.sent == 3
+        await http_client.close()
+
+    async def test_decompressed_size_counted(self):
+        """测试按解压后的大小计算，防止压缩炸弹"""
+        body = gzip.compress(b" " * 100_000)
+        http_client = make_http_client(
+            lambda request: httpx.Response(
+                200, headers={"Content-Encoding": "gzip"}, content=body
+            ),
+            max_response_size=10_000,
+        )
+        assert len(body) < 10_000
+        with pytest.raises(SSOResponseTooLargeError):
+            await http_client.get(USER_URL)
+        await http_client.close()
+
+    async def test_compressed_within_limit(self):
+        """测试解压后的响应可以正常读取，并记录压缩节省的字节数"""
+        payload = json.dumps({"id": 1, "bio": " " * 5000}).encode()
+        body = gzip.compress(payload)
+        http_client = make_http_client(
+            lambda request: httpx.Response(
+                200, headers={"Content-Encoding": "gzip"}, stream=ChunkStream(body, 1)
+            ),
+            max_response_size=10_000,
+        )
+        response = await http_client.get(USER_URL)
+        assert response.content == payload
+        assert response.json()["id"] == 1
+        assert "content-encoding" not in response.headers
+        assert response.headers["content-length"] == str(len(payload))
+
+        stats = ClientStats()
+        stats.record_response(response)
+        assert stats.bytes_decoded == len(payload)
+        assert stats.bytes_received == len(body)
+        assert stats.bytes_saved_compression == len(payload) - len(body)
+        await http_client.close()
+
+    async def test_unlimited(self):
+        """测试max_response_size为0时不限制"""
+        http_client = make_http_client(
+            lambda request: httpx.Response(200, content=b"x" * 2_000_000),
+            max_response_size=0,
+        )
+        response = await http_client.get(USER_URL)
+        assert len(response.content) == 2_000_000
+        await http_client.close()
+
+    async def test_client_propagates_error(self):
+        """测试get_user_info抛出SSOResponseTooLargeError"""
+        http_client = make_http_client(
+            lambda request: httpx.Response(200, content=b"x" * 5000),
+            max_response_size=1000,
+        )
+        client = TreerSSOClient(http_client.config, http_client=http_client)
+        with pytest.raises(SSOResponseTooLargeError):
+            await client.get_user_info("token")
+        await client.close()
+
+    def test_invalid_config(self):
+        """测试配置验证"""
+        with pytest.raises(SSOConfigError):
+            SSOConfig(client_id="id", client_secret="secret", max_response_size=-1)
+        with pytest.raises(SSOConfigError):
+            SSOConfig(
+                client_id="id", client_secret="secret", lazy_additional_info_size=-1
+            )
+
+
+ADDITIONAL_INFO = {"tags": ["a", "}"] * 50, "note": '含"引号"与{括号'}
+USER = {
+    "id": 1,
+    "username": "alice",
+    "bio": '"profile": {',
+    "profile": {"first_name": "Alice", "additional_info": ADDITIONAL_INFO},
+}
+
+
+class TestLazyAdditionalInfo:
+    """延迟解析additional_info测试类"""
+
+    def test_loads_user_info(self):
+        """测试较大的additional_info保留为原始文本，访问时解析"""
+        text = json.dumps({"success": True, "data": USER}, ensure_ascii=False)
+        data = loads_user_info(text, 100)
+        additional_info = data["data"]["profile"]["additional_info"]
+        assert isinstance(additional_info, LazyJSON)
+        assert not additional_info.parsed
+        assert json.loads(additional_info.raw) == ADDITIONAL_INFO
+        assert data["data"]["bio"] == USER["bio"]
+        assert dict(additional_info) == ADDITIONAL_INFO
+        assert additional_info.parsed
+
+    def test_small_or_unmatched_parsed_eagerly(self):
+        """测试小于阈值、不是对象或不在profile中时按普通JSON解析"""
+        assert loads_user_info(json.dumps(USER), 100_000) == USER
+        assert loads_user_info(json.dumps(USER), 0) == USER
+        as_list = {"id": 1, "username": "a", "profile": {"additional_info": [1] * 100}}
+        assert loads_user_info(json.dumps(as_list), 10) == as_list
+        nested = {"id": 1, "username": "a", "manager": USER}
+        assert loads_user_info(json.dumps(nested), 10) == nested
+
+    def test_invalid_deferred_json(self):
+        """测试延迟部分格式错误时首次访问抛出SSOError"""
+        text = '{"id": 1, "username": "a", "profile": {"additional_info": {"a": nope}}}'
+        data = loads_user_info(text, 10)
+        additional_info = data["profile"]["additional_info"]
+        assert isinstance(additional_info, LazyJSON)
+        with pytest.raises(SSOError):
+            additional_info.get("a")
+        with pytest.raises(SSOError):
+            UserInfo.from_dict(data).to_dict()
+
+    def test_serialization(self):
+        """测试to_dict/to_json_bytes/to_bytes与立即解析的结果一致"""
+        user = UserInfo.from_dict(loads_user_info(json.dumps(USER), 100))
+        eager = UserInfo.from_dict(USER)
+        assert user.to_bytes() != b""
+        assert not user.profile.additional_info.parsed
+        assert UserInfo.from_bytes(user.to_bytes()) == eager
+        assert user.to_dict() == eager.to_dict()
+        assert type(user.to_dict()["profile"]["additional_info"]) is dict
+        assert json.loads(user.to_json_bytes()) == json.loads(eager.to_json_bytes())
+        assert user == eager
+
+    async def test_client(self):
+        """测试启用lazy_additional_info_size后get_user_info返回LazyJSON"""
+        http_client = make_http_client(
+            lambda request: httpx.Response(200, json=USER),
+            lazy_additional_info_size=100,
+        )
+        client = TreerSSOClient(http_client.config, http_client=http_client)
+        user = await client.get_user_info("token")
+        assert isinstance(user.profile.additional_info, LazyJSON)
+        assert user.profile.additional_info["note"] == ADDITIONAL_INFO["note"]
+        await client.close()
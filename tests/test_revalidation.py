@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试分层时间轮与会话定期重新验证
+"""
+
+import random
+from typing import Dict, List
+
+import anyio
+import httpx
+import pytest
+
+from treer_sso_sdk import (
+    SessionChange,
+    SessionChangeKind,
+    SessionRevalidator,
+    SSOConfig,
+    SSOConfigError,
+    TimingWheel,
+    TreerSSOClient,
+    UserInfo,
+)
+from treer_sso_sdk.interfaces import HTTPClientInterface
+from treer_sso_sdk.priority import Priority, current_priority
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class UsersHTTPClient(HTTPClientInterface):
+    """按令牌返回用户信息的假HTTP客户端，未知令牌返回401"""
+
+    def __init__(self) -> None:
+        self.users: Dict[str, dict] = {}
+        self.requests: List[str] = []
+        self.priorities: List[Priority] = []
+        self.fail = False
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        raise NotImplementedError
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        token = kwargs["headers"]["Authorization"].split(" ", 1)[1]
+        self.requests.append(token)
+        self.priorities.append(current_priority())
+        request = httpx.Request("GET", url)
+        if self.fail:
+            raise httpx.ConnectError("connection refused", request=request)
+        if token not in self.users:
+            return httpx.Response(401, request=request)
+        return httpx.Response(200, json=self.users[token], request=request)
+
+    async def close(self) -> None:
+        pass
+
+
+def user(token: str, **fields) -> dict:
+    return {"id": 1, "username": token, "email": f"{token}@example.com", **fields}
+
+
+class TestTimingWheel:
+    """TimingWheel测试类"""
+
+    def test_expires_in_order(self):
+        """测试条目在到期时间之后的第一个tick返回"""
+        wheel: TimingWheel[str] = TimingWheel(tick=1.0, slots=4, levels=3)
+        wheel.schedule("b", "b", 2.5)
+        wheel.schedule("a", "a", 1.0)
+        wheel.schedule("c", "c", 40.0)
+        assert wheel.advance(0.9) == []
+        assert wheel.advance(1.0) == ["a"]
+        assert wheel.advance(2.9) == []
+        assert wheel.advance(3.0) == ["b"]
+        assert wheel.advance(39.9) == []
+        assert wheel.advance(40.0) == ["c"]
+        assert len(wheel) == 0
+
+    def test_cancel_and_replace(self):
+        """测试取消与按键替换"""
+        wheel: TimingWheel[str] = TimingWheel(tick=1.0, slots=4, levels=2)
+        wheel.schedule("a", "first", 5)
+        wheel.schedule("a", "second", 10)
+        wheel.schedule("b", "b", 3)
+        assert wheel.cancel("b") is True
+        assert wheel.cancel("b") is False
+        assert "a" in wheel
+        assert wheel.advance(9) == []
+        assert wheel.advance(10) == ["second"]
+
+    def test_past_deadline_expires_next_tick(self):
+        """测试已过期的到期时间在下一个tick返回"""
+        wheel: TimingWheel[str] = TimingWheel(tick=1.0, start=100.0)
+        wheel.advance(110)
+        wheel.schedule("a", "a", 50)
+        assert wheel.advance(110.5) == []
+        assert wheel.advance(111) == ["a"]
+
+    def test_beyond_range(self):
+        """测试超出最高层范围的条目级联后按实际时间到期"""
+        wheel: TimingWheel[str] = TimingWheel(tick=1.0, slots=4, levels=2)
+        wheel.schedule("far", "far", 100)
+        assert wheel.advance(99) == []
+        assert wheel.advance(100) == ["far"]
+
+    def test_beyond_range_single_level(self):
+        """测试只有一层时超出范围的条目不会提前到期"""
+        wheel: TimingWheel[str] = TimingWheel(tick=1.0, slots=4, levels=1)
+        wheel.schedule("far", "far", 10)
+        for now in range(1, 10):
+            assert wheel.advance(now) == []
+        assert wheel.advance(10) == ["far"]
+        assert len(wheel) == 0
+
+    def test_matches_sorted_deadlines(self):
+        """测试随机调度与取消的结果与逐个比较到期时间一致"""
+        rng = random.Random(7)
+        wheel: TimingWheel[int] = TimingWheel(tick=0.5, slots=8, levels=3)
+        deadlines: Dict[int, float] = {}
+        now = 0.0
+        for step in range(300):
+            for _ in range(5):
+                key = rng.randrange(200)
+                deadline = now + rng.uniform(0, 400)
+                wheel.schedule(key, key, deadline)
+                deadlines[key] = deadline
+            if deadlines and rng.random() < 0.3:
+                key = rng.choice(list(deadlines))
+                wheel.cancel(key)
+                del deadlines[key]
+            now += rng.uniform(0, 3)
+            expired = wheel.advance(now)
+            expected = {
+                key for key, deadline in deadlines.items() if deadline <= now - 0.5
+            }
+            assert expected <= set(expired)
+            for key in expired:
+                # 最多晚一个tick
+                assert deadlines.pop(key) <= now
+        assert len(wheel) == len(deadlines)
+
+    def test_invalid_arguments(self):
+        """测试无效参数"""
+        with pytest.raises(SSOConfigError):
+            TimingWheel(tick=0)
+        with pytest.raises(SSOConfigError):
+            TimingWheel(slots=1)
+
+
+class TestSessionRevalidator:
+    """SessionRevalidator测试类"""
+
+    def make(self, http_client: UsersHTTPClient, **kwargs):
+        clock = FakeClock()
+        changes: List[SessionChange] = []
+
+        async def on_change(change: SessionChange) -> None:
+            changes.append(change)
+
+        client = TreerSSOClient(
+            SSOConfig(client_id="id", client_secret="secret", max_retries=0),
+            http_client=http_client,
+        )
+        options = dict(interval=60, jitter=0, rate=10_000, clock=clock)
+        options.update(kwargs)
+        revalidator = SessionRevalidator(client, on_change, **options)
+        return revalidator, clock, changes
+
+    async def test_only_due_sessions_revalidated(self):
+        """测试只验证到期的会话，并以BACKGROUND优先级请求"""
+        http_client = UsersHTTPClient()
+        http_client.users = {"t1": user("t1"), "t2": user("t2")}
+        revalidator, clock, changes = self.make(http_client)
+        revalidator.track("s1", "t1", UserInfo.from_dict(user("t1")))
+        revalidator.track("s2", "t2", UserInfo.from_dict(user("t2")), delay=120)
+
+        clock.now += 59
+        assert await revalidator.revalidate_due() == 0
+        clock.now += 1
+        assert await revalidator.revalidate_due() == 1
+        assert http_client.requests == ["t1"]
+        assert http_client.priorities == [Priority.BACKGROUND]
+        assert changes == []
+
+        clock.now += 60
+        assert await revalidator.revalidate_due() == 2
+        assert sorted(http_client.requests[1:]) == ["t1", "t2"]
+
+    async def test_change_events(self):
+        """测试用户信息变化、停用与令牌失效"""
+        http_client = UsersHTTPClient()
+        http_client.users = {"t1": user("t1"), "t2": user("t2"), "t3": user("t3")}
+        revalidator, clock, changes = self.make(http_client)
+        for n in (1, 2, 3):
+            revalidator.track(f"s{n}", f"t{n}", UserInfo.from_dict(user(f"t{n}")))
+
+        http_client.users["t1"] = user("t1", email="new@example.com")
+        http_client.users["t2"] = user("t2", is_active=False)
+        del http_client.users["t3"]
+        clock.now += 60
+        await revalidator.revalidate_due()
+
+        kinds = {change.session_id: change for change in changes}
+        assert kinds["s1"].kind is SessionChangeKind.CHANGED
+        assert kinds["s1"].previous.email == "t1@example.com"
+        assert kinds["s1"].current.email == "new@example.com"
+        assert kinds["s2"].kind is SessionChangeKind.DEACTIVATED
+        assert kinds["s3"].kind is SessionChangeKind.INVALID
+        assert kinds["s3"].current is None
+        assert "s1" in revalidator
+        assert "s2" not in revalidator and "s3" not in revalidator
+
+    async def test_network_error_keeps_session(self):
+        """测试网络错误时保留会话并在下个间隔重试"""
+        http_client = UsersHTTPClient()
+        http_client.users = {"t1": user("t1")}
+        revalidator, clock, changes = self.make(http_client)
+        revalidator.track("s1", "t1")
+        http_client.fail = True
+        clock.now += 60
+        await revalidator.revalidate_due()
+        assert changes == [] and "s1" in revalidator
+
+        http_client.fail = False
+        clock.now += 60
+        assert await revalidator.revalidate_due() == 1
+
+    async def test_untrack(self):
+        """测试取消跟踪的会话不再验证"""
+        http_client = UsersHTTPClient()
+        revalidator, clock, _ = self.make(http_client)
+        revalidator.track("s1", "t1")
+        assert revalidator.untrack("s1") is True
+        assert revalidator.untrack("s1") is False
+        clock.now += 60
+        assert await revalidator.revalidate_due() == 0
+        assert len(revalidator) == 0
+
+    async def test_jitter(self):
+        """测试验证时间按抖动比例分散"""
+        http_client = UsersHTTPClient()
+        revalidator, clock, _ = self.make(http_client, jitter=0.5, rng=lambda: 0.0)
+        revalidator.track("s1", "t1")
+        clock.now += 30
+        assert await revalidator.revalidate_due() == 1
+
+    async def test_batches_rate_limited(self):
+        """测试分批验证并按速率限速"""
+        http_client = UsersHTTPClient()
+        http_client.users = {f"t{n}": user(f"t{n}") for n in range(10)}
+        revalidator, clock, _ = self.make(http_client, rate=100, batch_size=5)
+        for n in range(10):
+            revalidator.track(f"s{n}", f"t{n}")
+        clock.now += 60
+        started = anyio.current_time()
+        assert await revalidator.revalidate_due() == 10
+        assert anyio.current_time() - started >= 0.09
+
+    async def test_run(self):
+        """测试run在任务组中持续调度"""
+        http_client = UsersHTTPClient()
+        http_client.users = {"t1": user("t1")}
+        revalidator, clock, _ = self.make(http_client, tick=0.01)
+        revalidator.track("s1", "t1", delay=0)
+        async with anyio.create_task_group() as tg:
+            await tg.start(revalidator.run)
+            clock.now += 0.02
+            with anyio.fail_after(1):
+                while not http_client.requests:
+                    await anyio.sleep(0.01)
+            tg.cancel_scope.cancel()
+        assert http_client.requests == ["t1"]
+
+    def test_invalid_arguments(self):
+        """测试无效参数"""
+        with pytest.raises(SSOConfigError):
+            self.make(UsersHTTPClient(), interval=0)
+        with pytest.raises(SSOConfigError):
+            self.make(UsersHTTPClient(), jitter=1)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试授权范围解析与匹配
+"""
+
+import pytest
+
+from treer_sso_sdk import (
+    ScopeRequirement,
+    ScopeVocabulary,
+    SSOConfigError,
+    TokenResponse,
+    parse_scopes,
+)
+
+
+class TestScopes:
+    """授权范围测试类"""
+
+    def test_parse_once(self):
+        """测试相同字符串复用同一个集合"""
+        scope = "profile orders:read  orders:write"
+        assert parse_scopes(scope) == {"profile", "orders:read", "orders:write"}
+        assert parse_scopes(scope) is parse_scopes("profile orders:read  orders:write")
+        assert parse_scopes(None) == frozenset()
+
+    def test_token_response_helpers(self):
+        """测试TokenResponse上的检查方法"""
+        token = TokenResponse(access_token="t", scope="profile orders:read")
+        assert token.has_scope("profile")
+        assert not token.has_scope("orders:write")
+        assert token.has_all("profile orders:read")
+        assert not token.has_all(["profile", "orders:write"])
+        assert token.has_any("orders:write orders:read")
+        assert not TokenResponse(access_token="t").has_any("profile")
+
+    def test_requirement(self):
+        """测试预编译的集合要求"""
+        requirement = ScopeRequirement(all_of="profile", any_of="orders:read admin")
+        assert requirement.matches("profile orders:read")
+        assert requirement("admin profile")
+        assert not requirement.matches("orders:read")
+        assert not requirement.matches("profile")
+        assert ScopeRequirement().matches(None)
+
+    def test_vocabulary_mask(self):
+        """测试位掩码要求与集合要求结果一致"""
+        vocabulary = ScopeVocabulary(
+            ["profile", "orders:read", "orders:write", "admin"]
+        )
+        requirement = vocabulary.requirement(
+            all_of="profile", any_of="orders:read admin"
+        )
+        for scope in (
+            "profile orders:read",
+            "admin profile",
+            "orders:read",
+            "profile",
+            "profile unknown",
+            "",
+        ):
+            expected = ScopeRequirement(
+                all_of="profile", any_of="orders:read admin"
+            ).matches(scope)
+            assert requirement.matches(vocabulary.mask(scope)) == expected
+        assert vocabulary.mask("unknown") == 0
+
+    def test_vocabulary_rejects_unknown_requirement(self):
+        """测试要求中出现未注册的scope"""
+        with pytest.raises(SSOConfigError):
+            ScopeVocabulary(["profile"]).requirement(all_of="admin")
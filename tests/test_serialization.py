@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试UserInfo序列化缓存与二进制编码
+"""
+
+import json
+
+import pytest
+
+from treer_sso_sdk import UserInfo, UserProfile
+
+
+def make_user() -> UserInfo:
+    return UserInfo.from_dict(
+        {
+            "id": 42,
+            "username": "alice",
+            "email": "alice@example.com",
+            "profile": {
+                "first_name": "爱丽丝",
+                "avatar_url": "https://cdn.example.com/a.png",
+                "additional_info": {"tier": "gold", "tags": [1, 2]},
+            },
+            "created_at": "2024-01-01T00:00:00Z",
+            "updated_at": "2024-06-01T12:30:00+08:00",
+        }
+    )
+
+
+class TestSerializationCache:
+    """序列化缓存测试类"""
+
+    def test_cached_and_copied(self):
+        """测试结果缓存且返回值修改不影响缓存"""
+        user = make_user()
+        assert user.to_json_bytes() is user.to_json_bytes()
+        first = user.to_dict()
+        first["username"] = "mallory"
+        first["profile"]["first_name"] = "mallory"
+        assert user.to_dict()["username"] == "alice"
+        assert user.to_dict()["profile"]["first_name"] == "爱丽丝"
+        assert json.loads(user.to_json_bytes()) == user.to_dict()
+
+    def test_invalidated_on_assignment(self):
+        """测试字段与profile字段重新赋值后缓存失效"""
+        user = make_user()
+        cached = user.to_json_bytes()
+        user.email = "alice@new.example.com"
+        assert json.loads(user.to_json_bytes())["email"] == "alice@new.example.com"
+
+        binary = user.to_bytes()
+        user.profile.last_name = "王"
+        assert user.to_dict()["profile"]["last_name"] == "王"
+        assert user.to_bytes() != binary
+        assert user.to_json_bytes() != cached
+
+        user.profile.additional_info["tier"] = "silver"
+        user.invalidate()
+        assert user.to_dict()["profile"]["additional_info"]["tier"] == "silver"
+
+
+class TestBinaryEncoding:
+    """二进制编码测试类"""
+
+    @pytest.mark.parametrize(
+        "user",
+        [
+            make_user(),
+            UserInfo(id="1", username="bob", is_active=False),
+            UserInfo(id="2", username="空", phone="+7", profile=UserProfile()),
+        ],
+    )
+    def test_round_trip(self, user):
+        """测试二进制编码往返一致"""
+        assert UserInfo.from_bytes(user.to_bytes()) == user
+
+    def test_compact(self):
+        """测试二进制编码比JSON更紧凑"""
+        user = make_user()
+        assert len(user.to_bytes()) < len(user.to_json_bytes())
+
+    def test_invalid_data(self):
+        """测试截断数据与未知版本"""
+        data = make_user().to_bytes()
+        with pytest.raises(ValueError):
+            UserInfo.from_bytes(data[:10])
+        with pytest.raises(ValueError):
+            UserInfo.from_bytes(b"\x09" + data[1:])
+        with pytest.raises(ValueError):
+            UserInfo.from_bytes(data + b"\x00extra")
+
+    def test_rejects_nul(self):
+        """测试字段包含NUL字符时无法编码"""
+        with pytest.raises(ValueError):
+            UserInfo(id="1", username="a\x00b").to_bytes()
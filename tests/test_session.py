@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试本地会话令牌
+"""
+
+import httpx
+import pytest
+
+from treer_sso_sdk import (
+    SessionSigner,
+    SSOConfig,
+    SSOConfigError,
+    SSOInvalidTokenError,
+    SSOMiddleware,
+    TreerSSOClient,
+    UserInfo,
+)
+from treer_sso_sdk.asgi import get_sso_context
+from treer_sso_sdk.http_client import AsyncHTTPClient
+
+OLD_KEY = b"o" * 32
+NEW_KEY = b"n" * 32
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_user() -> UserInfo:
+    return UserInfo.from_dict(
+        {
+            "id": 42,
+            "username": "alice",
+            "email": "alice@example.com",
+            "profile": {"first_name": "爱丽丝", "last_name": "王"},
+        }
+    )
+
+
+class TestSessionSigner:
+    """SessionSigner测试类"""
+
+    def test_round_trip(self):
+        """测试签发后校验得到核心字段"""
+        signer = SessionSigner({"k1": NEW_KEY})
+        user_info = signer.verify(signer.sign(make_user()))
+        assert user_info.id == "42"
+        assert user_info.username == "alice"
+        assert user_info.email == "alice@example.com"
+        assert user_info.profile.full_name == "爱丽丝 王"
+        assert user_info.is_active is True
+
+    def test_fits_cookie(self):
+        """测试令牌紧凑且不超过Cookie上限"""
+        token = SessionSigner({"k1": NEW_KEY}).sign(make_user())
+        assert len(token) < 300
+        signer = SessionSigner({"k1": NEW_KEY}, max_size=64)
+        with pytest.raises(SSOConfigError):
+            signer.sign(make_user())
+
+    def test_expiry(self):
+        """测试过期与ttl上限"""
+        clock = FakeClock()
+        signer = SessionSigner({"k1": NEW_KEY}, ttl=60, clock=clock)
+        short = signer.sign(make_user(), ttl=10)
+        long = signer.sign(make_user(), ttl=3600)
+        clock.now += 30
+        with pytest.raises(SSOInvalidTokenError) as exc_info:
+            signer.verify(short)
+        assert exc_info.value.error_code == "session_expired"
+        signer.verify(long)
+        clock.now += 31
+        with pytest.raises(SSOInvalidTokenError):
+            signer.verify(long)
+
+    def test_key_rotation(self):
+        """测试轮换密钥后旧令牌仍可校验，移除旧密钥后失效"""
+        old_token = SessionSigner({"2024-01": OLD_KEY}).sign(make_user())
+        rotated = SessionSigner({"2024-06": NEW_KEY, "2024-01": OLD_KEY})
+        assert rotated.verify(old_token).username == "alice"
+        assert rotated.sign(make_user()).split(".")[1] == "2024-06"
+        with pytest.raises(SSOInvalidTokenError):
+            SessionSigner({"2024-06": NEW_KEY}).verify(old_token)
+
+    def test_tampering(self):
+        """测试篡改载荷或签名被拒绝"""
+        signer = SessionSigner({"k1": NEW_KEY})
+        version, key_id, payload, signature = signer.sign(make_user()).split(".")
+        other = signer.sign(UserInfo(id="1", username="admin")).split(".")[2]
+        for token in (
+            f"{version}.{key_id}.{other}.{signature}",
+            f"{version}.{key_id}.{payload}.{signature[:-2]}AA",
+            "garbage",
+        ):
+            with pytest.raises(SSOInvalidTokenError):
+                signer.verify(token)
+
+    def test_non_ascii(self):
+        """测试包含非ASCII字符的令牌被拒绝"""
+        signer = SessionSigner({"k1": NEW_KEY})
+        version, key_id, payload, signature = signer.sign(make_user()).split(".")
+        for token in (
+            f"{version}.{key_id}.{payload}é.{signature}",
+            f"{version}.{key_id}.{payload}.{signature[:-1]}é",
+            f"{version}.k1é.{payload}.{signature}",
+            "会话",
+        ):
+            with pytest.raises(SSOInvalidTokenError):
+                signer.verify(token)
+
+    def test_invalid_keys(self):
+        """测试密钥配置校验"""
+        with pytest.raises(SSOConfigError):
+            SessionSigner({})
+        with pytest.raises(SSOConfigError):
+            SessionSigner({"k1": b"short"})
+        with pytest.raises(SSOConfigError):
+            SessionSigner({"k.1": NEW_KEY})
+        with pytest.raises(SSOConfigError):
+            SessionSigner({"k1": NEW_KEY}, active_key_id="k2")
+
+
+class TestSessionIntegration:
+    """会话令牌与客户端、中间件集成测试类"""
+
+    async def test_session_skips_sso(self):
+        """测试授权码换取会话后，携带会话Cookie的请求不访问SSO服务"""
+        calls = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.path)
+            if request.url.path.endswith("/oauth/token"):
+                return httpx.Response(
+                    200, json={"access_token": "t", "expires_in": 120}
+                )
+            return httpx.Response(200, json={"id": 42, "username": "alice"})
+
+        config = SSOConfig("id", "secret")
+        http_client = AsyncHTTPClient(config, transport=httpx.MockTransport(handler))
+        client = TreerSSOClient(config, http_client=http_client)
+        signer = SessionSigner({"k1": NEW_KEY})
+
+        user_info, session = await client.get_session_by_code("code", signer)
+        assert user_info.username == "alice"
+        assert len(calls) == 2
+
+        async def app(scope, receive, send):
+            context = get_sso_context(scope)
+            user = await context.require_user()
+            body = f"{user.username}:{context.from_session}".encode()
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": body})
+
+        middleware = SSOMiddleware(app, client=client, session_signer=signer)
+        transport = httpx.ASGITransport(app=middleware)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://app"
+        ) as http:
+            response = await http.get(
+                "/", headers={"Cookie": f"treer_session={session}"}
+            )
+            rejected = await http.get(
+                "/", headers={"Cookie": f"treer_session={session}x"}
+            )
+
+        assert response.text == "alice:True"
+        assert rejected.status_code == 401
+        assert len(calls) == 2
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试授权码换取令牌的去重
+"""
+
+import asyncio
+from typing import List
+
+import httpx
+import pytest
+
+from treer_sso_sdk import SSOConfig, SSOInvalidCodeError, TreerSSOClient
+from treer_sso_sdk.interfaces import HTTPClientInterface
+
+
+class OneShotCodeHTTPClient(HTTPClientInterface):
+    """授权码只能使用一次的假HTTP客户端"""
+
+    def __init__(self) -> None:
+        self.used: List[str] = []
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        code = httpx.QueryParams(kwargs["content"].decode())["code"]
+        request = httpx.Request("POST", url)
+        await asyncio.sleep(0.01)
+        if code in self.used:
+            return httpx.Response(
+                400,
+                json={"message": "code used", "code": "invalid_code"},
+                request=request,
+            )
+        self.used.append(code)
+        return httpx.Response(
+            200,
+            json={"access_token": f"token-{code}", "expires_in": 3600},
+            request=request,
+        )
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class TestCodeExchangeDedup:
+    """授权码去重测试类"""
+
+    async def test_concurrent_duplicates(self):
+        """测试并发重复提交只发送一次请求"""
+        http_client = OneShotCodeHTTPClient()
+        config = SSOConfig(client_id="id", client_secret="secret")
+        client = TreerSSOClient(config, http_client=http_client)
+
+        results = await asyncio.gather(
+            *(client.get_access_token("code-1") for _ in range(3))
+        )
+        assert {r.access_token for r in results} == {"token-code-1"}
+        assert http_client.used == ["code-1"]
+
+    async def test_sequential_duplicate_within_window(self):
+        """测试窗口内的重复提交复用结果"""
+        http_client = OneShotCodeHTTPClient()
+        config = SSOConfig(client_id="id", client_secret="secret")
+        client = TreerSSOClient(config, http_client=http_client)
+
+        first = await client.get_access_token("code-1")
+        second = await client.get_access_token("code-1")
+        assert second is first
+
+    async def test_window_disabled(self):
+        """测试关闭复用窗口后重复提交失败"""
+        http_client = OneShotCodeHTTPClient()
+        config = SSOConfig(client_id="id", client_secret="secret", code_dedup_window=0)
+        client = TreerSSOClient(config, http_client=http_client)
+
+        await client.get_access_token("code-1")
+        with pytest.raises(SSOInvalidCodeError):
+            await client.get_access_token("code-1")
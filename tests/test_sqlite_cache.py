@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试持久化用户信息缓存
+"""
+
+import sqlite3
+import time
+
+from treer_sso_sdk import CachedUserInfo, SQLiteUserInfoCache, UserInfo
+from treer_sso_sdk.cache import token_cache_key
+
+
+def make_entry(**kwargs) -> CachedUserInfo:
+    user_info = UserInfo.from_dict(
+        {
+            "id": 1,
+            "username": "alice",
+            "profile": {"first_name": "Alice", "additional_info": {"tier": "gold"}},
+            "created_at": "2024-01-01T00:00:00Z",
+        }
+    )
+    now = time.time()
+    defaults = dict(
+        user_info=user_info, expires_at=now + 60, fetched_at=now, etag='"v1"'
+    )
+    defaults.update(kwargs)
+    return CachedUserInfo(**defaults)
+
+
+class TestSQLiteUserInfoCache:
+    """SQLiteUserInfoCache测试类"""
+
+    def test_survives_restart(self, tmp_path):
+        """测试重新打开后读取之前写入的条目"""
+        path = str(tmp_path / "cache.db")
+        key = token_cache_key("secret-token")
+        cache = SQLiteUserInfoCache(path)
+        cache.set(key, make_entry(scope="read"))
+        cache.close()
+
+        cache = SQLiteUserInfoCache(path)
+        entry = cache.get(key)
+        assert entry is not None
+        assert entry.user_info.username == "alice"
+        assert entry.user_info.profile.additional_info == {"tier": "gold"}
+        assert entry.user_info.created_at is not None
+        assert entry.etag == '"v1"'
+        assert entry.scope == "read"
+        cache.close()
+
+    def test_token_not_stored(self, tmp_path):
+        """测试数据库中不包含令牌原文"""
+        path = str(tmp_path / "cache.db")
+        cache = SQLiteUserInfoCache(path)
+        cache.set(token_cache_key("secret-token"), make_entry())
+        cache.close()
+
+        dump = "\n".join(sqlite3.connect(path).iterdump())
+        assert "secret-token" not in dump
+
+    def test_prune_expired_tokens(self, tmp_path):
+        """测试打开时清理令牌已过期的条目"""
+        path = str(tmp_path / "cache.db")
+        cache = SQLiteUserInfoCache(path)
+        cache.set("expired", make_entry(token_expires_at=time.time() - 1))
+        cache.set("valid", make_entry(token_expires_at=time.time() + 60))
+        cache.close()
+
+        cache = SQLiteUserInfoCache(path)
+        assert cache.get("expired") is None
+        assert cache.get("valid") is not None
+        cache.close()
+
+    def test_file_permissions(self, tmp_path):
+        """测试新建的数据库文件只有所有者可读写"""
+        path = tmp_path / "cache.db"
+        SQLiteUserInfoCache(str(path)).close()
+        assert path.stat().st_mode & 0o777 == 0o600
+
+    def test_locked_database_does_not_block(self, tmp_path):
+        """测试其他连接持有写锁时读写立即返回，锁释放后写入落盘"""
+        path = str(tmp_path / "cache.db")
+        cache = SQLiteUserInfoCache(path)
+        cache.flush()
+        locker = sqlite3.connect(path, isolation_level=None)
+        locker.execute("BEGIN EXCLUSIVE")
+
+        started = time.monotonic()
+        cache.set("alice", make_entry())
+        cache.delete("bob")
+        cache._memory.delete("alice")
+        assert cache.get("alice") is not None
+        assert cache.get("bob") is None
+        assert cache.get("carol") is None
+        assert time.monotonic() - started < 0.5
+
+        locker.execute("ROLLBACK")
+        locker.close()
+        cache.flush()
+        cache._memory.delete("alice")
+        assert cache.get("alice") is not None
+        cache.close()
+
+    def test_prune_indexes(self, tmp_path):
+        """测试prune使用的过期时间列带有索引"""
+        path = str(tmp_path / "cache.db")
+        SQLiteUserInfoCache(path).close()
+        indexed = {
+            row[0]
+            for row in sqlite3.connect(path).execute(
+                "SELECT info.name FROM pragma_index_list('user_info_cache') AS list, "
+                "pragma_index_info(list.name) AS info"
+            )
+        }
+        assert {"fetched_at", "token_expires_at"} <= indexed
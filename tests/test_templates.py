@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试预编译请求模板
+"""
+
+from urllib.parse import parse_qs
+
+import httpx
+
+from treer_sso_sdk import SSOConfig
+from treer_sso_sdk.endpoints import Endpoint
+from treer_sso_sdk.http_client import AsyncHTTPClient
+from treer_sso_sdk.templates import TOKEN_PATH, RequestTemplates
+
+
+class TestRequestTemplates:
+    """RequestTemplates测试类"""
+
+    def test_token_form_matches_urlencoded_dict(self):
+        """测试预编码表单与逐项编码结果等价"""
+        config = SSOConfig(client_id="id&=1", client_secret="秘密 key")
+        templates = RequestTemplates(config)
+        body = templates.token_form("a/b+c", "https://app.example.com/cb?x=1")
+        assert parse_qs(body.decode("ascii"), strict_parsing=True) == {
+            "grant_type": ["authorization_code"],
+            "client_id": ["id&=1"],
+            "client_secret": ["秘密 key"],
+            "code": ["a/b+c"],
+            "redirect_uri": ["https://app.example.com/cb?x=1"],
+        }
+        assert b"redirect_uri" not in templates.token_form("code", None)
+
+    def test_url_cached_per_endpoint(self):
+        """测试URL对象按端点与路径缓存"""
+        templates = RequestTemplates(SSOConfig("id", "secret"))
+        endpoint = Endpoint("https://sso.example.com")
+        url = templates.url(endpoint, TOKEN_PATH)
+        assert url == "https://sso.example.com/api/v1/oauth/token"
+        assert templates.url(endpoint, TOKEN_PATH) is url
+        other = templates.url(Endpoint("https://sso2.example.com"), TOKEN_PATH)
+        assert other == "https://sso2.example.com/api/v1/oauth/token"
+
+    async def test_http_client_caches_parsed_url(self):
+        """测试AsyncHTTPClient缓存URL解析结果"""
+        seen = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request.url)
+            return httpx.Response(200)
+
+        config = SSOConfig("id", "secret")
+        http_client = AsyncHTTPClient(config, transport=httpx.MockTransport(handler))
+        url = "https://sso.example.com/api/v1/users/me"
+        await http_client.get(url)
+        await http_client.get(url)
+        assert seen == [httpx.URL(url)] * 2
+        assert http_client._url(url) is http_client._url(url)
+        await http_client.close()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试共享SSLContext
+"""
+
+import shutil
+import ssl
+import subprocess
+
+import pytest
+
+from treer_sso_sdk import SSOConfig
+from treer_sso_sdk.http_client import AsyncHTTPClient
+from treer_sso_sdk.tls import (
+    SessionCachingSSLContext,
+    _ResumingSSLObject,
+    get_ssl_context,
+)
+
+
+class TestSharedSSLContext:
+    """共享SSLContext测试类"""
+
+    def test_cached_by_verify_setting(self):
+        """测试按校验设置缓存"""
+        verified = get_ssl_context(True)
+        assert get_ssl_context(True) is verified
+        assert isinstance(verified, SessionCachingSSLContext)
+        assert verified.verify_mode == ssl.CERT_REQUIRED
+
+        unverified = get_ssl_context(False)
+        assert unverified is not verified
+        assert unverified.verify_mode == ssl.CERT_NONE
+        assert not unverified.check_hostname
+
+    def test_clients_share_context(self):
+        """测试多个客户端共用同一SSLContext"""
+        config = SSOConfig(client_id="id", client_secret="secret")
+        first = AsyncHTTPClient(config)._build_transport()
+        second = AsyncHTTPClient(config)._build_transport()
+        assert first._pool._ssl_context is second._pool._ssl_context
+
+        config = SSOConfig(
+            client_id="id", client_secret="secret", share_ssl_context=False
+        )
+        third = AsyncHTTPClient(config)._build_transport()
+        assert third._pool._ssl_context is not first._pool._ssl_context
+
+
+@pytest.fixture(scope="module")
+def server_context(tmp_path_factory):
+    if shutil.which("openssl") is None:
+        pytest.skip("需要openssl生成测试证书")
+    directory = tmp_path_factory.mktemp("tls")
+    cert, key = directory / "cert.pem", directory / "key.pem"
+    subprocess.run(
+        [
+            "openssl",
+            "req",
+            "-x509",
+            "-newkey",
+            "rsa:2048",
+            "-nodes",
+            "-keyout",
+            str(key),
+            "-out",
+            str(cert),
+            "-days",
+            "1",
+            "-subj",
+            "/CN=localhost",
+        ],
+        check=True,
+        capture_output=True,
+    )
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(str(cert), str(key))
+    return context
+
+
+def pump(source: ssl.MemoryBIO, target: ssl.MemoryBIO) -> None:
+    data = source.read()
+    if data:
+        target.write(data)
+
+
+def connect(client_context: ssl.SSLContext, server_context: ssl.SSLContext):
+    """通过内存BIO完成一次TLS握手，返回客户端与服务端SSLObject及BIO"""
+    bios = [ssl.MemoryBIO() for _ in range(4)]
+    client = client_context.wrap_bio(bios[0], bios[1], server_hostname="localhost")
+    server = server_context.wrap_bio(bios[2], bios[3], server_side=True)
+    pending = [client, server]
+    while pending:
+        for side in list(pending):
+            try:
+                side.do_handshake()
+                pending.remove(side)
+            except ssl.SSLWantReadError:
+                pass
+        pump(bios[1], bios[2])
+        pump(bios[3], bios[0])
+    return client, server, bios
+
+
+class TestSessionResumption:
+    """TLS会话缓存测试类"""
+
+    @pytest.mark.parametrize("tickets", [0, 2])
+    def test_session_checked_once(self, server_context, monkeypatch, tickets):
+        """测试只在握手后首次读取时检查会话，服务端不签发票据时不再检查"""
+        checks = []
+        save_session = _ResumingSSLObject._save_session
+
+        def counting_save_session(self):
+            checks.append(self)
+            return save_session(self)
+
+        monkeypatch.setattr(_ResumingSSLObject, "_save_session", counting_save_session)
+        server_context.num_tickets = tickets
+        client_context = SessionCachingSSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        client_context.check_hostname = False
+        client_context.verify_mode = ssl.CERT_NONE
+
+        client, server, bios = connect(client_context, server_context)
+        for _ in range(20):
+            server.write(b"pong")
+            pump(bios[3], bios[0])
+            assert client.read() == b"pong"
+
+        assert len(checks) <= 2
+        stored = client_context.get_session("localhost")
+        assert (stored is not None) == bool(tickets)
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试用户信息缓存与条件请求
+"""
+
+import asyncio
+import time
+from typing import List
+
+import httpx
+import pytest
+
+from treer_sso_sdk import SSOConfig, SSOInvalidTokenError, TreerSSOClient
+from treer_sso_sdk.interfaces import HTTPClientInterface
+
+USER_JSON = {"id": 1, "username": "alice", "email": "alice@example.com"}
+
+
+class ConditionalHTTPClient(HTTPClientInterface):
+    """支持ETag条件请求的假HTTP客户端"""
+
+    def __init__(self, etag: str = '"v1"') -> None:
+        self.etag = etag
+        self.requests: List[dict] = []
+        self.status_override = None
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        raise NotImplementedError
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        headers = kwargs.get("headers", {})
+        self.requests.append(headers)
+        request = httpx.Request("GET", url)
+        if self.status_override:
+            return httpx.Response(self.status_override, request=request)
+        if headers.get("If-None-Match") == self.etag:
+            return httpx.Response(304, headers={"ETag": self.etag}, request=request)
+        return httpx.Response(
+            200, json=USER_JSON, headers={"ETag": self.etag}, request=request
+        )
+
+    async def close(self) -> None:
+        pass
+
+
+class TestConditionalUserInfo:
+    """get_user_info条件请求测试类"""
+
+    async def test_revalidate_with_etag(self):
+        """测试缓存过期后发送If-None-Match并处理304"""
+        http_client = ConditionalHTTPClient()
+        config = SSOConfig(client_id="id", client_secret="secret")
+        client = TreerSSOClient(config, http_client=http_client)
+
+        first = await client.get_user_info("token")
+        second = await client.get_user_info("token")
+
+        assert second is first
+        assert "If-None-Match" not in http_client.requests[0]
+        assert http_client.requests[1]["If-None-Match"] == '"v1"'
+        assert client.stats.not_modified == 1
+        assert client.stats.bytes_saved_not_modified > 0
+        assert client.stats.requests == 2
+
+    async def test_changed_resource(self):
+        """测试ETag变化时重新下载"""
+        http_client = ConditionalHTTPClient()
+        config = SSOConfig(client_id="id", client_secret="secret")
+        client = TreerSSOClient(config, http_client=http_client)
+
+        first = await client.get_user_info("token")
+        http_client.etag = '"v2"'
+        second = await client.get_user_info("token")
+
+        assert second is not first
+        assert client.stats.not_modified == 0
+
+    async def test_fresh_within_ttl(self):
+        """测试新鲜期内不发起请求"""
+        http_client = ConditionalHTTPClient()
+        config = SSOConfig(
+            client_id="id", client_secret="secret", user_info_cache_ttl=60
+        )
+        client = TreerSSOClient(config, http_client=http_client)
+
+        await client.get_user_info("token")
+        await client.get_user_info("token")
+
+        assert len(http_client.requests) == 1
+        assert client.stats.user_info_cache_hits == 1
+
+    async def test_invalid_token_evicts(self):
+        """测试401时删除缓存条目"""
+        http_client = ConditionalHTTPClient()
+        config = SSOConfig(client_id="id", client_secret="secret")
+        client = TreerSSOClient(config, http_client=http_client)
+
+        await client.get_user_info("token")
+        http_client.status_override = 401
+        with pytest.raises(SSOInvalidTokenError):
+            await client.get_user_info("token")
+        assert len(client.user_info_cache) == 0
+
+
+class TestStaleServing:
+    """过期缓存兜底测试类"""
+
+    @staticmethod
+    def expire(client: TreerSSOClient) -> None:
+        for entry in client.user_info_cache._entries.values():
+            entry.expires_at = time.time() - 1
+
+    async def test_stale_while_revalidate(self):
+        """测试立即返回过期缓存并在后台刷新"""
+        http_client = ConditionalHTTPClient()
+        config = SSOConfig(
+            client_id="id",
+            client_secret="secret",
+            user_info_cache_ttl=60,
+            user_info_stale_while_revalidate=300,
+        )
+        client = TreerSSOClient(config, http_client=http_client)
+        await client.get_user_info("token")
+        self.expire(client)
+
+        result = await client.get_user_info_result("token")
+        assert result.stale
+        assert result.user_info.username == "alice"
+
+        await asyncio.gather(*client._background_tasks)
+        assert http_client.requests[-1]["If-None-Match"] == '"v1"'
+        result = await client.get_user_info_result("token")
+        assert not result.stale
+        await client.close()
+
+    async def test_stale_if_error(self):
+        """测试SSO服务5xx时返回过期缓存"""
+        http_client = ConditionalHTTPClient()
+        config = SSOConfig(
+            client_id="id",
+            client_secret="secret",
+            user_info_cache_ttl=60,
+            user_info_stale_if_error=300,
+        )
+        client = TreerSSOClient(config, http_client=http_client)
+        await client.get_user_info("token")
+        self.expire(client)
+
+        http_client.status_override = 503
+        result = await client.get_user_info_result("token")
+        assert result.stale
+        assert client.stats.stale_served == 1
+
+        # 令牌失效不属于服务故障，不使用过期缓存
+        http_client.status_override = 401
+        with pytest.raises(SSOInvalidTokenError):
+            await client.get_user_info_result("token")